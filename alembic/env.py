@@ -67,6 +67,11 @@ import app.models.user_model
 import app.models.review_model
 import app.models.purchase_model
 import app.models.dlc_model
+import app.models.row_count_model
+import app.models.game_rating_model
+import app.models.leaderboard_model
+import app.models.sales_model
+import app.models.copurchase_model
 
 target_metadata = Base.metadata
 
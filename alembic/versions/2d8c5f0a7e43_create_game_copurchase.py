@@ -0,0 +1,41 @@
+"""create game_copurchase
+
+Revision ID: 2d8c5f0a7e43
+Revises: e7b4a1d95c26
+Create Date: 2026-10-18 14:02:51.306118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d8c5f0a7e43'
+down_revision: Union[str, None] = 'e7b4a1d95c26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'game_copurchase',
+        sa.Column('jogo_id', sa.Integer(), nullable=False),
+        sa.Column('outro_jogo_id', sa.Integer(), nullable=False),
+        sa.Column('compradores', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['jogo_id'], ['games.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['outro_jogo_id'], ['games.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('jogo_id', 'outro_jogo_id'),
+    )
+    op.create_index('ix_game_copurchase_top', 'game_copurchase', ['jogo_id', 'compradores'], unique=False)
+    # Começa do zero; o app.sales_rollup preenche em lotes a partir daqui
+    op.execute("INSERT INTO sales_watermark (nome, ultimo_id) VALUES ('copurchase', 0)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM sales_watermark WHERE nome = 'copurchase'")
+    op.drop_index('ix_game_copurchase_top', table_name='game_copurchase')
+    op.drop_table('game_copurchase')
@@ -0,0 +1,29 @@
+"""add unique user+game on purchase
+
+Revision ID: 3c5e8a1f2b7d
+Revises: fd1b516b40fd
+Create Date: 2026-10-18 09:12:41.203518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c5e8a1f2b7d'
+down_revision: Union[str, None] = 'fd1b516b40fd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Necessária para o INSERT ... ON CONFLICT (usuario_id, jogo_id) em purchase_repository.create
+    op.create_unique_constraint('uq_purchase_usuario_jogo', 'purchase', ['usuario_id', 'jogo_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_purchase_usuario_jogo', 'purchase', type_='unique')
@@ -0,0 +1,54 @@
+"""add purchase xact_id
+
+Revision ID: 4e8a2c6b1d97
+Revises: 7c1e9b3d5a20
+Create Date: 2026-10-19 09:14:52.306118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e8a2c6b1d97'
+down_revision: Union[str, None] = '7c1e9b3d5a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # As consolidações passam a andar pela transação que inseriu cada compra
+    # em vez do id, sem travar purchase (ver app/repositories/sales_repository.py).
+    op.add_column('purchase', sa.Column('xact_id', sa.BigInteger(), nullable=True))
+    # Compras existentes recebem posições negativas na ordem do id, abaixo de
+    # qualquer transação nova, e as marcas são convertidas para a mesma escala:
+    # o que já estava consolidado continua consolidado, e o resto vem depois.
+    op.execute("""
+        WITH limite AS (SELECT coalesce(max(id), 0) AS maior FROM purchase)
+        UPDATE purchase SET xact_id = purchase.id - limite.maior - 1 FROM limite
+    """)
+    op.execute("""
+        WITH limite AS (SELECT coalesce(max(id), 0) AS maior FROM purchase)
+        UPDATE sales_watermark SET ultimo_id = least(ultimo_id, limite.maior) - limite.maior - 1 FROM limite
+    """)
+    op.alter_column(
+        'purchase', 'xact_id',
+        nullable=False,
+        server_default=sa.text('pg_current_xact_id()::text::bigint'),
+    )
+    op.create_index('ix_purchase_xact_id', 'purchase', ['xact_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Volta para o maior id já consolidado por cada marca
+    op.execute("""
+        UPDATE sales_watermark SET ultimo_id = coalesce(
+            (SELECT max(id) FROM purchase WHERE xact_id <= sales_watermark.ultimo_id), 0
+        )
+    """)
+    op.drop_index('ix_purchase_xact_id', table_name='purchase')
+    op.drop_column('purchase', 'xact_id')
@@ -0,0 +1,68 @@
+"""fix row_counts slot choice and recount
+
+Revision ID: 5b9d3e7f2a18
+Revises: 4e8a2c6b1d97
+Create Date: 2026-10-19 15:41:08.927310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b9d3e7f2a18'
+down_revision: Union[str, None] = '4e8a2c6b1d97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("games", "users", "purchase", "reviews", "dlc")
+SLOTS = 16
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # As funções de 8d2f4b6a9c13 tinham random() no WHERE, reavaliado a cada
+    # linha candidata: um statement atualizava de 0 a SLOTS slots e a soma
+    # se afastava da contagem real. O slot passa a ser sorteado uma vez.
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION row_counts_insert() RETURNS trigger AS $$
+        DECLARE
+            s int := floor(random() * {SLOTS})::int;
+        BEGIN
+            UPDATE row_counts SET quantidade = quantidade + (SELECT count(*) FROM novas)
+            WHERE tabela = TG_TABLE_NAME AND slot = s;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION row_counts_delete() RETURNS trigger AS $$
+        DECLARE
+            s int := floor(random() * {SLOTS})::int;
+        BEGIN
+            UPDATE row_counts SET quantidade = quantidade - (SELECT count(*) FROM antigas)
+            WHERE tabela = TG_TABLE_NAME AND slot = s;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    # Recontagem dos contadores que já desviaram, com a tabela travada para
+    # escrita como na semeadura original
+    for table in TABLES:
+        op.execute(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE")
+        op.execute(f"DELETE FROM row_counts WHERE tabela = '{table}'")
+        op.execute(f"""
+            INSERT INTO row_counts (tabela, slot, quantidade)
+            SELECT '{table}', slot, CASE WHEN slot = 0 THEN (SELECT count(*) FROM {table}) ELSE 0 END
+            FROM generate_series(0, {SLOTS - 1}) AS slot
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # As funções corrigidas e os contadores recontados continuam válidos
+    # para 4e8a2c6b1d97; voltar à versão com defeito não faz sentido.
+    pass
@@ -0,0 +1,52 @@
+"""create game_rating_stats
+
+Revision ID: 5b9e2d7c1a34
+Revises: c41a7e9d0f58
+Create Date: 2026-10-18 11:24:09.318250
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b9e2d7c1a34'
+down_revision: Union[str, None] = 'c41a7e9d0f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NOTAS = range(1, 11)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'game_rating_stats',
+        sa.Column('jogo_id', sa.Integer(), nullable=False),
+        sa.Column('quantidade', sa.Integer(), nullable=False),
+        sa.Column('soma', sa.Integer(), nullable=False),
+        sa.Column('media', sa.Float(), nullable=True),
+        *(sa.Column(f'nota_{nota}', sa.Integer(), nullable=False) for nota in NOTAS),
+        sa.ForeignKeyConstraint(['jogo_id'], ['games.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('jogo_id'),
+    )
+    op.create_index(op.f('ix_game_rating_stats_media'), 'game_rating_stats', ['media'], unique=False)
+
+    # Semeia com as reviews existentes; a partir daqui o review_service mantém
+    histograma = ", ".join(f"count(*) FILTER (WHERE nota = {nota})" for nota in NOTAS)
+    colunas = ", ".join(f"nota_{nota}" for nota in NOTAS)
+    op.execute("LOCK TABLE reviews IN SHARE MODE")
+    op.execute(f"""
+        INSERT INTO game_rating_stats (jogo_id, quantidade, soma, media, {colunas})
+        SELECT jogo_id, count(*), sum(nota), avg(nota), {histograma}
+        FROM reviews
+        GROUP BY jogo_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_game_rating_stats_media'), table_name='game_rating_stats')
+    op.drop_table('game_rating_stats')
@@ -0,0 +1,43 @@
+"""add list indexes
+
+Revision ID: 7c1e9b3d5a20
+Revises: b61d0e4f9a27
+Create Date: 2026-10-18 17:42:08.113592
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e9b3d5a20'
+down_revision: Union[str, None] = 'b61d0e4f9a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Um índice por formato de consulta das listagens (filtro e ordenação), com o
+# id no fim para o desempate do cursor. usuario_id de purchase e reviews já é
+# atendido pelo prefixo das uniques (usuario_id, jogo_id).
+INDEXES = [
+    ('ix_games_preco', 'games', ['preco', 'id']),
+    ('ix_dlc_preco', 'dlc', ['preco', 'id']),
+    ('ix_reviews_jogo_nota', 'reviews', ['jogo_id', 'nota', 'id']),
+    ('ix_reviews_nota', 'reviews', ['nota', 'id']),
+    ('ix_purchase_jogo_id', 'purchase', ['jogo_id', 'id']),
+    ('ix_purchase_data_compra', 'purchase', ['data_compra', 'id']),
+    ('ix_purchase_preco_pago', 'purchase', ['preco_pago', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,106 @@
+"""create row_counts with maintenance triggers
+
+Revision ID: 8d2f4b6a9c13
+Revises: 3c5e8a1f2b7d
+Create Date: 2026-10-18 10:02:17.518734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f4b6a9c13'
+down_revision: Union[str, None] = '3c5e8a1f2b7d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("games", "users", "purchase", "reviews", "dlc")
+# Linhas de contador por tabela (app.models.row_count_model.SLOTS). Um contador
+# único seria uma linha travada por toda transação que insere ou apaga na
+# tabela; com vários, cada statement soma em um slot sorteado e a leitura
+# soma todos.
+SLOTS = 16
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'row_counts',
+        sa.Column('tabela', sa.String(length=63), nullable=False),
+        sa.Column('slot', sa.SmallInteger(), nullable=False),
+        sa.Column('quantidade', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('tabela', 'slot'),
+    )
+
+    # Triggers por statement com tabelas de transição: um INSERT/DELETE em lote
+    # atualiza o contador uma única vez, não uma vez por linha.
+    op.execute(f"""
+        CREATE FUNCTION row_counts_insert() RETURNS trigger AS $$
+        DECLARE
+            -- Sorteado uma vez: random() no WHERE seria reavaliado a cada linha
+            s int := floor(random() * {SLOTS})::int;
+        BEGIN
+            UPDATE row_counts SET quantidade = quantidade + (SELECT count(*) FROM novas)
+            WHERE tabela = TG_TABLE_NAME AND slot = s;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute(f"""
+        CREATE FUNCTION row_counts_delete() RETURNS trigger AS $$
+        DECLARE
+            -- Sorteado uma vez: random() no WHERE seria reavaliado a cada linha
+            s int := floor(random() * {SLOTS})::int;
+        BEGIN
+            UPDATE row_counts SET quantidade = quantidade - (SELECT count(*) FROM antigas)
+            WHERE tabela = TG_TABLE_NAME AND slot = s;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE FUNCTION row_counts_truncate() RETURNS trigger AS $$
+        BEGIN
+            UPDATE row_counts SET quantidade = 0 WHERE tabela = TG_TABLE_NAME;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    for table in TABLES:
+        # Trava a tabela enquanto o contador é semeado para não perder escritas concorrentes
+        op.execute(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE")
+        op.execute(f"""
+            INSERT INTO row_counts (tabela, slot, quantidade)
+            SELECT '{table}', slot, CASE WHEN slot = 0 THEN (SELECT count(*) FROM {table}) ELSE 0 END
+            FROM generate_series(0, {SLOTS - 1}) AS slot
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_row_counts_insert AFTER INSERT ON {table}
+            REFERENCING NEW TABLE AS novas
+            FOR EACH STATEMENT EXECUTE FUNCTION row_counts_insert()
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_row_counts_delete AFTER DELETE ON {table}
+            REFERENCING OLD TABLE AS antigas
+            FOR EACH STATEMENT EXECUTE FUNCTION row_counts_delete()
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_row_counts_truncate AFTER TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION row_counts_truncate()
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_row_counts_insert ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_row_counts_delete ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_row_counts_truncate ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS row_counts_insert()")
+    op.execute("DROP FUNCTION IF EXISTS row_counts_delete()")
+    op.execute("DROP FUNCTION IF EXISTS row_counts_truncate()")
+    op.drop_table('row_counts')
@@ -0,0 +1,41 @@
+"""create game_leaderboard
+
+Revision ID: 9a3f6c2e8b71
+Revises: 5b9e2d7c1a34
+Create Date: 2026-10-18 11:58:41.702163
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a3f6c2e8b71'
+down_revision: Union[str, None] = '5b9e2d7c1a34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Fica vazia até a primeira atualização feita pela aplicação
+    op.create_table(
+        'game_leaderboard',
+        sa.Column('jogo_id', sa.Integer(), nullable=False),
+        sa.Column('posicao', sa.Integer(), nullable=False),
+        sa.Column('nota', sa.Float(), nullable=False),
+        sa.Column('media', sa.Float(), nullable=False),
+        sa.Column('quantidade', sa.Integer(), nullable=False),
+        sa.Column('atualizado_em', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['jogo_id'], ['games.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('jogo_id'),
+    )
+    op.create_index(op.f('ix_game_leaderboard_posicao'), 'game_leaderboard', ['posicao'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_game_leaderboard_posicao'), table_name='game_leaderboard')
+    op.drop_table('game_leaderboard')
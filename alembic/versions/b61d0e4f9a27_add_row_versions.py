@@ -0,0 +1,37 @@
+"""add row versions
+
+Revision ID: b61d0e4f9a27
+Revises: 2d8c5f0a7e43
+Create Date: 2026-10-18 15:11:42.905317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b61d0e4f9a27'
+down_revision: Union[str, None] = '2d8c5f0a7e43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['games', 'users', 'reviews', 'purchase', 'dlc']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Linhas existentes começam na versão 1, alteradas "agora"
+    for table in TABLES:
+        op.add_column(table, sa.Column('version', sa.Integer(), server_default=sa.text('1'), nullable=False))
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False))
+        op.create_index(op.f(f'ix_{table}_updated_at'), table, ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        op.drop_index(op.f(f'ix_{table}_updated_at'), table_name=table)
+        op.drop_column(table, 'updated_at')
+        op.drop_column(table, 'version')
@@ -0,0 +1,58 @@
+"""add trigram and full-text search indexes
+
+Revision ID: c41a7e9d0f58
+Revises: 8d2f4b6a9c13
+Create Date: 2026-10-18 10:47:52.061935
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41a7e9d0f58'
+down_revision: Union[str, None] = '8d2f4b6a9c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (tabela, coluna) filtradas com ILIKE '%valor%' nos repositórios
+TRIGRAM_COLUMNS = (
+    ("games", "titulo"),
+    ("games", "desenvolvedora"),
+    ("dlc", "titulo"),
+    ("dlc", "desenvolvedora"),
+    ("users", "nome"),
+    ("users", "email"),
+    ("reviews", "comentario"),
+    ("purchase", "forma_pagamento"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, column in TRIGRAM_COLUMNS:
+        op.create_index(
+            f'ix_{table}_{column}_trgm',
+            table,
+            [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+        )
+
+    # Coluna gerada fora do mapeamento ORM (ver app/repositories/text_search.py)
+    op.execute("""
+        ALTER TABLE reviews ADD COLUMN comentario_tsv tsvector
+        GENERATED ALWAYS AS (to_tsvector('portuguese', coalesce(comentario, ''))) STORED
+    """)
+    op.create_index('ix_reviews_comentario_tsv', 'reviews', ['comentario_tsv'], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reviews_comentario_tsv', table_name='reviews')
+    op.drop_column('reviews', 'comentario_tsv')
+    for table, column in TRIGRAM_COLUMNS:
+        op.drop_index(f'ix_{table}_{column}_trgm', table_name=table)
@@ -0,0 +1,49 @@
+"""create sales rollups
+
+Revision ID: e7b4a1d95c26
+Revises: 9a3f6c2e8b71
+Create Date: 2026-10-18 13:20:07.418530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b4a1d95c26'
+down_revision: Union[str, None] = '9a3f6c2e8b71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'sales_daily',
+        sa.Column('dia', sa.Date(), nullable=False),
+        sa.Column('jogo_id', sa.Integer(), nullable=False),
+        sa.Column('forma_pagamento', sa.Text(), nullable=False),
+        sa.Column('unidades', sa.Integer(), nullable=False),
+        sa.Column('receita', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.ForeignKeyConstraint(['jogo_id'], ['games.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('dia', 'jogo_id', 'forma_pagamento'),
+    )
+    op.create_index(op.f('ix_sales_daily_jogo_id'), 'sales_daily', ['jogo_id'], unique=False)
+    op.create_table(
+        'sales_watermark',
+        sa.Column('nome', sa.String(length=63), nullable=False),
+        sa.Column('ultimo_id', sa.BigInteger(), nullable=False),
+        sa.Column('atualizado_em', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('nome'),
+    )
+    # Começa do zero; a primeira passada do app.sales_rollup consolida o histórico
+    op.execute("INSERT INTO sales_watermark (nome, ultimo_id) VALUES ('purchase', 0)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('sales_watermark')
+    op.drop_index(op.f('ix_sales_daily_jogo_id'), table_name='sales_daily')
+    op.drop_table('sales_daily')
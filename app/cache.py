@@ -0,0 +1,177 @@
+import functools
+import os
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Tuple
+from dotenv import load_dotenv
+from sqlalchemy.orm import object_session
+from app.database import Base
+
+load_dotenv()
+
+# Cache de leitura (read-through) para consultas quentes dos repositórios.
+# O backend padrão roda no próprio processo (LRU com TTL e tamanho máximo);
+# um backend compartilhado só precisa implementar CacheBackend e ser
+# instalado com configure().
+#
+# A invalidação de listagens é por namespace: cada namespace tem um número de
+# geração que entra na chave, e invalidar é só incrementá-lo. As entradas
+# antigas deixam de ser encontradas e saem pelo LRU ou pelo TTL.
+
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() not in {"0", "false", "no"}
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "30"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+
+MISSING = object()
+
+class CacheBackend:
+    async def get(self, key: Hashable) -> Any:
+        """Valor guardado ou MISSING."""
+        raise NotImplementedError
+
+    async def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: Hashable) -> None:
+        raise NotImplementedError
+
+    async def incr(self, key: Hashable) -> int:
+        """Incrementa um contador que não expira e devolve o novo valor."""
+        raise NotImplementedError
+
+    async def counter(self, key: Hashable) -> int:
+        raise NotImplementedError
+
+class MemoryBackend(CacheBackend):
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._counters: dict = {}
+
+    async def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISSING
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key, value, ttl):
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key):
+        self._entries.pop(key, None)
+
+    async def incr(self, key):
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    async def counter(self, key):
+        return self._counters.get(key, 0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class Cache:
+    def __init__(self, backend: CacheBackend, ttl: float = CACHE_TTL_SECONDS, enabled: bool = CACHE_ENABLED):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+
+    async def _key(self, namespace: str, parts: Hashable) -> Hashable:
+        return (namespace, await self.backend.counter(("geracao", namespace)), parts)
+
+    async def get_or_load(
+        self,
+        namespace: str,
+        parts: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float | None = None,
+    ) -> Any:
+        if not self.enabled:
+            return await loader()
+
+        key = await self._key(namespace, parts)
+        value = await self.backend.get(key)
+        if value is not MISSING:
+            self.hits[namespace] += 1
+            return value
+
+        self.misses[namespace] += 1
+        value = await loader()
+        # None não é guardado: um id inexistente pode passar a existir
+        if value is not None:
+            await self.backend.set(key, value, self.ttl if ttl is None else ttl)
+        return value
+
+    async def delete(self, namespace: str, parts: Hashable) -> None:
+        await self.backend.delete(await self._key(namespace, parts))
+
+    async def invalidate(self, *namespaces: str) -> None:
+        for namespace in namespaces:
+            await self.backend.incr(("geracao", namespace))
+
+    def stats(self) -> dict:
+        namespaces = sorted(set(self.hits) | set(self.misses))
+        return {
+            "enabled": self.enabled,
+            "hits": sum(self.hits.values()),
+            "misses": sum(self.misses.values()),
+            "namespaces": {
+                ns: {"hits": self.hits[ns], "misses": self.misses[ns]} for ns in namespaces
+            },
+        }
+
+cache = Cache(MemoryBackend())
+
+def configure(backend: CacheBackend, ttl: float | None = None) -> None:
+    """Troca o backend do cache (por exemplo, por um compartilhado entre processos)."""
+    cache.backend = backend
+    if ttl is not None:
+        cache.ttl = ttl
+
+def freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+def _detach(value: Any) -> None:
+    # Objetos em cache são compartilhados entre requisições; tirá-los da sessão
+    # que os carregou evita que um rollback nela os expire.
+    if isinstance(value, Base):
+        session = object_session(value)
+        if session is not None:
+            session.expunge(value)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _detach(item)
+
+def cached(namespace: str, ttl: float | None = None):
+    """Cacheia uma função de repositório ``fn(db, *args, **kwargs)`` pelos argumentos após ``db``."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(db, *args, **kwargs):
+            async def load():
+                value = await fn(db, *args, **kwargs)
+                _detach(value)
+                return value
+            return await cache.get_or_load(namespace, freeze((args, kwargs)), load, ttl)
+
+        async def forget(*args, **kwargs) -> None:
+            await cache.delete(namespace, freeze((args, kwargs)))
+
+        wrapper.forget = forget
+        wrapper.namespace = namespace
+        return wrapper
+    return decorator
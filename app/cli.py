@@ -0,0 +1,75 @@
+import argparse
+import asyncio
+import json
+import sys
+from app import leaderboard, sales_rollup
+from app.database import AsyncSessionLocal, engine
+from app.repositories import rating_repository
+from app.services import import_service
+
+# Tarefas de manutenção fora da API:
+#   python -m app.cli import purchase compras.csv
+#   python -m app.cli import games jogos.ndjson --formato ndjson
+#   python -m app.cli rebuild-ratings [--jogo-id 42]
+#   python -m app.cli refresh-leaderboard
+#   python -m app.cli refresh-sales [--rebuild]
+
+def _progress(report: dict) -> None:
+    print(
+        f"{report['lidas']} lidas, {report['criadas']} criadas, "
+        f"{report['conflitos']} conflitos, {report['rejeitadas']} rejeitadas",
+        file=sys.stderr,
+    )
+
+async def _import(args: argparse.Namespace) -> None:
+    formato = args.formato or ("ndjson" if args.arquivo.endswith((".ndjson", ".jsonl")) else "csv")
+    with open(args.arquivo, encoding="utf-8-sig", newline="") as file:
+        async with AsyncSessionLocal() as db:
+            report = await import_service.import_file(db, args.entidade, file, formato, _progress)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+async def _rebuild_ratings(args: argparse.Namespace) -> None:
+    async with AsyncSessionLocal() as db:
+        jogos = await rating_repository.rebuild(db, args.jogo_id)
+    print(f"{jogos} jogos com agregados de nota", file=sys.stderr)
+
+async def _refresh_leaderboard(args: argparse.Namespace) -> None:
+    jogos = await leaderboard.refresh()
+    print(f"{jogos} jogos no ranking", file=sys.stderr)
+
+async def _refresh_sales(args: argparse.Namespace) -> None:
+    totals = await sales_rollup.refresh(args.rebuild)
+    for nome, compras in totals.items():
+        print(f"{compras} compras consolidadas em {nome}", file=sys.stderr)
+
+async def _run(args: argparse.Namespace) -> None:
+    try:
+        await args.handler(args)
+    finally:
+        await engine.dispose()
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="comando", required=True)
+
+    importar = commands.add_parser("import", help="importa um arquivo CSV ou NDJSON")
+    importar.add_argument("entidade", choices=sorted(import_service.TARGETS))
+    importar.add_argument("arquivo")
+    importar.add_argument("--formato", choices=sorted(import_service.FORMATS))
+    importar.set_defaults(handler=_import)
+
+    ratings = commands.add_parser("rebuild-ratings", help="recalcula game_rating_stats a partir de reviews")
+    ratings.add_argument("--jogo-id", type=int)
+    ratings.set_defaults(handler=_rebuild_ratings)
+
+    ranking = commands.add_parser("refresh-leaderboard", help="recalcula game_leaderboard")
+    ranking.set_defaults(handler=_refresh_leaderboard)
+
+    vendas = commands.add_parser("refresh-sales", help="consolida as compras novas em sales_daily e game_copurchase")
+    vendas.add_argument("--rebuild", action="store_true", help="apaga os agregados e consolida tudo de novo")
+    vendas.set_defaults(handler=_refresh_sales)
+
+    asyncio.run(_run(parser.parse_args(argv)))
+
+if __name__ == "__main__":
+    main()
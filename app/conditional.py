@@ -0,0 +1,119 @@
+import hashlib
+import re
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, List, Tuple
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel
+from app import serialization
+
+# Requisições condicionais. O GET de um item leva ETag forte (a versão da
+# linha) e Last-Modified (updated_at); as listagens levam ETag fraco, tirado
+# da própria página já buscada (linhas, total e cursor seguinte), sem outra
+# consulta. Quando If-None-Match (ou, no item, If-Modified-Since) bate, a
+# resposta é 304 sem serializar nada. No PUT, If-Match vira a
+# condição "version IN (...)" do UPDATE ... RETURNING e, se nenhuma linha
+# casar com o id existindo, 412; a resposta traz a linha devolvida e o ETag novo.
+
+ETAG = re.compile(r'"(\d+)(?:-[0-9a-f]+)?"')
+
+def _digest(*parts: Any) -> str:
+    return hashlib.sha1(repr(parts).encode()).hexdigest()[:16]
+
+def _utc(value: datetime) -> datetime:
+    # O SQLite devolve datas sem fuso; são gravadas em UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+def _tags(header: str) -> List[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+def _opaque(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+def strong_etag(version: int, fields: Tuple[str, ...] | None = None) -> str:
+    """ETag de um item; cada recorte de ?fields= é outra representação."""
+    if fields is None:
+        return f'"{version}"'
+    return f'"{version}-{_digest(fields)}"'
+
+def weak_etag(*parts: Any) -> str:
+    return f'W/"{_digest(*parts)}"'
+
+def page_etag(page: Dict[str, Any]) -> str:
+    """ETag fraco de uma página de listagem montada pelos services."""
+    items = [tuple(item) for item in page["items"]]
+    return weak_etag(items, page["page"], page["total"], page["total_aproximado"], page["next_cursor"])
+
+def none_match(if_none_match: str | None, etag: str | None) -> bool:
+    """True quando If-None-Match contém ``etag`` (comparação fraca)."""
+    if not if_none_match or etag is None:
+        return False
+    tags = _tags(if_none_match)
+    return "*" in tags or _opaque(etag) in {_opaque(tag) for tag in tags}
+
+def not_modified_since(if_modified_since: str | None, last_modified: datetime | None) -> bool:
+    if not if_modified_since or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    # Last-Modified só tem precisão de segundos
+    return _utc(last_modified).replace(microsecond=0) <= _utc(since)
+
+def validators(etag: str | None, last_modified: datetime | None = None) -> Dict[str, str]:
+    headers = {}
+    if etag is not None:
+        headers["ETag"] = etag
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_utc(last_modified), usegmt=True)
+    return headers
+
+def not_modified(etag: str | None, last_modified: datetime | None = None) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validators(etag, last_modified))
+
+def tagged(response: Response, etag: str | None, last_modified: datetime | None = None) -> Response:
+    response.headers.update(validators(etag, last_modified))
+    return response
+
+def representation(schema: type[BaseModel], obj: Any, fields: Tuple[str, ...] | None = None) -> Response:
+    """O item serializado com seus validadores; é também a resposta do PUT."""
+    return tagged(
+        serialization.response(schema, obj, fields=fields),
+        strong_etag(obj.version, fields),
+        obj.updated_at,
+    )
+
+def item_response(
+    schema: type[BaseModel],
+    obj: Any,
+    if_none_match: str | None,
+    if_modified_since: str | None,
+    fields: Tuple[str, ...] | None = None,
+) -> Response:
+    """Resposta do GET de um item, ou 304 se o cliente já tem esta versão."""
+    etag = strong_etag(obj.version, fields)
+    fresh = (
+        none_match(if_none_match, etag)
+        if if_none_match is not None
+        else not_modified_since(if_modified_since, obj.updated_at)
+    )
+    if fresh:
+        return not_modified(etag, obj.updated_at)
+    return representation(schema, obj, fields)
+
+def expected_versions(if_match: str | None) -> List[int] | None:
+    """Versões aceitas pelo If-Match de um PUT; None sem o cabeçalho ou com "*"."""
+    if not if_match:
+        return None
+    tags = _tags(if_match)
+    if "*" in tags:
+        return None
+    # If-Match usa comparação forte: ETags fracos nunca casam
+    return [int(match.group(1)) for tag in tags if (match := ETAG.fullmatch(tag))]
+
+def precondition_failed() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="O recurso foi alterado desde a versão enviada em If-Match",
+    )
@@ -0,0 +1,17 @@
+from datetime import date
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db
+from app.schemas.analytics_schema import RevenueReport
+from app.services import analytics_service
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+@router.get("/revenue", response_model=RevenueReport, response_model_exclude_none=True)
+async def revenue(
+    group_by: str = "day",
+    de: date | None = Query(None, alias="from"),
+    ate: date | None = Query(None, alias="to"),
+    db: AsyncSession = Depends(get_db),
+):
+    return await analytics_service.revenue(db, group_by, de, ate)
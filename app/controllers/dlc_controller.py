@@ -1,10 +1,12 @@
 from decimal import Decimal
-from typing import Any, Dict
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Any, Dict, List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from app import conditional, serialization
 from app.database import get_db
 from app.models.dlc_model import DLCModel
 from app.schemas.dlc_schema import DLCCreate, DLCModelId
+from app.schemas.bulk import BulkResult
 from app.schemas.pagination import PaginatedResponse
 from app.services import dlc_service
 
@@ -14,27 +16,42 @@ router = APIRouter(prefix="/dlcs", tags=["dlcs"])
 async def create_dlc(dlc: DLCCreate, db: AsyncSession = Depends(get_db)):
   return await dlc_service.create(db, dlc.model_dump())
 
+@router.post("/bulk", response_model=BulkResult)
+async def create_dlcs_bulk(dlcs: List[DLCCreate], db: AsyncSession = Depends(get_db)):
+  return await dlc_service.create_many(db, [item.model_dump() for item in dlcs])
+
 @router.get("/", response_model=PaginatedResponse[DLCModelId])
 async def list_dlcs(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    order: str = "id",
+    after: str | None = None,
+    with_total: bool = True,
     titulo: str | None = None,
     desenvolvedora: str | None = None,
     preco_min: Decimal | None = Query(None, alias="precoMin"),
     preco_max: Decimal | None = Query(None, alias="precoMax"),
+    fields: str | None = None,
+    if_none_match: str | None = Header(None),
     db:   AsyncSession = Depends(get_db),
 ):
+    selected = serialization.select_fields(DLCModelId, fields)
     filters: Dict[str, Any] = {}
     if titulo:          filters["titulo"]         = titulo
     if desenvolvedora:  filters["desenvolvedora"] = desenvolvedora
     if preco_min is not None: filters["preco_min"] = preco_min
     if preco_max is not None: filters["preco_max"] = preco_max
 
-    return await dlc_service.paginated_list(db, page, limit, filters)
+    result = await dlc_service.paginated_list(db, page, limit, filters, order, after, with_total, selected)
+    etag = conditional.page_etag(result)
+    if conditional.none_match(if_none_match, etag):
+        return conditional.not_modified(etag)
+    return conditional.tagged(serialization.page_response(DLCModelId, result, selected), etag)
   
 @router.get("/quantidade")
 async def quantidade(db: AsyncSession = Depends(get_db)):
-    return {"quantidade": await dlc_service.count(db)}
+    quantidade, aproximado = await dlc_service.count(db)
+    return {"quantidade": quantidade, "aproximado": aproximado}
   
 @router.get("/search", response_model=PaginatedResponse[DLCModelId])
 async def search_dlc(
@@ -42,21 +59,45 @@ async def search_dlc(
     value: str = Query(...),
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    order: str = "id",
+    after: str | None = None,
+    with_total: bool = True,
+    modo: str = "contem",
+    fields: str | None = None,
     db: AsyncSession = Depends(get_db),
 ):
+    selected = serialization.select_fields(DLCModelId, fields)
     if not hasattr(DLCModel, field):
         raise HTTPException(status_code=400, detail=f"Campo inválido: {field}")
 
+    if modo != "contem":
+        return serialization.page_response(DLCModelId, await dlc_service.search(db, field, value, modo, page, limit, with_total, selected), selected)
+
     filters = {field: int(value) if value.isdigit() else value}
-    return await dlc_service.paginated_list(db, page, limit, filters)
+    return serialization.page_response(DLCModelId, await dlc_service.paginated_list(db, page, limit, filters, order, after, with_total, selected), selected)
 
 @router.get("/{dlc_id}", response_model=DLCModelId)
-async def get_dlc(dlc_id: int, db: AsyncSession = Depends(get_db)):
-    return await dlc_service.get(db, dlc_id)
+async def get_dlc(
+    dlc_id: int,
+    fields: str | None = None,
+    if_none_match: str | None = Header(None),
+    if_modified_since: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    selected = serialization.select_fields(DLCModelId, fields)
+    obj = await dlc_service.get(db, dlc_id)
+    return conditional.item_response(DLCModelId, obj, if_none_match, if_modified_since, selected)
 
-@router.put("/{dlc_id}")
-async def update_dlc(dlc_id: int, dlc: DLCCreate, db: AsyncSession = Depends(get_db)):
-    return await dlc_service.update(db, dlc_id, dlc.model_dump())
+@router.put("/{dlc_id}", response_model=DLCModelId)
+async def update_dlc(
+    dlc_id: int,
+    dlc: DLCCreate,
+    if_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    versions = conditional.expected_versions(if_match)
+    obj = await dlc_service.update(db, dlc_id, dlc.model_dump(), versions)
+    return conditional.representation(DLCModelId, obj)
 
 @router.delete("/{dlc_id}")
 async def delete_dlc(dlc_id: int, db: AsyncSession = Depends(get_db)):
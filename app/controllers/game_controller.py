@@ -1,10 +1,12 @@
 from decimal import Decimal
-from typing import Any, Dict
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Any, Dict, List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from app import conditional, serialization
 from app.database import get_db
 from app.models.game_model import Game
-from app.schemas.game_schema import GameCreate, GameModel
+from app.schemas.game_schema import GameAlsoBoughtEntry, GameCreate, GameLeaderboardEntry, GameModel, GameRankModel, GameRatingModel
+from app.schemas.bulk import BulkResult
 from app.schemas.pagination import PaginatedResponse
 from app.services import game_service
 
@@ -14,27 +16,42 @@ router = APIRouter(prefix="/games", tags=["games"])
 async def create_game(game: GameCreate, db: AsyncSession = Depends(get_db)):
     return await game_service.create(db, game.model_dump())
 
+@router.post("/bulk", response_model=BulkResult)
+async def create_games_bulk(games: List[GameCreate], db: AsyncSession = Depends(get_db)):
+    return await game_service.create_many(db, [item.model_dump() for item in games])
+
 @router.get("/", response_model=PaginatedResponse[GameModel])
 async def list_games(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    order: str = "id",
+    after: str | None = None,
+    with_total: bool = True,
     titulo: str | None = None,
     desenvolvedora: str | None = None,
     preco_min: Decimal | None = Query(None, alias="precoMin"),
     preco_max: Decimal | None = Query(None, alias="precoMax"),
+    fields: str | None = None,
+    if_none_match: str | None = Header(None),
     db:   AsyncSession = Depends(get_db),
 ):
+    selected = serialization.select_fields(GameModel, fields)
     filters: Dict[str, Any] = {}
     if titulo:          filters["titulo"]         = titulo
     if desenvolvedora:  filters["desenvolvedora"] = desenvolvedora
     if preco_min is not None: filters["preco_min"] = preco_min
     if preco_max is not None: filters["preco_max"] = preco_max
 
-    return await game_service.paginated_list(db, page, limit, filters)
+    result = await game_service.paginated_list(db, page, limit, filters, order, after, with_total, selected)
+    etag = conditional.page_etag(result)
+    if conditional.none_match(if_none_match, etag):
+        return conditional.not_modified(etag)
+    return conditional.tagged(serialization.page_response(GameModel, result, selected), etag)
 
 @router.get("/quantidade")
 async def quantidade(db: AsyncSession = Depends(get_db)):
-    return {"quantidade": await game_service.count(db)}
+    quantidade, aproximado = await game_service.count(db)
+    return {"quantidade": quantidade, "aproximado": aproximado}
 
 @router.get("/search", response_model=PaginatedResponse[GameModel])
 async def search_game(
@@ -42,22 +59,95 @@ async def search_game(
     value: str = Query(...),
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    order: str = "id",
+    after: str | None = None,
+    with_total: bool = True,
+    modo: str = "contem",
+    fields: str | None = None,
     db: AsyncSession = Depends(get_db),
 ):
+    selected = serialization.select_fields(GameModel, fields)
     if not hasattr(Game, field):
         raise HTTPException(status_code=400, detail=f"Campo inválido: {field}")
 
+    if modo != "contem":
+        return serialization.page_response(GameModel, await game_service.search(db, field, value, modo, page, limit, with_total, selected), selected)
+
     filters = {field: int(value) if value.isdigit() else value}
-    return await game_service.paginated_list(db, page, limit, filters)
+    return serialization.page_response(GameModel, await game_service.paginated_list(db, page, limit, filters, order, after, with_total, selected), selected)
+
+
+@router.get("/export")
+async def export_games(
+    formato: str = "ndjson",
+    titulo: str | None = None,
+    desenvolvedora: str | None = None,
+    preco_min: Decimal | None = Query(None, alias="precoMin"),
+    preco_max: Decimal | None = Query(None, alias="precoMax"),
+):
+    filters: Dict[str, Any] = {}
+    if titulo:          filters["titulo"]         = titulo
+    if desenvolvedora:  filters["desenvolvedora"] = desenvolvedora
+    if preco_min is not None: filters["preco_min"] = preco_min
+    if preco_max is not None: filters["preco_max"] = preco_max
+
+    return game_service.export(filters, formato)
+
+@router.get("/leaderboard", response_model=PaginatedResponse[GameLeaderboardEntry])
+async def leaderboard(
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, ge=1, le=100),
+    with_total: bool = True,
+    desenvolvedora: str | None = None,
+    preco_min: Decimal | None = Query(None, alias="precoMin"),
+    preco_max: Decimal | None = Query(None, alias="precoMax"),
+    db: AsyncSession = Depends(get_db),
+):
+    filters: Dict[str, Any] = {}
+    if desenvolvedora:  filters["desenvolvedora"] = desenvolvedora
+    if preco_min is not None: filters["preco_min"] = preco_min
+    if preco_max is not None: filters["preco_max"] = preco_max
 
+    return await game_service.leaderboard(db, page, limit, filters, with_total)
 
 @router.get("/{game_id}", response_model=GameModel)
-async def get_game(game_id: int, db: AsyncSession = Depends(get_db)):
-    return await game_service.get(db, game_id)
+async def get_game(
+    game_id: int,
+    fields: str | None = None,
+    if_none_match: str | None = Header(None),
+    if_modified_since: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    selected = serialization.select_fields(GameModel, fields)
+    obj = await game_service.get(db, game_id)
+    return conditional.item_response(GameModel, obj, if_none_match, if_modified_since, selected)
+
+@router.get("/{game_id}/rating", response_model=GameRatingModel)
+async def get_game_rating(game_id: int, db: AsyncSession = Depends(get_db)):
+    return await game_service.rating(db, game_id)
 
-@router.put("/{game_id}")
-async def update_game(game_id: int, game: GameCreate, db: AsyncSession = Depends(get_db)):
-    return await game_service.update(db, game_id, game.model_dump())
+@router.get("/{game_id}/rank", response_model=GameRankModel)
+async def get_game_rank(game_id: int, db: AsyncSession = Depends(get_db)):
+    return await game_service.rank(db, game_id)
+
+@router.get("/{game_id}/also-bought", response_model=List[GameAlsoBoughtEntry])
+async def get_game_also_bought(
+    game_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+):
+    return await game_service.also_bought(db, game_id, limit)
+
+@router.put("/{game_id}", response_model=GameModel)
+async def update_game(
+    game_id: int,
+    game: GameCreate,
+    if_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    versions = conditional.expected_versions(if_match)
+    obj = await game_service.update(db, game_id, game.model_dump(), versions)
+    return conditional.representation(GameModel, obj)
 
 @router.delete("/{game_id}")
 async def delete_game(game_id: int, db: AsyncSession = Depends(get_db)):
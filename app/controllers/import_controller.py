@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db
+from app.services import import_service
+
+router = APIRouter(prefix="/import", tags=["import"])
+
+@router.post("/{entidade}")
+async def import_rows(
+    entidade: str,
+    request: Request,
+    formato: str = "csv",
+    db: AsyncSession = Depends(get_db),
+):
+    # O arquivo vem cru no corpo (text/csv ou application/x-ndjson)
+    return await import_service.import_body(db, entidade, request.stream(), formato)
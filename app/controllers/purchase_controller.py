@@ -1,9 +1,11 @@
 from decimal import Decimal
-from typing import Any, Dict
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Any, Dict, List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from app import conditional, serialization
 from app.database import get_db
 from app.models.purchase_model import Purchase
+from app.schemas.bulk import BulkResult
 from app.schemas.pagination import PaginatedResponse
 from app.schemas.purchase_schema import PurchaseCreate, PurchaseModel
 from app.services import purchase_service
@@ -14,17 +16,27 @@ router = APIRouter(prefix="/purchase", tags=["purchase"])
 async def create_purchase(purchase: PurchaseCreate, db: AsyncSession = Depends(get_db)):
   return await purchase_service.create(db, purchase.model_dump())
 
+@router.post("/bulk", response_model=BulkResult)
+async def create_purchases_bulk(purchases: List[PurchaseCreate], db: AsyncSession = Depends(get_db)):
+  return await purchase_service.create_many(db, [item.model_dump() for item in purchases])
+
 @router.get("/", response_model=PaginatedResponse[PurchaseModel])
 async def list_purchases(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    order: str = "id",
+    after: str | None = None,
+    with_total: bool = True,
     usuario_id: int | None = None,
     jogo_id: int | None = None,
     preco_min: Decimal | None = Query(None, alias="precoMin"),
     preco_max: Decimal | None = Query(None, alias="precoMax"),
     forma_pagamento: str | None = None,
+    fields: str | None = None,
+    if_none_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
 ):
+    selected = serialization.select_fields(PurchaseModel, fields)
     filters: Dict[str, Any] = {}
     if usuario_id is not None:
         filters["usuario_id"] = usuario_id
@@ -37,19 +49,16 @@ async def list_purchases(
     if forma_pagamento is not None:
         filters["forma_pagamento"] = forma_pagamento
 
-    items  = await purchase_service.list_(db, page, limit, filters)
-    total  = await purchase_service.count_filtered(db, filters)
-
-    return {
-        "page":     page,
-        "per_page": limit,
-        "total":    total,
-        "items":    items,
-    }
+    result = await purchase_service.paginated_list(db, page, limit, filters, order, after, with_total, selected)
+    etag = conditional.page_etag(result)
+    if conditional.none_match(if_none_match, etag):
+        return conditional.not_modified(etag)
+    return conditional.tagged(serialization.page_response(PurchaseModel, result, selected), etag)
   
 @router.get("/quantidade")
 async def quantidade(db: AsyncSession = Depends(get_db)):
-    return {"quantidade": await purchase_service.count(db)}
+    quantidade, aproximado = await purchase_service.count(db)
+    return {"quantidade": quantidade, "aproximado": aproximado}
   
 @router.get("/search", response_model=PaginatedResponse[PurchaseModel])
 async def search_purchase(
@@ -57,25 +66,72 @@ async def search_purchase(
     value: str = Query(...),
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    order: str = "id",
+    after: str | None = None,
+    with_total: bool = True,
+    modo: str = "contem",
+    fields: str | None = None,
     db: AsyncSession = Depends(get_db),
 ):
+    selected = serialization.select_fields(PurchaseModel, fields)
     if not hasattr(Purchase, field):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Campo inválido: {field}",
         )
 
+    if modo != "contem":
+        return serialization.page_response(PurchaseModel, await purchase_service.search(db, field, value, modo, page, limit, with_total, selected), selected)
+
     filters = {field: int(value) if value.isdigit() else value}
-    return await purchase_service.paginated_list(db, page, limit, filters)
+    return serialization.page_response(PurchaseModel, await purchase_service.paginated_list(db, page, limit, filters, order, after, with_total, selected), selected)
 
   
+@router.get("/export")
+async def export_purchases(
+    formato: str = "ndjson",
+    usuario_id: int | None = None,
+    jogo_id: int | None = None,
+    preco_min: Decimal | None = Query(None, alias="precoMin"),
+    preco_max: Decimal | None = Query(None, alias="precoMax"),
+    forma_pagamento: str | None = None,
+):
+    filters: Dict[str, Any] = {}
+    if usuario_id is not None:
+        filters["usuario_id"] = usuario_id
+    if jogo_id is not None:
+        filters["jogo_id"] = jogo_id
+    if preco_min is not None:
+        filters["preco_min"] = preco_min
+    if preco_max is not None:
+        filters["preco_max"] = preco_max
+    if forma_pagamento is not None:
+        filters["forma_pagamento"] = forma_pagamento
+
+    return purchase_service.export(filters, formato)
+
 @router.get("/{purchase_id}", response_model=PurchaseModel)
-async def get_purchase(purchase_id: int, db: AsyncSession = Depends(get_db)):
-    return await purchase_service.get(db, purchase_id)
+async def get_purchase(
+    purchase_id: int,
+    fields: str | None = None,
+    if_none_match: str | None = Header(None),
+    if_modified_since: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    selected = serialization.select_fields(PurchaseModel, fields)
+    obj = await purchase_service.get(db, purchase_id)
+    return conditional.item_response(PurchaseModel, obj, if_none_match, if_modified_since, selected)
   
-@router.put("/{purchase_id}")
-async def update_purchase(purchase_id: int, purchase: PurchaseCreate, db: AsyncSession = Depends(get_db)):
-    return await purchase_service.update(db, purchase_id, purchase.model_dump())
+@router.put("/{purchase_id}", response_model=PurchaseModel)
+async def update_purchase(
+    purchase_id: int,
+    purchase: PurchaseCreate,
+    if_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    versions = conditional.expected_versions(if_match)
+    obj = await purchase_service.update(db, purchase_id, purchase.model_dump(), versions)
+    return conditional.representation(PurchaseModel, obj)
   
 @router.delete("/{purchase_id}")
 async def delete_purchase(purchase_id: int, db: AsyncSession = Depends(get_db)):
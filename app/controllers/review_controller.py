@@ -1,9 +1,11 @@
-from typing import Any, Dict
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Any, Dict, List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
 from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
+from app import conditional, serialization
 from app.database import get_db
 from app.models.review_model import Review
+from app.schemas.bulk import BulkResult
 from app.schemas.pagination import PaginatedResponse
 from app.schemas.review_schema import ReviewCreate, ReviewModel
 from app.services import review_service
@@ -14,16 +16,26 @@ router = APIRouter(prefix="/reviews", tags=["reviews"])
 async def create_review(review: ReviewCreate, db: AsyncSession = Depends(get_db)):
     return await review_service.create(db, review.model_dump())
 
+@router.post("/bulk", response_model=BulkResult)
+async def create_reviews_bulk(reviews: List[ReviewCreate], db: AsyncSession = Depends(get_db)):
+    return await review_service.create_many(db, [item.model_dump() for item in reviews])
+
 @router.get("/", response_model=PaginatedResponse[ReviewModel])
 async def list_reviews(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    order: str = "id",
+    after: str | None = None,
+    with_total: bool = True,
     usuario_id: int | None = None,
     jogo_id: int | None = None,
     nota_min: int | None = Query(None, ge=1, le=10),
     nota_max: int | None = Query(None, ge=1, le=10),
+    fields: str | None = None,
+    if_none_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
 ):
+    selected = serialization.select_fields(ReviewModel, fields)
     filters: Dict[str, Any] = {}
     if usuario_id is not None:
         filters["usuario_id"] = usuario_id
@@ -34,11 +46,16 @@ async def list_reviews(
     if nota_max is not None:
         filters["nota_max"] = nota_max
 
-    return await review_service.list_(db, page, limit, filters)
+    result = await review_service.list_(db, page, limit, filters, order, after, with_total, selected)
+    etag = conditional.page_etag(result)
+    if conditional.none_match(if_none_match, etag):
+        return conditional.not_modified(etag)
+    return conditional.tagged(serialization.page_response(ReviewModel, result, selected), etag)
 
 @router.get("/quantidade")
 async def quantidade_reviews(db: AsyncSession = Depends(get_db)):
-    return {"quantidade": await review_service.count(db)}
+    quantidade, aproximado = await review_service.count(db)
+    return {"quantidade": quantidade, "aproximado": aproximado}
 
 @router.get("/search", response_model=PaginatedResponse[ReviewModel])
 async def search_review(
@@ -46,8 +63,14 @@ async def search_review(
     value: str = Query(...),
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    order: str = "id",
+    after: str | None = None,
+    with_total: bool = True,
+    modo: str = "contem",
+    fields: str | None = None,
     db: AsyncSession = Depends(get_db),
 ):
+    selected = serialization.select_fields(ReviewModel, fields)
     mapper = inspect(Review)
     if field not in mapper.columns:
         raise HTTPException(
@@ -55,6 +78,9 @@ async def search_review(
             detail=f"Campo inválido: {field}"
         )
 
+    if modo != "contem":
+        return serialization.page_response(ReviewModel, await review_service.search(db, field, value, modo, page, limit, with_total, selected), selected)
+
     column = mapper.columns[field]
     python_type = column.type.python_type
     try:
@@ -66,15 +92,50 @@ async def search_review(
         )
 
     filters = {field: typed_value}
-    return await review_service.list_(db, page, limit, filters)
+    return serialization.page_response(ReviewModel, await review_service.list_(db, page, limit, filters, order, after, with_total, selected), selected)
+
+@router.get("/export")
+async def export_reviews(
+    formato: str = "ndjson",
+    usuario_id: int | None = None,
+    jogo_id: int | None = None,
+    nota_min: int | None = Query(None, ge=1, le=10),
+    nota_max: int | None = Query(None, ge=1, le=10),
+):
+    filters: Dict[str, Any] = {}
+    if usuario_id is not None:
+        filters["usuario_id"] = usuario_id
+    if jogo_id is not None:
+        filters["jogo_id"] = jogo_id
+    if nota_min is not None:
+        filters["nota_min"] = nota_min
+    if nota_max is not None:
+        filters["nota_max"] = nota_max
+
+    return review_service.export(filters, formato)
 
 @router.get("/{review_id}", response_model=ReviewModel)
-async def get_review(review_id: int, db: AsyncSession = Depends(get_db)):
-    return await review_service.get(db, review_id)
+async def get_review(
+    review_id: int,
+    fields: str | None = None,
+    if_none_match: str | None = Header(None),
+    if_modified_since: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    selected = serialization.select_fields(ReviewModel, fields)
+    obj = await review_service.get(db, review_id)
+    return conditional.item_response(ReviewModel, obj, if_none_match, if_modified_since, selected)
 
-@router.put("/{review_id}")
-async def update_review(review_id: int, review: ReviewCreate, db: AsyncSession = Depends(get_db)):
-    return await review_service.update(db, review_id, review.model_dump())
+@router.put("/{review_id}", response_model=ReviewModel)
+async def update_review(
+    review_id: int,
+    review: ReviewCreate,
+    if_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    versions = conditional.expected_versions(if_match)
+    obj = await review_service.update(db, review_id, review.model_dump(), versions)
+    return conditional.representation(ReviewModel, obj)
 
 @router.delete("/{review_id}")
 async def delete_review(review_id: int, db: AsyncSession = Depends(get_db)):
@@ -1,8 +1,10 @@
-from typing import Any, Dict
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Any, Dict, List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from app import conditional, serialization
 from app.database import get_db
 from app.models.user_model import User
+from app.schemas.bulk import BulkResult
 from app.schemas.pagination import PaginatedResponse
 from app.schemas.user_schema import UserCreate, UserModel
 from app.services import user_service
@@ -13,26 +15,41 @@ router = APIRouter(prefix="/users", tags=["users"])
 async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
     return await user_service.create(db, user.model_dump())
 
+@router.post("/bulk", response_model=BulkResult)
+async def create_users_bulk(users: List[UserCreate], db: AsyncSession = Depends(get_db)):
+    return await user_service.create_many(db, [item.model_dump() for item in users])
+
 @router.get("/", response_model=PaginatedResponse[UserModel])  # ou PaginatedUsers
 async def list_users(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    order: str = "id",
+    after: str | None = None,
+    with_total: bool = True,
     nome: str | None = None,
     email: str | None = None,
     pais: str | None = None,
+    fields: str | None = None,
+    if_none_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
 ):
+    selected = serialization.select_fields(UserModel, fields)
     filters: Dict[str, Any] = {}
     if nome:   filters["nome"]  = nome
     if email:  filters["email"] = email
     if pais:   filters["pais"]  = pais
 
-    return await user_service.paginated_list(db, page, limit, filters)
+    result = await user_service.paginated_list(db, page, limit, filters, order, after, with_total, selected)
+    etag = conditional.page_etag(result)
+    if conditional.none_match(if_none_match, etag):
+        return conditional.not_modified(etag)
+    return conditional.tagged(serialization.page_response(UserModel, result, selected), etag)
 
 
 @router.get("/quantidade")
 async def quantidade_users(db: AsyncSession = Depends(get_db)):
-    return {"quantidade": await user_service.count(db)}
+    quantidade, aproximado = await user_service.count(db)
+    return {"quantidade": quantidade, "aproximado": aproximado}
 
 @router.get("/search", response_model=PaginatedResponse[UserModel])
 async def search_user(
@@ -40,11 +57,20 @@ async def search_user(
     value: str = Query(...),
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    order: str = "id",
+    after: str | None = None,
+    with_total: bool = True,
+    modo: str = "contem",
+    fields: str | None = None,
     db: AsyncSession = Depends(get_db),
 ):
+    selected = serialization.select_fields(UserModel, fields)
     if not hasattr(User, field):
         raise HTTPException(400, f"Campo inválido: {field}")
 
+    if modo != "contem":
+        return serialization.page_response(UserModel, await user_service.search(db, field, value, modo, page, limit, with_total, selected), selected)
+
     column = getattr(User, field)
     if hasattr(column.type, "python_type") and column.type.python_type is int:
         try:
@@ -53,16 +79,45 @@ async def search_user(
             raise HTTPException(400, "Valor deve ser inteiro")
 
     filters = {field: value}
-    return await user_service.paginated_list(db, page, limit, filters)
+    return serialization.page_response(UserModel, await user_service.paginated_list(db, page, limit, filters, order, after, with_total, selected), selected)
+
+
+@router.get("/export")
+async def export_users(
+    formato: str = "ndjson",
+    nome: str | None = None,
+    email: str | None = None,
+    pais: str | None = None,
+):
+    filters: Dict[str, Any] = {}
+    if nome:   filters["nome"]  = nome
+    if email:  filters["email"] = email
+    if pais:   filters["pais"]  = pais
 
+    return user_service.export(filters, formato)
 
 @router.get("/{user_id}", response_model=UserModel)
-async def get_user(user_id: int, db: AsyncSession = Depends(get_db)):
-    return await user_service.get(db, user_id)
+async def get_user(
+    user_id: int,
+    fields: str | None = None,
+    if_none_match: str | None = Header(None),
+    if_modified_since: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    selected = serialization.select_fields(UserModel, fields)
+    obj = await user_service.get(db, user_id)
+    return conditional.item_response(UserModel, obj, if_none_match, if_modified_since, selected)
 
-@router.put("/{user_id}")
-async def update_user(user_id: int, user: UserCreate, db: AsyncSession = Depends(get_db)):
-    return await user_service.update(db, user_id, user.model_dump())
+@router.put("/{user_id}", response_model=UserModel)
+async def update_user(
+    user_id: int,
+    user: UserCreate,
+    if_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    versions = conditional.expected_versions(if_match)
+    obj = await user_service.update(db, user_id, user.model_dump(), versions)
+    return conditional.representation(UserModel, obj)
 
 @router.delete("/{user_id}")
 async def delete_user(user_id: int, db: AsyncSession = Depends(get_db)):
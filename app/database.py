@@ -1,4 +1,6 @@
 from collections.abc import AsyncGenerator
+from uuid import uuid4
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 import os
@@ -9,11 +11,87 @@ load_dotenv()
 class Base(DeclarativeBase):
     pass
 
-DATABASE_URL = str = os.getenv("DATABASE_URL")
+DATABASE_URL: str = os.getenv("DATABASE_URL")
 
-engine = create_async_engine(DATABASE_URL, echo=False)
+def _flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() not in {"0", "false", "no"}
+
+DB_ECHO = _flag("DB_ECHO", "false")
+# Conexões mantidas abertas e quantas a mais podem ser abertas em pico
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+# Segundos esperando uma conexão livre antes de TimeoutError
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_PRE_PING = _flag("DB_POOL_PRE_PING", "false")
+# Segundos até reciclar uma conexão (-1 = nunca)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+# statement_timeout do PostgreSQL em milissegundos (0 = sem limite)
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+# Cache de prepared statements do asyncpg e do dialeto do SQLAlchemy
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+DB_PREPARED_STATEMENT_CACHE_SIZE = int(os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", "100"))
+# PgBouncer em modo transaction não mantém prepared statements entre transações
+DB_PGBOUNCER = _flag("DB_PGBOUNCER", "false")
+
+def _engine_options(url: str) -> tuple:
+    """URL e argumentos de create_async_engine conforme o banco e o driver."""
+    parsed = make_url(url)
+    options = {
+        "echo": DB_ECHO,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+
+    # O SQLite usa pools próprios (StaticPool em memória) que não aceitam tamanho
+    if parsed.get_backend_name() != "sqlite":
+        options["pool_size"] = DB_POOL_SIZE
+        options["max_overflow"] = DB_MAX_OVERFLOW
+        options["pool_timeout"] = DB_POOL_TIMEOUT
+
+    if parsed.get_driver_name() == "asyncpg":
+        connect_args = {"statement_cache_size": DB_STATEMENT_CACHE_SIZE}
+        prepared_cache = DB_PREPARED_STATEMENT_CACHE_SIZE
+        if DB_PGBOUNCER:
+            connect_args["statement_cache_size"] = 0
+            # Nomes únicos evitam colisão com statements de outra conexão do servidor
+            connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+            prepared_cache = 0
+        if DB_STATEMENT_TIMEOUT_MS:
+            connect_args["server_settings"] = {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+        options["connect_args"] = connect_args
+        parsed = parsed.update_query_dict({"prepared_statement_cache_size": str(prepared_cache)})
+
+    return parsed, options
+
+_url, _options = _engine_options(DATABASE_URL)
+engine = create_async_engine(_url, **_options)
 AsyncSessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
+def _waiters(pool) -> int | None:
+    # A fila asyncio do AsyncAdaptedQueuePool é criada no primeiro uso e não
+    # tem API pública para quem está esperando; lemos os atributos com cuidado.
+    queue = getattr(getattr(pool, "_pool", None), "__dict__", {}).get("_queue")
+    getters = getattr(queue, "_getters", None)
+    if queue is None:
+        return 0 if hasattr(pool, "_pool") else None
+    if getters is None:
+        return None
+    return sum(1 for getter in getters if not getter.done())
+
+def pool_stats() -> dict:
+    """Situação atual do pool de conexões, para monitoramento."""
+    pool = engine.pool
+    stats = {"pool": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    stats["waiters"] = _waiters(pool)
+    if "size" in stats:
+        stats["max_overflow"] = getattr(pool, "_max_overflow", None)
+        stats["timeout"] = getattr(pool, "_timeout", None)
+    return stats
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
-        yield session
\ No newline at end of file
+        yield session
@@ -1,26 +1,101 @@
+import atexit
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import random
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LOG_DIR = os.getenv("LOG_DIR", "logs")
+# text | json (uma linha JSON por registro)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+# none | size | time
+LOG_ROTATION = os.getenv("LOG_ROTATION", "none")
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN", "midnight")
+# Fração dos registros mantida por nível (1.0 = todos)
+LOG_SAMPLE_RATES = {
+    logging.INFO: float(os.getenv("LOG_SAMPLE_INFO", "1.0")),
+    logging.ERROR: float(os.getenv("LOG_SAMPLE_ERROR", "1.0")),
+}
 
 # Garante que o diretório de logs existe
-os.makedirs("logs", exist_ok=True)
+os.makedirs(LOG_DIR, exist_ok=True)
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "extra_fields", {}))
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, rates: dict):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self.rates.get(record.levelno, 1.0)
+        return rate >= 1.0 or random.random() < rate
+
+def _file_handler(filename: str) -> logging.Handler:
+    path = os.path.join(LOG_DIR, filename)
+    if LOG_ROTATION == "size":
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+    elif LOG_ROTATION == "time":
+        handler = logging.handlers.TimedRotatingFileHandler(
+            path, when=LOG_ROTATE_WHEN, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+    else:
+        handler = logging.FileHandler(path, encoding="utf-8")
+
+    if LOG_FORMAT == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    return handler
+
+def queue_logger(name: str, filename: str, sample_rates: dict | None = None) -> logging.Logger:
+    """Logger que só enfileira os registros; a escrita em disco fica numa thread própria.
+
+    Assim um disco lento não segura o event loop dentro dos handlers async.
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    # Evitar adicionar múltiplos handlers se importar várias vezes
+    if logger.handlers:
+        return logger
 
-# Configura o logger
-logger = logging.getLogger("api_logger")
-logger.setLevel(logging.INFO)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    if sample_rates:
+        queue_handler.addFilter(SamplingFilter(sample_rates))
+    logger.addHandler(queue_handler)
 
-# Formato das mensagens
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    listener = logging.handlers.QueueListener(log_queue, _file_handler(filename), respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return logger
 
-# Configura o arquivo de saída
-file_handler = logging.FileHandler("logs/api.log")
-file_handler.setFormatter(formatter)
+logger = queue_logger("api_logger", "api.log", LOG_SAMPLE_RATES)
 
-# Evitar adicionar múltiplos handlers se importar várias vezes
-if not logger.hasHandlers():
-    logger.addHandler(file_handler)
+def info_(message: str, **fields):
+    logger.info(message, extra={"extra_fields": fields} if fields else None)
 
-def info_(message: str):
-    logger.info(message)
+def error_(message: str, **fields):
+    logger.error(message, extra={"extra_fields": fields} if fields else None)
 
-def error_(message: str):
-    logger.error(message)
\ No newline at end of file
+def warning_(message: str, **fields):
+    logger.warning(message, extra={"extra_fields": fields} if fields else None)
@@ -0,0 +1,141 @@
+import os
+import time
+from contextvars import ContextVar
+from dotenv import load_dotenv
+from fastapi import FastAPI
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app import file_logger as logger, metrics, slow_queries
+
+load_dotenv()
+
+# Medição por requisição: um middleware ASGI abre um RequestStats num
+# ContextVar e os eventos do engine somam nele o tempo, a quantidade de
+# queries e as linhas de cada statement executado durante a requisição. O
+# resultado vai no cabeçalho Server-Timing e no log. Queries feitas fora de
+# uma requisição (tarefas de fundo, CLI) não são contadas. Os mesmos eventos
+# alimentam app.metrics e o log de queries lentas (app.slow_queries).
+
+def _flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() not in {"0", "false", "no"}
+
+INSTRUMENTATION_ENABLED = _flag("INSTRUMENTATION_ENABLED", "true")
+# Loga toda requisição; com false só as que passam do limite de queries
+REQUEST_LOG_ENABLED = _flag("REQUEST_LOG_ENABLED", "true")
+# Acima disso a requisição é logada como WARNING (provável N+1)
+QUERY_COUNT_THRESHOLD = int(os.getenv("QUERY_COUNT_THRESHOLD", "20"))
+
+class RequestStats:
+    __slots__ = ("scope", "start", "queries", "db_seconds", "rows")
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def server_timing(self) -> str:
+        return (
+            f"app;dur={self.elapsed() * 1000:.2f}, "
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.queries} queries, {self.rows} linhas"'
+        )
+
+current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+def route_path(scope: dict) -> str:
+    """Caminho da rota (/games/{game_id}) quando o roteamento já aconteceu."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or scope.get("path", "")
+
+def _rows(cursor) -> int:
+    # Os cursores dos adaptadores async (asyncpg, aiosqlite) já trazem o
+    # resultado inteiro em _rows; fora disso vale o rowcount do driver.
+    rows = getattr(cursor, "_rows", None)
+    if rows is not None and cursor.description is not None:
+        return len(rows)
+    return max(cursor.rowcount or 0, 0)
+
+# O início fica no contexto de execução do statement, não na conexão: quando
+# o statement falha o after_cursor_execute não roda, e o contexto vai embora
+# com ele em vez de deixar um valor órfão para o próximo.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_start
+    metrics.observe_query(elapsed)
+    stats = current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+        stats.rows += _rows(cursor)
+    if elapsed >= slow_queries.THRESHOLD:
+        origem = f"{stats.scope['method']} {route_path(stats.scope)}" if stats is not None else "fora de requisição"
+        slow_queries.observe(statement, parameters, elapsed, origem, conn.dialect.name, executemany)
+
+def _finish(stats: RequestStats, status_code: int) -> None:
+    scope = stats.scope
+    elapsed = stats.elapsed()
+    metrics.observe_request(getattr(scope.get("route"), "path", None), status_code, elapsed)
+    flagged = stats.queries > QUERY_COUNT_THRESHOLD
+    if not (flagged or REQUEST_LOG_ENABLED):
+        return
+
+    fields = {
+        "metodo":  scope["method"],
+        "rota":    route_path(scope),
+        "status":  status_code,
+        "ms":      round(elapsed * 1000, 2),
+        "db_ms":   round(stats.db_seconds * 1000, 2),
+        "queries": stats.queries,
+        "linhas":  stats.rows,
+    }
+    # O formato texto não mostra os campos extras: o essencial vai na mensagem
+    message = (
+        f"{fields['metodo']} {fields['rota']} {status_code} em {fields['ms']} ms "
+        f"({stats.queries} queries, {fields['db_ms']} ms no banco)"
+    )
+    if flagged:
+        logger.warning_(f"{message} - possível N+1", **fields)
+    else:
+        logger.info_(message, **fields)
+
+class TimingMiddleware:
+    """Middleware ASGI puro: não cria tarefa nem copia o corpo da resposta."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = current.set(stats)
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                # Em respostas em streaming o cabeçalho sai antes do fim; o
+                # log, no fim da requisição, traz os números completos
+                status_code = message["status"]
+                headers = [*message.get("headers", []), (b"server-timing", stats.server_timing().encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current.reset(token)
+            _finish(stats, status_code)
+
+def install(app: FastAPI, engine: AsyncEngine) -> None:
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    app.add_middleware(TimingMiddleware)
@@ -0,0 +1,50 @@
+import asyncio
+import os
+from dotenv import load_dotenv
+from app import file_logger as logger
+from app.database import AsyncSessionLocal
+from app.repositories import leaderboard_repository
+
+load_dotenv()
+
+# Atualização do ranking em segundo plano. Escritas em reviews só marcam o
+# ranking como sujo; a tarefa iniciada no lifespan da aplicação o recalcula
+# a cada LEADERBOARD_REFRESH_SECONDS se algo mudou, e de qualquer forma após
+# LEADERBOARD_MAX_AGE_SECONDS (para pegar mudanças feitas por outro processo).
+
+LEADERBOARD_ENABLED = os.getenv("LEADERBOARD_ENABLED", "true").lower() not in {"0", "false", "no"}
+LEADERBOARD_REFRESH_SECONDS = float(os.getenv("LEADERBOARD_REFRESH_SECONDS", "30"))
+LEADERBOARD_MAX_AGE_SECONDS = float(os.getenv("LEADERBOARD_MAX_AGE_SECONDS", "600"))
+# Peso C do prior bayesiano, em número de reviews
+LEADERBOARD_PRIOR_WEIGHT = float(os.getenv("LEADERBOARD_PRIOR_WEIGHT", "10"))
+
+_dirty = True
+
+def mark_dirty() -> None:
+    global _dirty
+    _dirty = True
+
+async def refresh() -> int:
+    global _dirty
+    _dirty = False
+    try:
+        async with AsyncSessionLocal() as db:
+            ranked = await leaderboard_repository.refresh(db, LEADERBOARD_PRIOR_WEIGHT)
+    except Exception:
+        _dirty = True
+        raise
+    logger.info_("Ranking de jogos atualizado", jogos=ranked)
+    return ranked
+
+async def run() -> None:
+    """Laço da tarefa de fundo; termina quando a tarefa é cancelada."""
+    loop = asyncio.get_running_loop()
+    last = float("-inf")
+    while True:
+        if _dirty or loop.time() - last >= LEADERBOARD_MAX_AGE_SECONDS:
+            try:
+                await refresh()
+                last = loop.time()
+            except Exception as e:
+                logger.error_(f"Erro ao atualizar o ranking de jogos: {str(e)}")
+        await asyncio.sleep(LEADERBOARD_REFRESH_SECONDS)
@@ -1,14 +1,59 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
-from app.controllers import game_controller, user_controller, review_controller, purchase_controller, dlc_controller
+from fastapi.responses import PlainTextResponse
+from app import instrumentation, leaderboard, metrics, sales_rollup
+from app.cache import cache
+from app.database import engine, pool_stats
+from app.serialization import JSONResponse
+from app.singleflight import flights
+from app.controllers import game_controller, user_controller, review_controller, purchase_controller, dlc_controller, import_controller, analytics_controller
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    jobs = []
+    if leaderboard.LEADERBOARD_ENABLED:
+        jobs.append(leaderboard.run())
+    if sales_rollup.SALES_ROLLUP_ENABLED:
+        jobs.append(sales_rollup.run())
+    tasks = [asyncio.create_task(job) for job in jobs]
+    yield
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        with suppress(asyncio.CancelledError):
+            await task
+
+app = FastAPI(lifespan=lifespan, default_response_class=JSONResponse)
+
+if instrumentation.INSTRUMENTATION_ENABLED:
+    instrumentation.install(app, engine)
 
 @app.get("/")
 async def root():
     return {"message": "Hello World"}
 
+@app.get("/cache/stats")
+async def cache_stats():
+    return cache.stats()
+
+@app.get("/singleflight/stats")
+async def singleflight_stats():
+    return flights.stats()
+
+@app.get("/db/pool")
+async def db_pool():
+    return pool_stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    # Requisições e queries só são contadas com INSTRUMENTATION_ENABLED
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 app.include_router(game_controller.router)
 app.include_router(user_controller.router)
 app.include_router(review_controller.router)
 app.include_router(purchase_controller.router)
-app.include_router(dlc_controller.router)
\ No newline at end of file
+app.include_router(dlc_controller.router)
+app.include_router(import_controller.router)
+app.include_router(analytics_controller.router)
\ No newline at end of file
@@ -0,0 +1,118 @@
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Sequence, Tuple
+from app.cache import cache
+from app.database import pool_stats
+
+# Métricas no formato texto do Prometheus (GET /metrics). Os contadores são
+# dicts e listas comuns: tudo é atualizado na thread do event loop (os
+# eventos do SQLAlchemy async também rodam nela), então não há trava nem
+# biblioteca extra no caminho de cada requisição. Pool e cache são lidos só
+# na hora da coleta.
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+class Counter:
+    def __init__(self, name: str, help_: str):
+        self.name = name
+        self.help = help_
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in sorted(self.values.items()):
+            yield f"{self.name}{_labels(labels)} {value}"
+
+class Histogram:
+    def __init__(self, name: str, help_: str, buckets: Sequence[float]):
+        self.name = name
+        self.help = help_
+        self.buckets = tuple(buckets)
+        # Por rótulo: [contagem por faixa (a última é +Inf), soma]
+        self.values: Dict[Labels, List] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        entry = self.values.get(labels)
+        if entry is None:
+            entry = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, (counts, total) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                yield f"{self.name}_bucket{_labels((*labels, ('le', str(bound))))} {cumulative}"
+            yield f"{self.name}_sum{_labels(labels)} {total}"
+            yield f"{self.name}_count{_labels(labels)} {cumulative}"
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+def _gauge(name: str, help_: str, samples: Iterable[Tuple[Labels, float]]) -> Iterable[str]:
+    yield f"# HELP {name} {help_}"
+    yield f"# TYPE {name} gauge"
+    for labels, value in samples:
+        yield f"{name}{_labels(labels)} {value}"
+
+requests_total = Counter("http_requests_total", "Requisições HTTP por router e status")
+request_duration = Histogram(
+    "http_request_duration_seconds", "Duração das requisições HTTP por router", REQUEST_BUCKETS
+)
+query_duration = Histogram("db_query_duration_seconds", "Duração dos statements SQL", QUERY_BUCKETS)
+
+def router_of(route: str) -> str:
+    """/games/{game_id} -> /games; requisições sem rota ficam em "nenhum"."""
+    if not route.startswith("/"):
+        return "nenhum"
+    return "/" + route.split("/", 2)[1]
+
+def observe_request(route: str | None, status_code: int, seconds: float) -> None:
+    router = router_of(route) if route else "nenhum"
+    requests_total.inc((("router", router), ("status", str(status_code))))
+    request_duration.observe(seconds, (("router", router),))
+
+def observe_query(seconds: float) -> None:
+    query_duration.observe(seconds)
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in (requests_total, request_duration, query_duration):
+        lines.extend(metric.render())
+
+    pool = pool_stats()
+    for key, name, help_ in (
+        ("checkedout", "db_pool_checked_out", "Conexões do pool em uso"),
+        ("checkedin", "db_pool_checked_in", "Conexões livres no pool"),
+        ("overflow", "db_pool_overflow", "Conexões acima de pool_size (negativo enquanto o pool não encheu)"),
+        ("size", "db_pool_size", "Tamanho configurado do pool"),
+        ("waiters", "db_pool_waiters", "Requisições esperando uma conexão"),
+    ):
+        if pool.get(key) is not None:
+            lines.extend(_gauge(name, help_, [((), pool[key])]))
+
+    for attr, name, help_ in (
+        ("hits", "cache_hits_total", "Acertos do cache de leitura por namespace"),
+        ("misses", "cache_misses_total", "Faltas do cache de leitura por namespace"),
+    ):
+        lines.append(f"# HELP {name} {help_}")
+        lines.append(f"# TYPE {name} counter")
+        for namespace, value in sorted(getattr(cache, attr).items()):
+            lines.append(f"{name}{_labels((('namespace', str(namespace)),))} {value}")
+
+    return "\n".join(lines) + "\n"
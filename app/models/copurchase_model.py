@@ -0,0 +1,16 @@
+from sqlalchemy import ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+# Quantos usuários compraram os dois jogos, nas duas direções do par, mantido
+# pelo app.sales_rollup a partir de purchase
+class GameCopurchase(Base):
+    __tablename__ = "game_copurchase"
+    __table_args__ = (
+        # "Quem comprou X também comprou" vira uma leitura em ordem deste índice
+        Index("ix_game_copurchase_top", "jogo_id", "compradores"),
+    )
+
+    jogo_id: Mapped[int] = mapped_column(ForeignKey("games.id", ondelete="CASCADE"), primary_key=True)
+    outro_jogo_id: Mapped[int] = mapped_column(ForeignKey("games.id", ondelete="CASCADE"), primary_key=True)
+    compradores: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -1,11 +1,16 @@
 from datetime import date
 from decimal import Decimal
-from sqlalchemy import Date, Numeric, String, Text
+from sqlalchemy import Date, Index, Numeric, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 from app.database import Base
+from app.models.versioned import Versioned
 
-class Game(Base):
+class Game(Versioned, Base):
     __tablename__ = "games"
+    __table_args__ = (
+        # precoMin/precoMax e ?order=preco; o id desempata o cursor
+        Index("ix_games_preco", "preco", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     titulo: Mapped[str] = mapped_column(String(100), unique=True, index=True)
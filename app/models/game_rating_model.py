@@ -0,0 +1,25 @@
+from sqlalchemy import Float, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+# Agregados das notas de cada jogo, mantidos a cada escrita em reviews
+NOTAS = range(1, 11)
+
+class GameRatingStats(Base):
+    __tablename__ = "game_rating_stats"
+
+    jogo_id: Mapped[int] = mapped_column(ForeignKey("games.id", ondelete="CASCADE"), primary_key=True)
+    quantidade: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    soma: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    media: Mapped[float | None] = mapped_column(Float, index=True)
+    # Histograma: quantas reviews deram cada nota de 1 a 10
+    nota_1: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    nota_2: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    nota_3: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    nota_4: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    nota_5: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    nota_6: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    nota_7: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    nota_8: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    nota_9: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    nota_10: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
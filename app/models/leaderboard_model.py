@@ -0,0 +1,16 @@
+from datetime import datetime
+from sqlalchemy import DateTime, Float, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+# Ranking materializado dos jogos com review, recalculado pelo app.leaderboard
+class GameLeaderboard(Base):
+    __tablename__ = "game_leaderboard"
+
+    jogo_id: Mapped[int] = mapped_column(ForeignKey("games.id", ondelete="CASCADE"), primary_key=True)
+    posicao: Mapped[int] = mapped_column(Integer, nullable=False, unique=True, index=True)
+    # Média bayesiana: puxa jogos com poucas reviews para a média geral
+    nota: Mapped[float] = mapped_column(Float, nullable=False)
+    media: Mapped[float] = mapped_column(Float, nullable=False)
+    quantidade: Mapped[int] = mapped_column(Integer, nullable=False)
+    atualizado_em: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
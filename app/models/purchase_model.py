@@ -1,10 +1,21 @@
 from datetime import datetime, timezone
-from sqlalchemy import Text, ForeignKey, DateTime, Float
+from sqlalchemy import DDL, Text, ForeignKey, DateTime, Float, Index, UniqueConstraint, event
 from sqlalchemy.orm import Mapped, mapped_column
 from app.database import Base
+from app.models.versioned import Versioned
 
-class Purchase(Base):
+class Purchase(Versioned, Base):
     __tablename__ = "purchase"
+    __table_args__ = (
+        # Também atende o filtro por usuario_id, que é o seu prefixo
+        UniqueConstraint("usuario_id", "jogo_id", name="uq_purchase_usuario_jogo"),
+        # Compras de um jogo já na ordem de id da listagem
+        Index("ix_purchase_jogo_id", "jogo_id", "id"),
+        # Busca por data e ?order=data_compra
+        Index("ix_purchase_data_compra", "data_compra", "id"),
+        # precoMin/precoMax e ?order=preco_pago
+        Index("ix_purchase_preco_pago", "preco_pago", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     usuario_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
@@ -15,3 +26,13 @@ class Purchase(Base):
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
     )
+
+# Posição de consolidação das compras no PostgreSQL (ver sales_repository):
+# a transação que inseriu a linha. Fica fora do mapeamento ORM porque o
+# SQLite não tem o equivalente; este DDL só vale para o create_all, e a
+# migração 4e8a2c6b1d97 cria a mesma coluna nos bancos existentes.
+for statement in (
+    "ALTER TABLE purchase ADD COLUMN xact_id bigint NOT NULL DEFAULT pg_current_xact_id()::text::bigint",
+    "CREATE INDEX ix_purchase_xact_id ON purchase (xact_id)",
+):
+    event.listen(Purchase.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
@@ -1,12 +1,18 @@
 from datetime import datetime, timezone
-from sqlalchemy import Integer, Text, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy import Integer, Index, Text, ForeignKey, DateTime, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 from app.database import Base
+from app.models.versioned import Versioned
 
-class Review(Base):
+class Review(Versioned, Base):
     __tablename__ = "reviews"
     __table_args__ = (
+        # Também atende o filtro por usuario_id, que é o seu prefixo
         UniqueConstraint("usuario_id", "jogo_id", name="uq_usuario_jogo"),
+        # Reviews de um jogo, com ou sem faixa de nota, e ?order=nota dentro dele
+        Index("ix_reviews_jogo_nota", "jogo_id", "nota", "id"),
+        # notaMin/notaMax sem jogo e ?order=nota
+        Index("ix_reviews_nota", "nota", "id"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
@@ -0,0 +1,14 @@
+from sqlalchemy import BigInteger, SmallInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+# Linhas de contador por tabela; os triggers da migração 8d2f4b6a9c13 somam
+# em uma delas sorteada e a contagem é a soma de todas.
+SLOTS = 16
+
+class RowCount(Base):
+    __tablename__ = "row_counts"
+
+    tabela: Mapped[str] = mapped_column(String(63), primary_key=True)
+    slot: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    quantidade: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
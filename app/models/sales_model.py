@@ -0,0 +1,24 @@
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import BigInteger, Date, DateTime, ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+# Vendas consolidadas por dia, jogo e forma de pagamento, alimentadas pelo
+# app.sales_rollup a partir de purchase
+class SalesDaily(Base):
+    __tablename__ = "sales_daily"
+
+    dia: Mapped[date] = mapped_column(Date, primary_key=True)
+    jogo_id: Mapped[int] = mapped_column(ForeignKey("games.id", ondelete="CASCADE"), primary_key=True, index=True)
+    forma_pagamento: Mapped[str] = mapped_column(Text, primary_key=True)
+    unidades: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    receita: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+
+# Até qual posição de purchase cada consolidação já foi feita (ver sales_repository)
+class SalesWatermark(Base):
+    __tablename__ = "sales_watermark"
+
+    nome: Mapped[str] = mapped_column(String(63), primary_key=True)
+    ultimo_id: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    atualizado_em: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
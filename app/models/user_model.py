@@ -3,8 +3,9 @@ from sqlalchemy import String, DateTime
 from datetime import datetime, timezone
 from sqlalchemy.orm import Mapped, mapped_column
 from app.database import Base
+from app.models.versioned import Versioned
 
-class User(Base):
+class User(Versioned, Base):
     __tablename__ = "users"
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
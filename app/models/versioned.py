@@ -0,0 +1,30 @@
+from datetime import datetime, timezone
+from sqlalchemy import DateTime, Integer, func, literal_column, text
+from sqlalchemy.orm import Mapped, declared_attr, mapped_column
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+# Versão e data da última alteração de cada linha, usadas nos ETags e no
+# If-Match dos PUT. Flushes do ORM incrementam a versão via version_id_col;
+# os update() dos repositórios passam pelo onupdate (version = version + 1).
+class Versioned:
+    version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default=text("1"),
+        onupdate=literal_column("version") + 1,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=_now,
+        server_default=func.now(),
+        onupdate=_now,
+        index=True,
+    )
+
+    @declared_attr.directive
+    def __mapper_args__(cls) -> dict:
+        return {"version_id_col": cls.__table__.c.version}
@@ -0,0 +1,142 @@
+import os
+from typing import Any, Dict, Iterable, List, Sequence
+from dotenv import load_dotenv
+from sqlalchemy import Float, column, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.dialect import dialect_name, insert
+
+load_dotenv()
+
+# Inserção em lote: as linhas vão em INSERT ... VALUES (...), (...) ... ON
+# CONFLICT DO NOTHING RETURNING, em blocos de BULK_CHUNK_SIZE, todos na mesma
+# transação. Chaves estrangeiras são conferidas antes com um SELECT por
+# tabela, porque uma violação derrubaria o lote inteiro.
+#
+# Para importações grandes (copy=True) o PostgreSQL recebe as linhas por COPY
+# numa tabela temporária e as junta à tabela real com um único INSERT ...
+# SELECT ... ON CONFLICT DO NOTHING; no SQLite o mesmo INSERT vai em
+# executemany.
+
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "1000"))
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "10000"))
+# O asyncpg aceita no máximo 32767 parâmetros por statement
+MAX_PARAMS = 32000
+
+CRIADO = "criado"
+CONFLITO = "conflito"
+ERRO = "erro"
+
+def _chunks(values: Sequence[Any], size: int) -> Iterable[Sequence[Any]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+async def lookup(db: AsyncSession, key_column, value_column=None, keys: Iterable[Any] = ()) -> Dict[Any, Any]:
+    """Mapeia as chaves existentes em key_column para value_column (ou para True)."""
+    found: Dict[Any, Any] = {}
+    columns = [key_column] if value_column is None else [key_column, value_column]
+    for chunk in _chunks(sorted(set(keys)), BULK_CHUNK_SIZE):
+        res = await db.execute(select(*columns).where(key_column.in_(chunk)))
+        for row in res.all():
+            found[row[0]] = True if value_column is None else row[1]
+    return found
+
+async def insert_many(
+    db: AsyncSession,
+    model,
+    items: List[Dict[str, Any]],
+    unique: Sequence[Sequence[str]],
+    rejected: Dict[int, str] | None = None,
+    copy: bool = False,
+) -> List[Dict[str, Any]]:
+    """Insere os itens sem commit e devolve o resultado de cada um, na ordem recebida.
+
+    ``unique`` lista as chaves únicas da tabela; a primeira identifica as
+    linhas devolvidas pelo RETURNING. ``rejected`` traz os itens já recusados
+    pela validação (índice -> motivo), que não são enviados ao banco.
+    ``copy`` troca o INSERT multi-linha pelo COPY em tabela temporária.
+    """
+    results: List[Dict[str, Any] | None] = [None] * len(items)
+    for index, detail in (rejected or {}).items():
+        results[index] = {"indice": index, "status": ERRO, "id": None, "detalhe": detail}
+
+    # Repetições dentro da própria requisição ficam de fora do INSERT
+    seen = [set() for _ in unique]
+    pending: List[int] = []
+    for index, data in enumerate(items):
+        if results[index] is not None:
+            continue
+        keys = [tuple(data[name] for name in columns) for columns in unique]
+        if any(key in keys_seen for key, keys_seen in zip(keys, seen)):
+            results[index] = {"indice": index, "status": CONFLITO, "id": None, "detalhe": "Repetido na requisição"}
+            continue
+        for key, keys_seen in zip(keys, seen):
+            keys_seen.add(key)
+        pending.append(index)
+
+    key_columns = unique[0]
+    returning = [model.id, *(getattr(model, name) for name in key_columns)]
+    if copy:
+        size = max(len(pending), 1)
+        write = _write_copy if dialect_name(db) == "postgresql" else _write_executemany
+    else:
+        width = max((len(items[index]) for index in pending), default=1)
+        size = max(1, min(BULK_CHUNK_SIZE, MAX_PARAMS // width))
+        write = _write_values
+
+    for chunk in _chunks(pending, size):
+        rows = await write(db, model, [items[index] for index in chunk], returning)
+        created = {tuple(row[1:]): row[0] for row in rows}
+        for index in chunk:
+            id_ = created.get(tuple(items[index][name] for name in key_columns))
+            if id_ is None:
+                results[index] = {"indice": index, "status": CONFLITO, "id": None, "detalhe": "Já existe"}
+            else:
+                results[index] = {"indice": index, "status": CRIADO, "id": id_, "detalhe": None}
+
+    return results
+
+async def _write_values(db: AsyncSession, model, rows: List[Dict[str, Any]], returning) -> List[Any]:
+    stmt = insert(db, model).values(rows).on_conflict_do_nothing().returning(*returning)
+    return (await db.execute(stmt)).all()
+
+async def _write_executemany(db: AsyncSession, model, rows: List[Dict[str, Any]], returning) -> List[Any]:
+    stmt = insert(db, model).on_conflict_do_nothing().returning(*returning)
+    return (await db.execute(stmt, rows)).all()
+
+async def _write_copy(db: AsyncSession, model, rows: List[Dict[str, Any]], returning) -> List[Any]:
+    names = list(rows[0])
+    stage = f"_stage_{model.__tablename__}"
+    columns = ", ".join(names)
+    await db.execute(text(
+        f"CREATE TEMP TABLE {stage} ON COMMIT DROP AS "
+        f"SELECT {columns} FROM {model.__tablename__} WITH NO DATA"
+    ))
+
+    # O COPY binário do asyncpg não converte tipos: Decimal -> float à mão
+    floats = {name for name in names if isinstance(getattr(model, name).type, Float)}
+    records = [
+        tuple(float(row[name]) if name in floats and row[name] is not None else row[name] for name in names)
+        for row in rows
+    ]
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(stage, records=records, columns=names)
+
+    source = select(*table(stage, *(column(name) for name in names)).c)
+    stmt = (
+        insert(db, model)
+        .from_select(names, source)
+        .on_conflict_do_nothing()
+        .returning(*returning)
+    )
+    result = (await db.execute(stmt)).all()
+    await db.execute(text(f"DROP TABLE {stage}"))
+    return result
+
+def summary(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "criados":   sum(1 for r in results if r["status"] == CRIADO),
+        "conflitos": sum(1 for r in results if r["status"] == CONFLITO),
+        "erros":     sum(1 for r in results if r["status"] == ERRO),
+        "itens":     results,
+    }
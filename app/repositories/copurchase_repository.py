@@ -0,0 +1,87 @@
+from typing import Any, List
+from sqlalchemy import delete, func, literal, select, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from app.models.copurchase_model import GameCopurchase
+from app.models.game_model import Game
+from app.models.purchase_model import Purchase
+from app.repositories import sales_repository
+from app.repositories.dialect import insert
+
+# Índice "quem comprou também comprou". Cada par de compras do mesmo usuário
+# conta uma vez, quando a mais recente delas (pela posição de consolidação,
+# desempatada pelo id) é consolidada: a passada junta as compras novas
+# (posição acima da marca) às compras anteriores dos mesmos usuários e soma
+# os pares em game_copurchase, nas duas direções. Assim a reconstrução também
+# anda em lotes e nunca cruza purchase inteira consigo mesma numa transação
+# só. Posição, marca e lote seguem o sales_repository: purchase não é
+# travada, e a junção com o histórico dos usuários não segura as escritas.
+
+WATERMARK = "copurchase"
+NOVA = aliased(Purchase, name="nova")
+OUTRA = aliased(Purchase, name="outra")
+
+def _pairs(*conditions):
+    """Pares (jogo_id, outro_jogo_id) entre NOVA e OUTRA do mesmo usuário, nas duas direções."""
+    def side(first, second):
+        return (
+            select(first.jogo_id.label("jogo_id"), second.jogo_id.label("outro_jogo_id"))
+            .select_from(NOVA)
+            .join(OUTRA, OUTRA.usuario_id == NOVA.usuario_id)
+            .where(*conditions)
+        )
+    return union_all(side(NOVA, OUTRA), side(OUTRA, NOVA)).subquery()
+
+async def _merge(db: AsyncSession, pairs, sign: int = 1) -> None:
+    compradores = func.count() if sign == 1 else literal(sign) * func.count()
+    source = (
+        select(pairs.c.jogo_id, pairs.c.outro_jogo_id, compradores)
+        .group_by(pairs.c.jogo_id, pairs.c.outro_jogo_id)
+    )
+    table = GameCopurchase.__table__
+    stmt = insert(db, GameCopurchase).from_select(["jogo_id", "outro_jogo_id", "compradores"], source)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["jogo_id", "outro_jogo_id"],
+        set_={"compradores": table.c.compradores + stmt.excluded.compradores},
+    )
+    await db.execute(stmt)
+
+async def refresh(db: AsyncSession, batch_size: int) -> int:
+    """Consolida os pares de até batch_size compras novas e devolve quantas entraram."""
+    ultimo = await sales_repository.lock_watermark(db, WATERMARK)
+    limite, quantidade = await sales_repository.pending(db, ultimo, batch_size)
+    if not quantidade:
+        await db.commit()
+        return 0
+
+    nova, outra = sales_repository.position(db, NOVA), sales_repository.position(db, OUTRA)
+    anterior = tuple_(outra, OUTRA.id) < tuple_(nova, NOVA.id)
+    await _merge(db, _pairs(nova > ultimo, nova <= limite, anterior))
+    await sales_repository.advance(db, WATERMARK, limite)
+    await db.commit()
+    return quantidade
+
+async def adjust(db: AsyncSession, purchase_id: int, sign: int) -> None:
+    """Soma (1) ou retira (-1) os pares de uma compra já consolidada, sem commit."""
+    ultimo = await sales_repository.watermark(db, WATERMARK, lock="share")
+    nova, outra = sales_repository.position(db, NOVA), sales_repository.position(db, OUTRA)
+    # Pares com compras ainda não consolidadas entram quando elas entrarem
+    await _merge(db, _pairs(NOVA.id == purchase_id, nova <= ultimo, OUTRA.id != NOVA.id, outra <= ultimo), sign)
+
+async def reset(db: AsyncSession) -> None:
+    """Apaga o índice e volta a marca para o início."""
+    await sales_repository.lock_watermark(db, WATERMARK)
+    await db.execute(delete(GameCopurchase))
+    await sales_repository.advance(db, WATERMARK, sales_repository.INICIO)
+    await db.commit()
+
+async def top(db: AsyncSession, jogo_id: int, limit: int) -> List[Any]:
+    # Pares zerados por exclusões ficam na tabela e são pulados aqui
+    res = await db.execute(
+        select(GameCopurchase.outro_jogo_id.label("jogo_id"), Game.titulo, GameCopurchase.compradores)
+        .join(Game, Game.id == GameCopurchase.outro_jogo_id)
+        .where(GameCopurchase.jogo_id == jogo_id, GameCopurchase.compradores > 0)
+        .order_by(GameCopurchase.compradores.desc(), GameCopurchase.outro_jogo_id)
+        .limit(limit)
+    )
+    return res.all()
@@ -0,0 +1,120 @@
+import json
+import os
+from typing import Any, Callable, Dict, Tuple
+from dotenv import load_dotenv
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.row_count_model import RowCount
+from app.repositories.dialect import dialect_name
+
+load_dotenv()
+
+# Estratégias de contagem de linhas:
+#   exact    -> SELECT count(*) (varredura completa no PostgreSQL)
+#   estimate -> estatísticas do planner: pg_class.reltuples sem filtro e a
+#               estimativa de linhas do EXPLAIN com filtro
+#   counter  -> tabela row_counts mantida por triggers (exata, soma de
+#               SLOTS linhas por tabela)
+# A estratégia padrão vem de COUNT_STRATEGY e pode ser sobrescrita por tabela
+# com COUNT_STRATEGY_<TABELA>, por exemplo COUNT_STRATEGY_PURCHASE=estimate.
+
+EXACT = "exact"
+ESTIMATE = "estimate"
+COUNTER = "counter"
+STRATEGIES = {EXACT, ESTIMATE, COUNTER}
+
+# Tabelas listadas com total; são as que têm contador em row_counts.
+TABLES = ("games", "users", "purchase", "reviews", "dlc")
+
+def _configured() -> Tuple[str, Dict[str, str]]:
+    """Estratégia padrão e as sobrescritas por tabela, validadas na importação
+    para que um valor errado derrube a aplicação na subida e não a cada
+    listagem."""
+    default = os.getenv("COUNT_STRATEGY", EXACT).lower()
+    if default not in STRATEGIES:
+        raise ValueError(f"COUNT_STRATEGY inválida: {default}")
+
+    by_table = {}
+    for table in TABLES:
+        strategy = os.getenv(f"COUNT_STRATEGY_{table.upper()}", default).lower()
+        if strategy not in STRATEGIES:
+            raise ValueError(f"COUNT_STRATEGY_{table.upper()} inválida: {strategy}")
+        by_table[table] = strategy
+
+    # Uma tabela digitada errado seria ignorada em silêncio
+    known = {f"COUNT_STRATEGY_{table.upper()}" for table in TABLES}
+    unknown = sorted(name for name in os.environ if name.startswith("COUNT_STRATEGY_") and name not in known)
+    if unknown:
+        raise ValueError(f"Tabela desconhecida em {', '.join(unknown)}; válidas: {', '.join(TABLES)}")
+    return default, by_table
+
+DEFAULT_STRATEGY, STRATEGY_BY_TABLE = _configured()
+# Abaixo deste número a contagem exata é barata e preferível a uma estimativa.
+ESTIMATE_THRESHOLD = int(os.getenv("COUNT_ESTIMATE_THRESHOLD", "100000"))
+
+def strategy_for(table: str) -> str:
+    return STRATEGY_BY_TABLE.get(table, DEFAULT_STRATEGY)
+
+async def _exact(db: AsyncSession, model) -> int:
+    res = await db.execute(select(func.count()).select_from(model))
+    return res.scalar_one()
+
+async def _reltuples(db: AsyncSession, table: str) -> int | None:
+    res = await db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:tabela)"),
+        {"tabela": table},
+    )
+    estimate = res.scalar_one_or_none()
+    # reltuples = -1 quando a tabela nunca passou por VACUUM/ANALYZE
+    if estimate is None or estimate < 0:
+        return None
+    return estimate
+
+async def _counter(db: AsyncSession, table: str) -> int | None:
+    # sum() de nenhuma linha é NULL: tabela sem triggers cai na contagem exata
+    res = await db.execute(select(func.sum(RowCount.quantidade)).where(RowCount.tabela == table))
+    total = res.scalar_one()
+    return None if total is None else int(total)
+
+async def _explain_rows(db: AsyncSession, query: Select) -> int:
+    conn = await db.connection()
+    sql = str(query.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    res = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+    plan = res.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+async def count_table(db: AsyncSession, model) -> Tuple[int, bool]:
+    """Total de linhas da tabela e se o valor é aproximado."""
+    table = model.__tablename__
+    strategy = strategy_for(table)
+
+    if strategy == ESTIMATE and dialect_name(db) == "postgresql":
+        estimate = await _reltuples(db, table)
+        if estimate is not None and estimate >= ESTIMATE_THRESHOLD:
+            return estimate, True
+    elif strategy == COUNTER:
+        total = await _counter(db, table)
+        if total is not None:
+            return total, False
+
+    return await _exact(db, model), False
+
+async def count_filtered(
+    db: AsyncSession,
+    model,
+    apply_filters: Callable[[Select, Dict[str, Any]], Select],
+    filters: Dict[str, Any],
+) -> Tuple[int, bool]:
+    """Total de uma listagem filtrada e se o valor é aproximado."""
+    if not filters:
+        return await count_table(db, model)
+
+    if strategy_for(model.__tablename__) == ESTIMATE and dialect_name(db) == "postgresql":
+        estimate = await _explain_rows(db, apply_filters(select(model.id), filters))
+        if estimate >= ESTIMATE_THRESHOLD:
+            return estimate, True
+
+    res = await db.execute(apply_filters(select(func.count(model.id)), filters))
+    return res.scalar_one(), False
@@ -0,0 +1,18 @@
+from sqlalchemy import Insert, insert as generic_insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Os repositórios usam INSERT ... ON CONFLICT DO NOTHING RETURNING, que só
+# existe nas variantes de insert() de cada dialeto. Em produção é PostgreSQL;
+# o SQLite (aiosqlite) fica como alternativa local com a mesma sintaxe.
+
+def dialect_name(db: AsyncSession) -> str:
+    return db.get_bind().dialect.name
+
+def insert(db: AsyncSession, model) -> Insert:
+    name = dialect_name(db)
+    if name == "postgresql":
+        return postgresql.insert(model)
+    if name == "sqlite":
+        return sqlite.insert(model)
+    return generic_insert(model)
@@ -1,61 +1,57 @@
 from decimal import Decimal
-from typing import Any, Dict, List
-from sqlalchemy import Integer, Numeric, String, Text, func, select, update, delete
+from typing import Any, Dict, List, Tuple
+from sqlalchemy import Integer, Numeric, Row, String, Text, func, select, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
+from app.cache import cache, cached
 from app.models.dlc_model import DLCModel
+from app.models.game_model import Game
+from app.repositories import bulk, counting, text_search
+from app.repositories.dialect import insert
+from app.repositories.pagination import fetch_page, projection
+
+ORDERINGS = {"id": DLCModel.id, "titulo": DLCModel.titulo, "preco": DLCModel.preco}
 
 async def create(db: AsyncSession, data: Dict[str, Any]) -> DLCModel:
-  res = await db.execute(select(DLCModel).where(DLCModel.titulo == data["titulo"]))
-  if res.scalar_one_or_none():
-    raise IntegrityError("Título duplicado", params=None, orig="titulo")
+  stmt = (
+    insert(db, DLCModel)
+    .values(**data)
+    # Sem alvo: titulo e jogo_id são únicos, como no create_many
+    .on_conflict_do_nothing()
+    .returning(DLCModel)
+  )
+  obj = (await db.execute(stmt)).scalar_one_or_none()
+  if obj is None:
+    res = await db.execute(select(DLCModel.id).where(DLCModel.titulo == data["titulo"]))
+    if res.first() is not None:
+      raise IntegrityError("Título duplicado", params=None, orig="titulo")
+    raise IntegrityError("Jogo com DLC", params=None, orig="jogo_id unique constraint")
 
-  obj = DLCModel(**data)
-  db.add(obj)
   await db.commit()
-  await db.refresh(obj)
+  await cache.invalidate(list_with_total.namespace)
   return obj
 
+async def _rejections(db: AsyncSession, items: List[Dict[str, Any]]) -> Dict[int, str]:
+  jogos = await bulk.lookup(db, Game.id, keys=(data["jogo_id"] for data in items))
+  return {
+    index: "Não existe um jogo com este id"
+    for index, data in enumerate(items) if data["jogo_id"] not in jogos
+  }
+
+async def create_many(db: AsyncSession, items: List[Dict[str, Any]], copy: bool = False) -> List[Dict[str, Any]]:
+  rejected = await _rejections(db, items)
+  # Cada jogo tem no máximo uma DLC, então jogo_id também é chave única
+  results = await bulk.insert_many(db, DLCModel, items, [["titulo"], ["jogo_id"]], rejected, copy)
+  await db.commit()
+  await cache.invalidate(list_with_total.namespace)
+  return results
+
+@cached("dlc.get")
 async def get(db: AsyncSession, dlc_id: int) -> DLCModel | None:
     res = await db.execute(select(DLCModel).where(DLCModel.id == dlc_id))
     return res.scalar_one_or_none()
   
-async def list_(
-    db: AsyncSession,
-    skip: int,
-    limit: int,
-    filters: Dict[str, Any],
-) -> List[DLCModel]:
-  query = select(DLCModel)
-  if titulo := filters.get("titulo"):
-    query = query.where(DLCModel.titulo.ilike(f"%{titulo}%"))
-  if desenvolvedora := filters.get("desenvolvedora"):
-    query = query.where(DLCModel.desenvolvedora.ilike(f"%{desenvolvedora}%"))
-  preco_min: Decimal | None = filters.get("preco_min")
-  preco_max: Decimal | None = filters.get("preco_max")
-  if preco_min is not None:
-    query = query.where(DLCModel.preco >= preco_min)
-  if preco_max is not None:
-    query = query.where(DLCModel.preco <= preco_max)
-    
-  for field, value in filters.items():
-    if field in {"titulo", "desenvolvedora", "preco_min", "preco_max"}:
-      continue
-
-    column_attr = getattr(DLCModel, field, None)
-    if column_attr is None:
-      continue
-
-    if isinstance(column_attr.type, (String, Text)):
-      query = query.where(column_attr.ilike(f"%{value}%"))
-    else:
-      query = query.where(column_attr == value)
-  res = await db.execute(query.offset(skip).limit(limit))
-  return res.scalars().all()
-
-async def count_filtered(db: AsyncSession, filters: Dict[str, Any]) -> int:
-  query = select(func.count(DLCModel.id))
-
+def _apply_filters(query, filters: Dict[str, Any]):
   if (preco_min := filters.get("preco_min")) is not None:
     query = query.where(DLCModel.preco >= Decimal(preco_min))
   if (preco_max := filters.get("preco_max")) is not None:
@@ -79,18 +75,64 @@ async def count_filtered(db: AsyncSession, filters: Dict[str, Any]) -> int:
         query = query.where(column_attr == value)
     except Exception:
       continue
+  return query
 
-  result = await db.execute(query)
-  return result.scalar_one()
+@cached("dlc.list")
+async def list_with_total(
+    db: AsyncSession,
+    skip: int,
+    limit: int,
+    filters: Dict[str, Any],
+    order: str = "id",
+    after: str | None = None,
+    with_total: bool = True,
+    fields: Tuple[str, ...] | None = None,
+) -> Tuple[List[Row], int | None, bool]:
+  return await fetch_page(
+    db, DLCModel, _apply_filters, filters, ORDERINGS,
+    skip, limit, order, after, with_total, columns=projection(DLCModel, fields),
+  )
+
+async def search(
+    db: AsyncSession,
+    field: str,
+    value: str,
+    mode: str,
+    skip: int,
+    limit: int,
+    with_total: bool = True,
+    fields: Tuple[str, ...] | None = None,
+) -> Tuple[List[Row], int | None, bool]:
+  return await text_search.search_page(db, DLCModel, field, value, mode, skip, limit, with_total, projection(DLCModel, fields))
 
-async def update_(db: AsyncSession, dlc_id: int, data: Dict[str, Any]):
-    await db.execute(update(DLCModel).where(DLCModel.id == dlc_id).values(**data))
+# Mesmo namespace da listagem: as escritas invalidam os dois juntos
+@cached("dlc.list")
+async def update_(db: AsyncSession, dlc_id: int, data: Dict[str, Any], versions: List[int] | None = None) -> DLCModel | None:
+    """Atualiza e devolve a DLC numa só instrução; None se nenhuma linha casou
+    (id inexistente ou, com ``versions``, versão atual fora delas)."""
+    stmt = update(DLCModel).where(DLCModel.id == dlc_id)
+    if versions is not None:
+        stmt = stmt.where(DLCModel.version.in_(versions))
+    res = await db.execute(stmt.values(**data).returning(DLCModel))
+    obj = res.scalar_one_or_none()
+    if obj is None:
+        await db.rollback()
+        return None
     await db.commit()
+    await get.forget(dlc_id)
+    await cache.invalidate(list_with_total.namespace)
+    return obj
     
-async def delete_(db: AsyncSession, dlc_id: int) -> None:
-    await db.execute(delete(DLCModel).where(DLCModel.id == dlc_id))
+async def delete_(db: AsyncSession, dlc_id: int) -> bool:
+    """Remove a DLC; False se o id não existe."""
+    res = await db.execute(delete(DLCModel).where(DLCModel.id == dlc_id).returning(DLCModel.id))
+    if res.scalar_one_or_none() is None:
+        await db.rollback()
+        return False
     await db.commit()
+    await get.forget(dlc_id)
+    await cache.invalidate(list_with_total.namespace)
+    return True
     
-async def count_(db: AsyncSession) -> int:
-    res = await db.execute(select(func.count()).select_from(DLCModel))
-    return res.scalar_one()
\ No newline at end of file
+async def count_(db: AsyncSession) -> Tuple[int, bool]:
+  return await counting.count_table(db, DLCModel)
@@ -1,61 +1,50 @@
 from decimal import Decimal
-from typing import Any, Dict, List
-from sqlalchemy import Integer, Numeric, String, Text, func, select, update, delete
+from typing import Any, AsyncIterator, Dict, List, Tuple
+from sqlalchemy import Integer, Numeric, Row, String, Text, func, select, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
+from app.cache import cache, cached
 from app.models.game_model import Game
+from app.models.game_rating_model import GameRatingStats
+from app.repositories import bulk, counting, text_search
+from app.repositories.dialect import insert
+from app.repositories.pagination import fetch_page, projection
+
+# Média das notas (0 para jogos sem review), lida de game_rating_stats
+MEDIA = func.coalesce(
+    select(GameRatingStats.media).where(GameRatingStats.jogo_id == Game.id).scalar_subquery(),
+    0.0,
+)
+
+ORDERINGS = {"id": Game.id, "titulo": Game.titulo, "preco": Game.preco, "media": MEDIA}
 
 async def create(db: AsyncSession, data: Dict[str, Any]) -> Game:
-    res = await db.execute(select(Game).where(Game.titulo == data["titulo"]))
-    if res.scalar_one_or_none():
+    stmt = (
+        insert(db, Game)
+        .values(**data)
+        .on_conflict_do_nothing(index_elements=["titulo"])
+        .returning(Game)
+    )
+    obj = (await db.execute(stmt)).scalar_one_or_none()
+    if obj is None:
         raise IntegrityError("Título duplicado", params=None, orig="titulo")
 
-    obj = Game(**data)
-    db.add(obj)
     await db.commit()
-    await db.refresh(obj)
+    await cache.invalidate(list_with_total.namespace)
     return obj
 
+async def create_many(db: AsyncSession, items: List[Dict[str, Any]], copy: bool = False) -> List[Dict[str, Any]]:
+    results = await bulk.insert_many(db, Game, items, [["titulo"]], copy=copy)
+    await db.commit()
+    await cache.invalidate(list_with_total.namespace)
+    return results
+
+@cached("games.get")
 async def get(db: AsyncSession, game_id: int) -> Game | None:
     res = await db.execute(select(Game).where(Game.id == game_id))
     return res.scalar_one_or_none()
 
-async def list_(
-    db: AsyncSession,
-    skip: int,
-    limit: int,
-    filters: Dict[str, Any],
-) -> List[Game]:
-    query = select(Game)
-    if titulo := filters.get("titulo"):
-        query = query.where(Game.titulo.ilike(f"%{titulo}%"))
-    if dev := filters.get("desenvolvedora"):
-        query = query.where(Game.desenvolvedora.ilike(f"%{dev}%"))
-    preco_min: Decimal | None = filters.get("preco_min")
-    preco_max: Decimal | None = filters.get("preco_max")
-    if preco_min is not None:
-        query = query.where(Game.preco >= preco_min)
-    if preco_max is not None:
-        query = query.where(Game.preco <= preco_max)
-
-    for field, value in filters.items():
-        if field in {"titulo", "desenvolvedora", "preco_min", "preco_max"}:
-            continue 
-
-        column_attr = getattr(Game, field, None)
-        if column_attr is None:
-            continue
-
-        if isinstance(column_attr.type, (String, Text)):
-            query = query.where(column_attr.ilike(f"%{value}%"))
-        else:
-            query = query.where(column_attr == value)
-    res = await db.execute(query.offset(skip).limit(limit))
-    return res.scalars().all()
-
-async def count_filtered(db: AsyncSession, filters: Dict[str, Any]) -> int:
-    query = select(func.count(Game.id))
-
+def _apply_filters(query, filters: Dict[str, Any]):
     if (preco_min := filters.get("preco_min")) is not None:
         query = query.where(Game.preco >= Decimal(preco_min))
     if (preco_max := filters.get("preco_max")) is not None:
@@ -79,18 +68,73 @@ async def count_filtered(db: AsyncSession, filters: Dict[str, Any]) -> int:
                 query = query.where(column_attr == value)
         except Exception:
             continue
+    return query
+
+async def stream_(db: AsyncSession, filters: Dict[str, Any], fetch_size: int) -> AsyncIterator[Game]:
+    query = _apply_filters(select(Game), filters).order_by(Game.id)
+    result = await db.stream_scalars(query.execution_options(yield_per=fetch_size))
+    async for obj in result:
+        yield obj
+
+@cached("games.list")
+async def list_with_total(
+    db: AsyncSession,
+    skip: int,
+    limit: int,
+    filters: Dict[str, Any],
+    order: str = "id",
+    after: str | None = None,
+    with_total: bool = True,
+    fields: Tuple[str, ...] | None = None,
+) -> Tuple[List[Row], int | None, bool]:
+    return await fetch_page(
+        db, Game, _apply_filters, filters, ORDERINGS,
+        skip, limit, order, after, with_total, columns=projection(Game, fields),
+    )
 
-    result = await db.execute(query)
-    return result.scalar_one()
+async def search(
+    db: AsyncSession,
+    field: str,
+    value: str,
+    mode: str,
+    skip: int,
+    limit: int,
+    with_total: bool = True,
+    fields: Tuple[str, ...] | None = None,
+) -> Tuple[List[Row], int | None, bool]:
+    return await text_search.search_page(db, Game, field, value, mode, skip, limit, with_total, projection(Game, fields))
+
+async def forget_lists() -> None:
+    """Descarta as listagens em cache fora de uma escrita em games: a ordem
+    por média muda quando game_rating_stats muda."""
+    await cache.invalidate(list_with_total.namespace)
 
-async def update_(db: AsyncSession, game_id: int, data: Dict[str, Any]) -> None:
-    await db.execute(update(Game).where(Game.id == game_id).values(**data))
+async def update_(db: AsyncSession, game_id: int, data: Dict[str, Any], versions: List[int] | None = None) -> Game | None:
+    """Atualiza e devolve o jogo numa só instrução; None se nenhuma linha casou
+    (id inexistente ou, com ``versions``, versão atual fora delas)."""
+    stmt = update(Game).where(Game.id == game_id)
+    if versions is not None:
+        stmt = stmt.where(Game.version.in_(versions))
+    res = await db.execute(stmt.values(**data).returning(Game))
+    obj = res.scalar_one_or_none()
+    if obj is None:
+        await db.rollback()
+        return None
     await db.commit()
+    await get.forget(game_id)
+    await cache.invalidate(list_with_total.namespace)
+    return obj
 
-async def delete_(db: AsyncSession, game_id: int) -> None:
-    await db.execute(delete(Game).where(Game.id == game_id))
+async def delete_(db: AsyncSession, game_id: int) -> bool:
+    """Remove o jogo; False se o id não existe."""
+    res = await db.execute(delete(Game).where(Game.id == game_id).returning(Game.id))
+    if res.scalar_one_or_none() is None:
+        await db.rollback()
+        return False
     await db.commit()
+    await get.forget(game_id)
+    await cache.invalidate(list_with_total.namespace)
+    return True
 
-async def count(db: AsyncSession) -> int:
-    res = await db.execute(select(func.count()).select_from(Game))
-    return res.scalar_one()
+async def count(db: AsyncSession) -> Tuple[int, bool]:
+    return await counting.count_table(db, Game)
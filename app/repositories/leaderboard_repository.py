@@ -0,0 +1,99 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Tuple
+from sqlalchemy import DateTime, Float, delete, func, literal, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.game_model import Game
+from app.models.game_rating_model import GameRatingStats
+from app.models.leaderboard_model import GameLeaderboard
+from app.repositories.dialect import dialect_name, insert
+
+# Ranking bayesiano: nota = (C * m + soma) / (C + quantidade), em que m é a
+# média de todas as reviews e C o peso do prior (quantas reviews "médias"
+# cada jogo ganha de saída). O recálculo parte de game_rating_stats, então
+# custa O(jogos) e não O(reviews).
+
+async def refresh(db: AsyncSession, prior_weight: float) -> int:
+    """Recalcula game_leaderboard inteira e devolve quantos jogos foram ranqueados."""
+    if dialect_name(db) == "postgresql":
+        # Serializa atualizações concorrentes; leituras continuam liberadas
+        await db.execute(text("LOCK TABLE game_leaderboard IN EXCLUSIVE MODE"))
+
+    soma, quantidade = (await db.execute(
+        select(func.sum(GameRatingStats.soma), func.sum(GameRatingStats.quantidade))
+    )).one()
+    await db.execute(delete(GameLeaderboard))
+    if not quantidade:
+        await db.commit()
+        return 0
+
+    mean = literal(soma / quantidade, Float)
+    weight = literal(float(prior_weight), Float)
+    scored = (
+        select(
+            GameRatingStats.jogo_id,
+            ((weight * mean + GameRatingStats.soma) / (weight + GameRatingStats.quantidade)).label("nota"),
+            GameRatingStats.media,
+            GameRatingStats.quantidade,
+        )
+        .where(GameRatingStats.quantidade > 0)
+        .subquery()
+    )
+    posicao = func.row_number().over(order_by=(scored.c.nota.desc(), scored.c.jogo_id.asc()))
+    source = select(
+        scored.c.jogo_id,
+        posicao,
+        scored.c.nota,
+        scored.c.media,
+        scored.c.quantidade,
+        literal(datetime.now(timezone.utc), DateTime(timezone=True)),
+    )
+    await db.execute(
+        insert(db, GameLeaderboard).from_select(
+            ["jogo_id", "posicao", "nota", "media", "quantidade", "atualizado_em"], source
+        )
+    )
+    ranked = (await db.execute(select(func.count()).select_from(GameLeaderboard))).scalar_one()
+    await db.commit()
+    return ranked
+
+def _apply_filters(query, filters: Dict[str, Any]):
+    if (desenvolvedora := filters.get("desenvolvedora")) is not None:
+        query = query.where(Game.desenvolvedora.ilike(f"%{desenvolvedora}%"))
+    if (preco_min := filters.get("preco_min")) is not None:
+        query = query.where(Game.preco >= Decimal(preco_min))
+    if (preco_max := filters.get("preco_max")) is not None:
+        query = query.where(Game.preco <= Decimal(preco_max))
+    return query
+
+async def page(
+    db: AsyncSession,
+    filters: Dict[str, Any],
+    skip: int,
+    limit: int,
+    with_total: bool = True,
+) -> Tuple[List[Any], int | None]:
+    """Linhas (GameLeaderboard, Game) pela posição no ranking geral."""
+    columns = [GameLeaderboard, Game]
+    if with_total:
+        columns.append(func.count().over().label("total"))
+    query = _apply_filters(select(*columns).join(Game, Game.id == GameLeaderboard.jogo_id), filters)
+    rows = (await db.execute(query.order_by(GameLeaderboard.posicao).offset(skip).limit(limit))).all()
+
+    if not with_total:
+        return rows, None
+    if rows:
+        return rows, rows[0].total
+    if not skip:
+        return [], 0
+    count = _apply_filters(select(func.count()).select_from(GameLeaderboard).join(Game, Game.id == GameLeaderboard.jogo_id), filters)
+    return [], (await db.execute(count)).scalar_one()
+
+async def get(db: AsyncSession, jogo_id: int) -> GameLeaderboard | None:
+    res = await db.execute(select(GameLeaderboard).where(GameLeaderboard.jogo_id == jogo_id))
+    return res.scalar_one_or_none()
+
+async def size(db: AsyncSession) -> int:
+    # Posições são 1..n sem buracos: o maior valor sai do índice de posicao
+    res = await db.execute(select(func.max(GameLeaderboard.posicao)))
+    return res.scalar_one() or 0
@@ -0,0 +1,148 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from app.repositories import counting
+
+# Paginação por cursor (keyset): em vez de OFFSET, a próxima página começa
+# logo depois do último (chave_de_ordenação, id) devolvido, então a página N
+# custa o mesmo que a página 1 desde que a chave tenha índice. Por isso os
+# ORDERINGS dos repositórios só oferecem colunas com índice (coluna, id); a
+# exceção é a média dos jogos, que vem de uma subconsulta em game_rating_stats.
+
+def parse_order(orderings: Dict[str, InstrumentedAttribute], order: str) -> Tuple[str, InstrumentedAttribute, bool]:
+    desc = order.startswith("-")
+    key = order[1:] if desc else order
+    if key not in orderings:
+        raise ValueError(f"Ordenação inválida: {order}")
+    return key, orderings[key], desc
+
+def encode_cursor(order: str, value: Any, id_: int) -> str:
+    if isinstance(value, (date, datetime, Decimal)):
+        value = str(value) if isinstance(value, Decimal) else value.isoformat()
+    payload = json.dumps([order, value, id_], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, order: str, column: InstrumentedAttribute) -> Tuple[Any, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_order, value, id_ = json.loads(raw)
+    except (binascii.Error, ValueError, TypeError):
+        raise ValueError("Cursor inválido")
+
+    if cursor_order != order or not isinstance(id_, int):
+        raise ValueError("Cursor inválido")
+
+    python_type = column.type.python_type
+    try:
+        if python_type in (date, datetime):
+            value = python_type.fromisoformat(value)
+        elif value is not None:
+            value = python_type(value)
+    except (ValueError, TypeError):
+        raise ValueError("Cursor inválido")
+    return value, id_
+
+def apply_order(
+    query: Select,
+    orderings: Dict[str, InstrumentedAttribute],
+    id_column: InstrumentedAttribute,
+    order: str,
+    after: str | None = None,
+) -> Select:
+    key, column, desc = parse_order(orderings, order)
+
+    if after is not None:
+        value, last_id = decode_cursor(after, order, column)
+        if column is id_column:
+            query = query.where(id_column < last_id if desc else id_column > last_id)
+        else:
+            row, last = tuple_(column, id_column), tuple_(value, last_id)
+            query = query.where(row < last if desc else row > last)
+
+    if column is id_column:
+        return query.order_by(id_column.desc() if desc else id_column.asc())
+    if desc:
+        return query.order_by(column.desc(), id_column.desc())
+    return query.order_by(column.asc(), id_column.asc())
+
+def projection(model, fields: Sequence[str] | None = None) -> tuple:
+    """Colunas da tabela de ``model`` para ``fields`` (todas se None), sempre com o id."""
+    columns = model.__table__.c
+    if fields is None:
+        return tuple(columns)
+    unknown = [name for name in fields if name not in columns]
+    if unknown:
+        raise ValueError(f"Campos inválidos: {', '.join(unknown)}")
+    return tuple(columns[name] for name in dict.fromkeys(["id", *fields]))
+
+def next_cursor(items, orderings: Dict[str, InstrumentedAttribute], order: str, limit: int) -> str | None:
+    if len(items) < limit:
+        return None
+    key, _, _ = parse_order(orderings, order)
+    last = items[-1]
+    return encode_cursor(order, getattr(last, key), last.id)
+
+async def fetch_page(
+    db: AsyncSession,
+    model,
+    apply_filters: Callable[[Select, Dict[str, Any]], Select],
+    filters: Dict[str, Any],
+    orderings: Dict[str, InstrumentedAttribute],
+    skip: int,
+    limit: int,
+    order: str = "id",
+    after: str | None = None,
+    with_total: bool = True,
+    options: Sequence[Any] = (),
+    columns: Sequence[Any] | None = None,
+) -> Tuple[List[Any], int | None, bool]:
+    """Busca uma página e o total filtrado, de preferência numa única ida ao banco.
+
+    Com contagem exata o total vem de ``count(*) OVER()`` na própria consulta
+    da página. Com cursor o filtro de keyset entraria na contagem e com as
+    estratégias de estimativa/contador a contagem não passa pela consulta,
+    então nesses casos o total é buscado à parte. Devolve também se o total
+    é aproximado. ``options`` vai para as consultas que carregam o modelo.
+
+    Com ``columns`` a consulta seleciona só essas colunas (mais a chave de
+    ordenação, que o cursor usa) e a página vem como Row, sem montar objetos
+    ORM; ``options`` é ignorado.
+    """
+    strategy = counting.strategy_for(model.__tablename__)
+    in_window = strategy == counting.EXACT or (strategy == counting.COUNTER and bool(filters))
+
+    if columns is not None:
+        key, column, _ = parse_order(orderings, order)
+        if key not in {c.key for c in columns}:
+            columns = (*columns, column.label(key))
+        base = select(*columns)
+    else:
+        base = select(model).options(*options)
+
+    if not with_total or after is not None or not in_window:
+        query = apply_order(apply_filters(base, filters), orderings, model.id, order, after)
+        if after is None:
+            query = query.offset(skip)
+        result = await db.execute(query.limit(limit))
+        items = result.all() if columns is not None else result.scalars().all()
+        if not with_total:
+            return items, None, False
+        total, approximate = await counting.count_filtered(db, model, apply_filters, filters)
+        return items, total, approximate
+
+    query = apply_filters(base.add_columns(func.count().over().label("total")), filters)
+    query = apply_order(query, orderings, model.id, order).offset(skip).limit(limit)
+    rows = (await db.execute(query)).all()
+    if not rows:
+        if not skip:
+            return [], 0, False
+        total, approximate = await counting.count_filtered(db, model, apply_filters, filters)
+        return [], total, approximate
+    items = rows if columns is not None else [row[0] for row in rows]
+    return items, rows[0].total, False
@@ -1,106 +1,165 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict, List
-from sqlalchemy import DateTime, Numeric, String, Text, func, select, update, delete
+from typing import Any, AsyncIterator, Dict, List, Tuple
+from sqlalchemy import DateTime, Numeric, Row, String, Text, func, literal, select, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from app.models.purchase_model import Purchase
 from app.models.game_model import Game
+from app.models.user_model import User
+from app.repositories import bulk, copurchase_repository, counting, sales_repository, text_search
+from app.repositories.dialect import insert
+from app.repositories.pagination import fetch_page, projection
+
+ORDERINGS = {"id": Purchase.id, "data_compra": Purchase.data_compra, "preco_pago": Purchase.preco_pago}
 
 async def create(db: AsyncSession, data: Dict[str, Any]) -> Purchase:
-  res = await db.execute(select(Purchase).where(Purchase.jogo_id == data["jogo_id"], Purchase.usuario_id == data["usuario_id"])) 
-  if res.first() is not None:
-    raise IntegrityError("Compra duplicada", params=None, orig="duplicated purchase")
+  # A validação do jogo e do preço vai no próprio INSERT ... SELECT: só sai
+  # uma linha se o jogo existir e o preço couber. O motivo da recusa só é
+  # investigado quando nada é inserido.
+  columns = list(data)
+  source = (
+    select(*(literal(value, getattr(Purchase, field).type) for field, value in data.items()))
+    .where(Game.id == data["jogo_id"], Game.preco >= data["preco_pago"])
+  )
+  stmt = (
+    insert(db, Purchase)
+    .from_select(columns, source)
+    .on_conflict_do_nothing(index_elements=["usuario_id", "jogo_id"])
+    .returning(Purchase)
+  )
+  obj = (await db.execute(stmt)).scalar_one_or_none()
+  if obj is None:
+    await _raise_rejected(db, data)
 
-  jogo_res = await db.execute(select(Game).where(Game.id == data["jogo_id"]))
-  jogo = jogo_res.scalar_one_or_none()
+  await db.commit()
+  return obj
 
-  if not jogo:
-    raise IntegrityError("Jogo inexistente", params=None, orig="jogo_id not present")
+async def _rejections(db: AsyncSession, items: List[Dict[str, Any]]) -> Dict[int, str]:
+  precos = await bulk.lookup(db, Game.id, Game.preco, (data["jogo_id"] for data in items))
+  usuarios = await bulk.lookup(db, User.id, keys=(data["usuario_id"] for data in items))
+  rejected = {}
+  for index, data in enumerate(items):
+    preco = precos.get(data["jogo_id"])
+    if preco is None:
+      rejected[index] = "Não existe um jogo com este id"
+    elif data["usuario_id"] not in usuarios:
+      rejected[index] = "Não existe um usuário com este id"
+    elif data["preco_pago"] > preco:
+      rejected[index] = "Preco pago maior que o preco do jogo"
+  return rejected
 
-  if data["preco_pago"] > jogo.preco:
-    raise IntegrityError("Preco pago maior que o preco do jogo", params=None, orig="price too high")
-  obj = Purchase(**data)
-  db.add(obj)
+async def create_many(db: AsyncSession, items: List[Dict[str, Any]], copy: bool = False) -> List[Dict[str, Any]]:
+  rejected = await _rejections(db, items)
+  results = await bulk.insert_many(db, Purchase, items, [["usuario_id", "jogo_id"]], rejected, copy)
   await db.commit()
-  await db.refresh(obj)
-  return obj
+  return results
+
+async def _raise_rejected(db: AsyncSession, data: Dict[str, Any]) -> None:
+  preco = (await db.execute(select(Game.preco).where(Game.id == data["jogo_id"]))).scalar_one_or_none()
+  await db.rollback()
+  if preco is None:
+    raise IntegrityError("Jogo inexistente", params=None, orig="jogo_id not present")
+  if data["preco_pago"] > preco:
+    raise IntegrityError("Preco pago maior que o preco do jogo", params=None, orig="price too high")
+  raise IntegrityError("Compra duplicada", params=None, orig="duplicated purchase")
 
 async def get(db: AsyncSession, purchase_id: int) -> Purchase | None:
   res = await db.execute(select(Purchase).where(Purchase.id == purchase_id))
   return res.scalar_one_or_none()
 
-async def list_(
+def _apply_filters(query, filters: Dict[str, Any]):
+  if (preco_min := filters.get("preco_min")) is not None:
+    query = query.where(Purchase.preco_pago >= Decimal(preco_min))
+  if (preco_max := filters.get("preco_max")) is not None:
+    query = query.where(Purchase.preco_pago <= Decimal(preco_max))
+
+  for field, value in filters.items():
+    if field in {"preco_min", "preco_max"}:
+      continue
+    column_attr = getattr(Purchase, field, None)
+    if column_attr is None:
+      continue
+    col_type = column_attr.type
+    try:
+      if isinstance(col_type, (String, Text)):
+        query = query.where(column_attr.ilike(f"%{value}%"))
+      elif col_type.python_type is int:
+        query = query.where(column_attr == int(value))
+      elif isinstance(col_type, Numeric):
+        query = query.where(column_attr == Decimal(value))
+      elif isinstance(col_type, DateTime):
+        query = query.where(column_attr == datetime.fromisoformat(str(value)))
+      else:
+        query = query.where(column_attr == value)
+    except Exception:
+      continue
+  return query
+
+async def stream_(db: AsyncSession, filters: Dict[str, Any], fetch_size: int) -> AsyncIterator[Purchase]:
+  query = _apply_filters(select(Purchase), filters).order_by(Purchase.id)
+  result = await db.stream_scalars(query.execution_options(yield_per=fetch_size))
+  async for obj in result:
+    yield obj
+
+async def list_with_total(
     db: AsyncSession,
     skip: int,
     limit: int,
     filters: Dict[str, Any],
-) -> List[Purchase]:
-  query = select(Purchase)
-  if id_ := filters.get("id"):
-    query = query.where(Purchase.id == id_)
-  if jogo_id := filters.get("jogo_id"):
-    query = query.where(Purchase.jogo_id == jogo_id)
-  if usuario_id := filters.get("usuario_id"):
-    query = query.where(Purchase.usuario_id == usuario_id)
-  if preco_min := filters.get("preco_min"):
-    query = query.where(Purchase.preco >= preco_min)
-  if preco_max := filters.get("preco_max"):
-    query = query.where(Purchase.preco <= preco_max)
-  if preco := filters.get("preco"):
-    query = query.where(Purchase.preco.like(f"%{preco}%"))
-  if forma_pagamento := filters.get("forma_pagamento"):
-    query = query.where(Purchase.forma_pagamento.like(f"%{forma_pagamento}%"))
-  if data_compra := filters.get("data_compra"):
-    query = query.where(Purchase.data_compra.like(f"%{data_compra}%"))
-  res = await db.execute(query.offset(skip).limit(limit))
-  return res.scalars().all()
-
-async def count_filtered(
+    order: str = "id",
+    after: str | None = None,
+    with_total: bool = True,
+    fields: Tuple[str, ...] | None = None,
+) -> Tuple[List[Row], int | None, bool]:
+  return await fetch_page(
+    db, Purchase, _apply_filters, filters, ORDERINGS,
+    skip, limit, order, after, with_total, columns=projection(Purchase, fields),
+  )
+
+async def search(
     db: AsyncSession,
-    filters: Dict[str, Any],
-) -> int:
-    query = select(func.count(Purchase.id))
-
-    if (preco_min := filters.get("preco_min")) is not None:
-        query = query.where(Purchase.preco_pago >= Decimal(preco_min))
-    if (preco_max := filters.get("preco_max")) is not None:
-        query = query.where(Purchase.preco_pago <= Decimal(preco_max))
-
-    for field, value in filters.items():
-        if field in {"preco_min", "preco_max"}:
-            continue
-        column_attr = getattr(Purchase, field, None)
-        if column_attr is None:
-            continue
-        col_type = column_attr.type
-        try:
-            if isinstance(col_type, (String, Text)):
-                query = query.where(column_attr.ilike(f"%{value}%"))
-            elif col_type.python_type is int:
-                query = query.where(column_attr == int(value))
-            elif isinstance(col_type, Numeric):
-                query = query.where(column_attr == Decimal(value))
-            elif isinstance(col_type, DateTime):
-                query = query.where(
-                    column_attr == datetime.fromisoformat(str(value))
-                )
-            else:
-                query = query.where(column_attr == value)
-        except Exception:
-            continue
-
-    result = await db.execute(query)
-    return result.scalar_one()
-
-async def update_(db: AsyncSession, purchase_id: int, data: Dict[str, Any]) -> None:
-  await db.execute(update(Purchase).where(Purchase.id == purchase_id).values(**data))
+    field: str,
+    value: str,
+    mode: str,
+    skip: int,
+    limit: int,
+    with_total: bool = True,
+    fields: Tuple[str, ...] | None = None,
+) -> Tuple[List[Row], int | None, bool]:
+  return await text_search.search_page(db, Purchase, field, value, mode, skip, limit, with_total, projection(Purchase, fields))
+
+async def _adjust_rollups(db: AsyncSession, purchase_id: int, sign: int) -> None:
+  await sales_repository.adjust(db, purchase_id, sign)
+  await copurchase_repository.adjust(db, purchase_id, sign)
+
+async def update_(db: AsyncSession, purchase_id: int, data: Dict[str, Any], versions: List[int] | None = None) -> Purchase | None:
+  """Atualiza e devolve a compra numa só instrução; None se nenhuma linha casou
+  (id inexistente ou, com ``versions``, versão atual fora delas)."""
+  # Se a compra já foi consolidada, sai de sales_daily e game_copurchase com
+  # os valores antigos e volta com os novos
+  await _adjust_rollups(db, purchase_id, -1)
+  stmt = update(Purchase).where(Purchase.id == purchase_id)
+  if versions is not None:
+    stmt = stmt.where(Purchase.version.in_(versions))
+  res = await db.execute(stmt.values(**data).returning(Purchase))
+  obj = res.scalar_one_or_none()
+  if obj is None:
+    await db.rollback()
+    return None
+  await _adjust_rollups(db, purchase_id, 1)
   await db.commit()
+  return obj
 
-async def delete_(db: AsyncSession, purchase_id: int) -> None:
-  await db.execute(delete(Purchase).where(Purchase.id == purchase_id))
+async def delete_(db: AsyncSession, purchase_id: int) -> bool:
+  """Remove a compra; False se o id não existe."""
+  await _adjust_rollups(db, purchase_id, -1)
+  res = await db.execute(delete(Purchase).where(Purchase.id == purchase_id).returning(Purchase.id))
+  if res.scalar_one_or_none() is None:
+    await db.rollback()
+    return False
   await db.commit()
+  return True
 
-async def count(db: AsyncSession) -> int:
-  res = await db.execute(select(func.count(Purchase.id)))
-  return res.scalar()
\ No newline at end of file
+async def count(db: AsyncSession) -> Tuple[int, bool]:
+  return await counting.count_table(db, Purchase)
@@ -0,0 +1,78 @@
+from typing import Dict, Iterable, Tuple
+from sqlalchemy import Float, case, cast, delete, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.game_rating_model import NOTAS, GameRatingStats
+from app.models.review_model import Review
+from app.repositories.bulk import MAX_PARAMS
+from app.repositories.dialect import dialect_name, insert
+
+# Agregados de nota por jogo (game_rating_stats). Cada escrita em reviews
+# vira deltas (jogo_id, nota, +1/-1) aplicados na mesma transação com um
+# único upsert, então ler a média de um jogo não depende de quantas reviews
+# ele tem.
+
+COLUMNS = ["quantidade", "soma", *(f"nota_{nota}" for nota in NOTAS)]
+
+async def get(db: AsyncSession, jogo_id: int) -> GameRatingStats | None:
+    res = await db.execute(select(GameRatingStats).where(GameRatingStats.jogo_id == jogo_id))
+    return res.scalar_one_or_none()
+
+async def apply(db: AsyncSession, changes: Iterable[Tuple[int, int, int]]) -> None:
+    """Aplica deltas (jogo_id, nota, +1 ou -1) aos agregados, sem commit."""
+    rows: Dict[int, Dict[str, int]] = {}
+    for jogo_id, nota, delta in changes:
+        row = rows.setdefault(jogo_id, {"jogo_id": jogo_id, **{name: 0 for name in COLUMNS}})
+        row["quantidade"] += delta
+        row["soma"] += delta * nota
+        row[f"nota_{nota}"] += delta
+
+    # Ordem fixa de jogo_id para duas transações não travarem linhas em ordem inversa
+    values = [rows[jogo_id] for jogo_id in sorted(rows)]
+    for row in values:
+        row["media"] = row["soma"] / row["quantidade"] if row["quantidade"] > 0 else None
+
+    table = GameRatingStats.__table__
+    size = MAX_PARAMS // (len(COLUMNS) + 2)
+    for start in range(0, len(values), size):
+        stmt = insert(db, GameRatingStats).values(values[start:start + size])
+        quantidade = table.c.quantidade + stmt.excluded.quantidade
+        soma = table.c.soma + stmt.excluded.soma
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["jogo_id"],
+            set_={
+                **{name: table.c[name] + stmt.excluded[name] for name in COLUMNS},
+                "media": cast(soma, Float) / func.nullif(quantidade, 0),
+            },
+        )
+        await db.execute(stmt)
+
+async def rebuild(db: AsyncSession, jogo_id: int | None = None) -> int:
+    """Recalcula os agregados a partir de reviews e devolve quantos jogos têm nota."""
+    source = (
+        select(
+            Review.jogo_id,
+            func.count(),
+            func.sum(Review.nota),
+            func.avg(Review.nota),
+            *(func.sum(case((Review.nota == nota, 1), else_=0)) for nota in NOTAS),
+        )
+        .group_by(Review.jogo_id)
+    )
+    clear = delete(GameRatingStats)
+    if jogo_id is not None:
+        source = source.where(Review.jogo_id == jogo_id)
+        clear = clear.where(GameRatingStats.jogo_id == jogo_id)
+
+    if dialect_name(db) == "postgresql":
+        # Segura escritas em reviews enquanto a foto é tirada
+        await db.execute(text("LOCK TABLE reviews IN SHARE MODE"))
+    await db.execute(clear)
+    await db.execute(
+        insert(db, GameRatingStats).from_select(
+            ["jogo_id", "quantidade", "soma", "media", *(f"nota_{nota}" for nota in NOTAS)],
+            source,
+        )
+    )
+    res = await db.execute(select(func.count()).select_from(GameRatingStats))
+    await db.commit()
+    return res.scalar_one()
@@ -1,46 +1,128 @@
 from decimal import Decimal
-from typing import Any, Dict, List
-from sqlalchemy import func, select, update, delete
+from typing import Any, AsyncIterator, Dict, List, Tuple
+from sqlalchemy import Row, func, select, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from app.models.game_model import Game
 from app.models.review_model import Review
+from app.models.user_model import User
+from app.repositories import bulk, counting, text_search
+from app.repositories.dialect import insert
+from app.repositories.pagination import fetch_page, projection
 
-async def create(db: AsyncSession, data: Dict[str, Any]) -> Review:
-    obj = Review(**data)
-    db.add(obj)
-    await db.commit()
-    await db.refresh(obj)
+ORDERINGS = {"id": Review.id, "nota": Review.nota}
+
+async def create(db: AsyncSession, data: Dict[str, Any], commit: bool = True) -> Review:
+    stmt = (
+        insert(db, Review)
+        .values(**data)
+        .on_conflict_do_nothing(index_elements=["usuario_id", "jogo_id"])
+        .returning(Review)
+    )
+    obj = (await db.execute(stmt)).scalar_one_or_none()
+    if obj is None:
+        raise IntegrityError("Review duplicada", params=None, orig="uq_usuario_jogo")
+
+    if commit:
+        await db.commit()
     return obj
 
+async def _rejections(db: AsyncSession, items: List[Dict[str, Any]]) -> Dict[int, str]:
+    jogos = await bulk.lookup(db, Game.id, keys=(data["jogo_id"] for data in items))
+    usuarios = await bulk.lookup(db, User.id, keys=(data["usuario_id"] for data in items))
+    rejected = {}
+    for index, data in enumerate(items):
+        if data["jogo_id"] not in jogos:
+            rejected[index] = "Não existe um jogo com este id"
+        elif data["usuario_id"] not in usuarios:
+            rejected[index] = "Não existe um usuário com este id"
+    return rejected
+
+async def create_many(
+    db: AsyncSession,
+    items: List[Dict[str, Any]],
+    copy: bool = False,
+    commit: bool = True,
+) -> List[Dict[str, Any]]:
+    rejected = await _rejections(db, items)
+    results = await bulk.insert_many(db, Review, items, [["usuario_id", "jogo_id"]], rejected, copy)
+    if commit:
+        await db.commit()
+    return results
+
 async def get(db: AsyncSession, review_id: int) -> Review | None:
     res = await db.execute(select(Review).where(Review.id == review_id))
     return res.scalar_one_or_none()
 
-async def list_(
+async def get_for_update(db: AsyncSession, review_id: int) -> Review | None:
+    """Lê a review travando a linha até o fim da transação."""
+    res = await db.execute(select(Review).where(Review.id == review_id).with_for_update())
+    return res.scalar_one_or_none()
+
+def _apply_filters(query, filters: Dict[str, Any]):
+    if (nota_min := filters.get("nota_min")) is not None:
+        query = query.where(Review.nota >= nota_min)
+    if (nota_max := filters.get("nota_max")) is not None:
+        query = query.where(Review.nota <= nota_max)
+
+    for field, value in filters.items():
+        column_attr = getattr(Review, field, None)
+        if column_attr is None:
+            continue
+        condition = column_attr.ilike(f"%{value}%") if field == "comentario" else column_attr == value
+        query = query.where(condition)
+    return query
+
+async def stream_(db: AsyncSession, filters: Dict[str, Any], fetch_size: int) -> AsyncIterator[Review]:
+    query = _apply_filters(select(Review), filters).order_by(Review.id)
+    result = await db.stream_scalars(query.execution_options(yield_per=fetch_size))
+    async for obj in result:
+        yield obj
+
+async def list_with_total(
     db: AsyncSession,
     skip: int,
     limit: int,
     filters: Dict[str, Any],
-) -> List[Review]:
-    query = select(Review)
-    if usuario_id := filters.get("usuario_id"):
-        query = query.where(Review.usuario_id == usuario_id)
-    if jogo_id := filters.get("jogo_id"):
-        query = query.where(Review.jogo_id == jogo_id)
-    if nota_min := filters.get("nota_min"):
-        query = query.where(Review.nota >= nota_min)
-    if nota_max := filters.get("nota_max"):
-        query = query.where(Review.nota <= nota_max)
-    res = await db.execute(query.offset(skip).limit(limit))
-    return res.scalars().all()
+    order: str = "id",
+    after: str | None = None,
+    with_total: bool = True,
+    fields: Tuple[str, ...] | None = None,
+) -> Tuple[List[Row], int | None, bool]:
+    return await fetch_page(
+        db, Review, _apply_filters, filters, ORDERINGS,
+        skip, limit, order, after, with_total, columns=projection(Review, fields),
+    )
 
-async def update_(db: AsyncSession, review_id: int, data: Dict[str, Any]) -> None:
-    await db.execute(update(Review).where(Review.id == review_id).values(**data))
-    await db.commit()
+async def search(
+    db: AsyncSession,
+    field: str,
+    value: str,
+    mode: str,
+    skip: int,
+    limit: int,
+    with_total: bool = True,
+    fields: Tuple[str, ...] | None = None,
+) -> Tuple[List[Row], int | None, bool]:
+    return await text_search.search_page(db, Review, field, value, mode, skip, limit, with_total, projection(Review, fields))
+
+async def update_(db: AsyncSession, review_id: int, data: Dict[str, Any], commit: bool = True) -> Review | None:
+    """Atualiza e devolve a review numa só instrução; None se o id não existe."""
+    res = await db.execute(update(Review).where(Review.id == review_id).values(**data).returning(Review))
+    obj = res.scalar_one_or_none()
+    if commit:
+        await db.commit()
+    return obj
 
-async def delete_(db: AsyncSession, review_id: int) -> None:
-    await db.execute(delete(Review).where(Review.id == review_id))
-    await db.commit()
+async def delete_(db: AsyncSession, review_id: int, commit: bool = True) -> Row | None:
+    """Remove a review e devolve (jogo_id, nota) que ela tinha; None se o id não existe."""
+    res = await db.execute(
+        delete(Review).where(Review.id == review_id).returning(Review.jogo_id, Review.nota)
+    )
+    row = res.one_or_none()
+    if commit:
+        await db.commit()
+    return row
 
-async def count(db: AsyncSession) -> int:
-    res = await db.execute(select(func.count()).select_from(Review))
-    return res.scalar_one()
+async def count(db: AsyncSession) -> Tuple[int, bool]:
+    return await counting.count_table(db, Review)
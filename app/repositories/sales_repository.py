@@ -0,0 +1,182 @@
+from datetime import date, datetime, timezone
+from typing import Any, List, Tuple
+from sqlalchemy import BigInteger, Date, Numeric, cast, delete, func, inspect, literal, literal_column, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.game_model import Game
+from app.models.purchase_model import Purchase
+from app.models.sales_model import SalesDaily, SalesWatermark
+from app.repositories.dialect import dialect_name, insert
+
+# Consolidação incremental de purchase em sales_daily. Cada passada pega as
+# compras com posição acima da marca d'água, agrega tudo num único INSERT ...
+# SELECT ... GROUP BY somado às linhas existentes (ON CONFLICT DO UPDATE) e
+# avança a marca, na mesma transação.
+#
+# A posição não pode ser o id: ids saem da sequence fora da ordem de commit,
+# e uma compra ainda não commitada com id menor ficaria para trás quando a
+# marca passasse dela. No PostgreSQL a posição é purchase.xact_id, a
+# transação que inseriu a linha (coluna criada pela migração, fora do
+# mapeamento ORM), e a passada só pega posições abaixo do xmin do snapshot:
+# todas de transações já encerradas, então nada mais aparece abaixo da nova
+# marca e purchase não é travada. No SQLite as escritas são serializadas e o
+# próprio id serve de posição.
+#
+# A linha da marca é travada com FOR UPDATE pela passada, o que serializa as
+# consolidações entre si. Alterações e exclusões de compras já consolidadas
+# chegam aqui por adjust(), que lê a marca com FOR SHARE antes de mexer em
+# purchase.
+#
+# sales_watermark guarda uma marca por consolidação; as funções de marca
+# abaixo também servem ao copurchase_repository.
+
+WATERMARK = "purchase"
+# Marca de quem ainda não consolidou nada (abaixo de qualquer posição)
+INICIO = -(2 ** 63)
+KEY = ["dia", "jogo_id", "forma_pagamento"]
+GROUPS = {
+    "game":            (SalesDaily.jogo_id, Game.titulo),
+    "day":             (SalesDaily.dia,),
+    "forma_pagamento": (SalesDaily.forma_pagamento,),
+}
+
+def _day(db: AsyncSession):
+    if dialect_name(db) == "postgresql":
+        # Dia em UTC, qualquer que seja o timezone da sessão. O literal vai
+        # sem parâmetro para o GROUP BY reconhecer a mesma expressão.
+        return cast(func.timezone(literal_column("'UTC'"), Purchase.data_compra), Date)
+    return func.date(Purchase.data_compra)
+
+def position(db: AsyncSession, entity=Purchase):
+    """Posição de consolidação das compras de ``entity`` (Purchase ou um aliased dela)."""
+    if dialect_name(db) != "postgresql":
+        return entity.id
+    return literal_column(f"{inspect(entity).selectable.name}.xact_id", BigInteger)
+
+async def _horizon(db: AsyncSession) -> int | None:
+    """Posições abaixo desta já não mudam; None quando tudo que está visível é definitivo."""
+    if dialect_name(db) != "postgresql":
+        return None
+    return (await db.execute(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint"))).scalar_one()
+
+async def watermark(db: AsyncSession, nome: str, lock: str | None = None) -> int:
+    """Última posição já consolidada por ``nome``; ``lock`` é "update" ou "share"."""
+    query = select(SalesWatermark.ultimo_id).where(SalesWatermark.nome == nome)
+    if lock == "update":
+        query = query.with_for_update()
+    elif lock == "share":
+        query = query.with_for_update(read=True)
+    ultimo = (await db.execute(query)).scalar_one_or_none()
+    return INICIO if ultimo is None else ultimo
+
+async def lock_watermark(db: AsyncSession, nome: str) -> int:
+    await db.execute(insert(db, SalesWatermark).values(nome=nome, ultimo_id=INICIO).on_conflict_do_nothing())
+    return await watermark(db, nome, lock="update")
+
+async def advance(db: AsyncSession, nome: str, ultimo_id: int) -> None:
+    await db.execute(
+        update(SalesWatermark)
+        .where(SalesWatermark.nome == nome)
+        .values(ultimo_id=ultimo_id, atualizado_em=datetime.now(timezone.utc) if ultimo_id != INICIO else None)
+    )
+
+async def pending(db: AsyncSession, ultimo: int, batch_size: int) -> Tuple[int | None, int]:
+    """(maior posição, quantidade) do próximo lote de compras depois de ``ultimo``.
+
+    O lote tem cerca de batch_size compras: as compras de uma mesma transação
+    entram juntas, mesmo que passem do tamanho.
+    """
+    key = position(db)
+    query = select(key.label("posicao")).select_from(Purchase).where(key > ultimo)
+    if (horizon := await _horizon(db)) is not None:
+        query = query.where(key < horizon)
+    batch = query.order_by(key).limit(batch_size).subquery()
+    limite = (await db.execute(select(func.max(batch.c.posicao)))).scalar_one()
+    if limite is None:
+        return None, 0
+    res = await db.execute(select(func.count()).select_from(Purchase).where(key > ultimo, key <= limite))
+    return limite, res.scalar_one()
+
+async def _merge(db: AsyncSession, source) -> None:
+    table = SalesDaily.__table__
+    stmt = insert(db, SalesDaily).from_select([*KEY, "unidades", "receita"], source)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=KEY,
+        set_={
+            "unidades": table.c.unidades + stmt.excluded.unidades,
+            "receita":  table.c.receita + stmt.excluded.receita,
+        },
+    )
+    await db.execute(stmt)
+
+async def refresh(db: AsyncSession, batch_size: int) -> int:
+    """Consolida até batch_size compras novas e devolve quantas entraram."""
+    ultimo = await lock_watermark(db, WATERMARK)
+    limite, quantidade = await pending(db, ultimo, batch_size)
+    if not quantidade:
+        await db.commit()
+        return 0
+
+    day = _day(db)
+    key = position(db)
+    await _merge(db, (
+        select(
+            day,
+            Purchase.jogo_id,
+            Purchase.forma_pagamento,
+            func.count(),
+            cast(func.sum(Purchase.preco_pago), Numeric(14, 2)),
+        )
+        .where(key > ultimo, key <= limite)
+        .group_by(day, Purchase.jogo_id, Purchase.forma_pagamento)
+    ))
+    await advance(db, WATERMARK, limite)
+    await db.commit()
+    return quantidade
+
+async def adjust(db: AsyncSession, purchase_id: int, sign: int) -> None:
+    """Soma (1) ou retira (-1) uma compra dos agregados se ela já foi consolidada, sem commit."""
+    ultimo = await watermark(db, WATERMARK, lock="share")
+    await _merge(db, (
+        select(
+            _day(db),
+            Purchase.jogo_id,
+            Purchase.forma_pagamento,
+            literal(sign),
+            cast(literal(sign) * Purchase.preco_pago, Numeric(14, 2)),
+        )
+        .where(Purchase.id == purchase_id, position(db) <= ultimo)
+    ))
+
+async def reset(db: AsyncSession) -> None:
+    """Apaga os agregados e volta a marca para o início."""
+    await lock_watermark(db, WATERMARK)
+    await db.execute(delete(SalesDaily))
+    await advance(db, WATERMARK, INICIO)
+    await db.commit()
+
+async def status(db: AsyncSession, nome: str = WATERMARK) -> Tuple[int, datetime | None]:
+    res = await db.execute(
+        select(SalesWatermark.ultimo_id, SalesWatermark.atualizado_em).where(SalesWatermark.nome == nome)
+    )
+    row = res.one_or_none()
+    return (row.ultimo_id, row.atualizado_em) if row else (INICIO, None)
+
+async def revenue(db: AsyncSession, group_by: str, de: date | None, ate: date | None) -> List[Any]:
+    columns = GROUPS.get(group_by)
+    if columns is None:
+        raise ValueError(f"Agrupamento inválido: {group_by}. Use um de: {', '.join(GROUPS)}")
+
+    unidades = func.sum(SalesDaily.unidades).label("unidades")
+    receita = func.sum(SalesDaily.receita).label("receita")
+    query = select(*columns, unidades, receita)
+    if group_by == "game":
+        query = query.join(Game, Game.id == SalesDaily.jogo_id)
+    if de is not None:
+        query = query.where(SalesDaily.dia >= de)
+    if ate is not None:
+        query = query.where(SalesDaily.dia <= ate)
+
+    # Grupos zerados por exclusões não aparecem
+    query = query.group_by(*columns).having(func.sum(SalesDaily.unidades) != 0)
+    query = query.order_by(SalesDaily.dia) if group_by == "day" else query.order_by(receita.desc(), *columns)
+    return (await db.execute(query)).all()
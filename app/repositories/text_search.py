@@ -0,0 +1,82 @@
+import os
+from typing import Any, List, Sequence, Tuple
+from dotenv import load_dotenv
+from sqlalchemy import String, Text, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.dialect import dialect_name
+
+load_dotenv()
+
+# Modos de busca textual do /search:
+#   contem  -> ILIKE '%valor%' (no PostgreSQL usa os índices GIN gin_trgm_ops)
+#   similar -> operador % do pg_trgm, ordenado por similarity()
+#   texto   -> busca textual completa na coluna tsvector, ordenada por ts_rank
+# No SQLite os modos similar e texto caem para ILIKE, ordenado por id.
+
+CONTEM = "contem"
+SIMILAR = "similar"
+TEXTO = "texto"
+MODES = {CONTEM, SIMILAR, TEXTO}
+
+# Colunas tsvector geradas pela migração de busca textual (fora do mapeamento
+# ORM porque o tipo não existe no SQLite).
+FULLTEXT_COLUMNS = {("reviews", "comentario"): "comentario_tsv"}
+FULLTEXT_CONFIG = os.getenv("FULLTEXT_CONFIG", "portuguese")
+
+def _match(db: AsyncSession, model, field: str, value: str, mode: str):
+    if mode not in MODES:
+        raise ValueError(f"Modo de busca inválido: {mode}")
+
+    column = getattr(model, field, None)
+    if not isinstance(getattr(column, "type", None), (String, Text)):
+        raise ValueError(f"Campo {field} não é textual")
+
+    tsv_column = FULLTEXT_COLUMNS.get((model.__tablename__, field))
+    if mode == TEXTO and tsv_column is None:
+        raise ValueError(f"Campo {field} não tem busca textual completa")
+
+    if mode == CONTEM or dialect_name(db) != "postgresql":
+        return column.ilike(f"%{value}%"), None
+    if mode == SIMILAR:
+        return column.op("%")(value), func.similarity(column, value)
+
+    tsv = literal_column(f"{model.__tablename__}.{tsv_column}")
+    tsquery = func.websearch_to_tsquery(FULLTEXT_CONFIG, value)
+    return tsv.op("@@")(tsquery), func.ts_rank(tsv, tsquery)
+
+async def search_page(
+    db: AsyncSession,
+    model,
+    field: str,
+    value: str,
+    mode: str,
+    skip: int,
+    limit: int,
+    with_total: bool = True,
+    columns: Sequence[Any] | None = None,
+) -> Tuple[List[Any], int | None, bool]:
+    """Página de resultados de uma busca textual, dos mais relevantes para os menos.
+
+    Com ``columns`` os itens vêm como Row dessas colunas em vez de objetos ORM.
+    """
+    condition, rank = _match(db, model, field, value, mode)
+
+    selected = list(columns) if columns is not None else [model]
+    if with_total:
+        selected.append(func.count().over().label("total"))
+    query = select(*selected).where(condition)
+    if rank is not None:
+        query = query.order_by(rank.desc(), model.id.asc())
+    else:
+        query = query.order_by(model.id.asc())
+
+    rows = (await db.execute(query.offset(skip).limit(limit))).all()
+    items = rows if columns is not None else [row[0] for row in rows]
+    if not with_total:
+        return items, None, False
+    if rows:
+        return items, rows[0].total, False
+    if not skip:
+        return [], 0, False
+    res = await db.execute(select(func.count(model.id)).where(condition))
+    return [], res.scalar_one(), False
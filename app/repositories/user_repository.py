@@ -1,44 +1,39 @@
 from app import file_logger as logger
-from typing import Any, Dict, List
-from sqlalchemy import func, select, update, delete
+from typing import Any, AsyncIterator, Dict, List, Tuple
+from sqlalchemy import Row, func, select, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user_model import User
 from sqlalchemy.exc import IntegrityError
+from app.repositories import bulk, counting, text_search
+from app.repositories.dialect import insert
+from app.repositories.pagination import fetch_page, projection
+
+ORDERINGS = {"id": User.id, "nome": User.nome, "email": User.email}
 
 async def create(db: AsyncSession, data: Dict[str, Any]) -> User:
-    res = await db.execute(select(User).where(User.email == data["email"]))
-    if res.scalar_one_or_none():
+    stmt = (
+        insert(db, User)
+        .values(**data)
+        .on_conflict_do_nothing(index_elements=["email"])
+        .returning(User)
+    )
+    obj = (await db.execute(stmt)).scalar_one_or_none()
+    if obj is None:
         raise IntegrityError("Email duplicado", params=None, orig="email")
 
-    obj = User(**data)
-    db.add(obj)
     await db.commit()
-    await db.refresh(obj)
     return obj
 
+async def create_many(db: AsyncSession, items: List[Dict[str, Any]], copy: bool = False) -> List[Dict[str, Any]]:
+    results = await bulk.insert_many(db, User, items, [["email"]], copy=copy)
+    await db.commit()
+    return results
+
 async def get(db: AsyncSession, user_id: int) -> User | None:
     res = await db.execute(select(User).where(User.id == user_id))
     return res.scalar_one_or_none()
 
-async def list_(
-    db: AsyncSession,
-    skip: int,
-    limit: int,
-    filters: Dict[str, Any],
-) -> List[User]:
-    query = select(User)
-    if nome := filters.get("nome"):
-        query = query.where(User.nome.ilike(f"%{nome}%"))
-    if email := filters.get("email"):
-        query = query.where(User.email.ilike(f"%{email}%"))
-    if pais := filters.get("pais"):
-        query = query.where(User.pais.ilike(f"%{pais}%"))
-    res = await db.execute(query.offset(skip).limit(limit))
-    return res.scalars().all()
-
-async def count_filtered(db: AsyncSession, filters: Dict[str, Any]) -> int:
-    query = select(func.count(User.id))
-
+def _apply_filters(query, filters: Dict[str, Any]):
     for field, value in filters.items():
         column_attr = getattr(User, field, None)
         if column_attr is None:
@@ -47,18 +42,63 @@ async def count_filtered(db: AsyncSession, filters: Dict[str, Any]) -> int:
             query = query.where(column_attr.ilike(f"%{value}%"))
         else:
             query = query.where(column_attr == value)
+    return query
 
-    total = await db.execute(query)
-    return total.scalar_one()
+async def stream_(db: AsyncSession, filters: Dict[str, Any], fetch_size: int) -> AsyncIterator[User]:
+    query = _apply_filters(select(User), filters).order_by(User.id)
+    result = await db.stream_scalars(query.execution_options(yield_per=fetch_size))
+    async for obj in result:
+        yield obj
 
-async def update_(db: AsyncSession, user_id: int, data: Dict[str, Any]) -> None:
-    await db.execute(update(User).where(User.id == user_id).values(**data))
+async def list_with_total(
+    db: AsyncSession,
+    skip: int,
+    limit: int,
+    filters: Dict[str, Any],
+    order: str = "id",
+    after: str | None = None,
+    with_total: bool = True,
+    fields: Tuple[str, ...] | None = None,
+) -> Tuple[List[Row], int | None, bool]:
+    return await fetch_page(
+        db, User, _apply_filters, filters, ORDERINGS,
+        skip, limit, order, after, with_total, columns=projection(User, fields),
+    )
+
+async def search(
+    db: AsyncSession,
+    field: str,
+    value: str,
+    mode: str,
+    skip: int,
+    limit: int,
+    with_total: bool = True,
+    fields: Tuple[str, ...] | None = None,
+) -> Tuple[List[Row], int | None, bool]:
+    return await text_search.search_page(db, User, field, value, mode, skip, limit, with_total, projection(User, fields))
+
+async def update_(db: AsyncSession, user_id: int, data: Dict[str, Any], versions: List[int] | None = None) -> User | None:
+    """Atualiza e devolve o usuário numa só instrução; None se nenhuma linha casou
+    (id inexistente ou, com ``versions``, versão atual fora delas)."""
+    stmt = update(User).where(User.id == user_id)
+    if versions is not None:
+        stmt = stmt.where(User.version.in_(versions))
+    res = await db.execute(stmt.values(**data).returning(User))
+    obj = res.scalar_one_or_none()
+    if obj is None:
+        await db.rollback()
+        return None
     await db.commit()
+    return obj
 
-async def delete_(db: AsyncSession, user_id: int) -> None:
-    await db.execute(delete(User).where(User.id == user_id))
+async def delete_(db: AsyncSession, user_id: int) -> bool:
+    """Remove o usuário; False se o id não existe."""
+    res = await db.execute(delete(User).where(User.id == user_id).returning(User.id))
+    if res.scalar_one_or_none() is None:
+        await db.rollback()
+        return False
     await db.commit()
+    return True
 
-async def count(db: AsyncSession) -> int:
-    res = await db.execute(select(func.count()).select_from(User))
-    return res.scalar_one()
+async def count(db: AsyncSession) -> Tuple[int, bool]:
+    return await counting.count_table(db, User)
@@ -0,0 +1,49 @@
+import asyncio
+import os
+from typing import Dict
+from dotenv import load_dotenv
+from app import file_logger as logger
+from app.database import AsyncSessionLocal
+from app.repositories import copurchase_repository, sales_repository
+
+load_dotenv()
+
+# Consolidações de purchase em segundo plano: a cada SALES_ROLLUP_INTERVAL_SECONDS
+# as compras novas entram em sales_daily e em game_copurchase, em lotes (cada
+# lote é uma transação curta). A passada não trava purchase: as escritas de
+# compras seguem normalmente enquanto ela roda.
+
+SALES_ROLLUP_ENABLED = os.getenv("SALES_ROLLUP_ENABLED", "true").lower() not in {"0", "false", "no"}
+SALES_ROLLUP_INTERVAL_SECONDS = float(os.getenv("SALES_ROLLUP_INTERVAL_SECONDS", "60"))
+SALES_ROLLUP_BATCH_SIZE = int(os.getenv("SALES_ROLLUP_BATCH_SIZE", "50000"))
+# Os pares crescem com o número de compras de cada usuário: lotes menores
+COPURCHASE_BATCH_SIZE = int(os.getenv("COPURCHASE_BATCH_SIZE", "10000"))
+
+ROLLUPS = {
+    "vendas": (sales_repository, SALES_ROLLUP_BATCH_SIZE),
+    "copurchase": (copurchase_repository, COPURCHASE_BATCH_SIZE),
+}
+
+async def refresh(rebuild: bool = False) -> Dict[str, int]:
+    """Consolida todas as compras pendentes e devolve quantas entraram em cada consolidação."""
+    totals = {}
+    async with AsyncSessionLocal() as db:
+        for nome, (repository, batch_size) in ROLLUPS.items():
+            if rebuild:
+                await repository.reset(db)
+            total = 0
+            while quantidade := await repository.refresh(db, batch_size):
+                total += quantidade
+            if total:
+                logger.info_(f"Compras consolidadas em {nome}", compras=total)
+            totals[nome] = total
+    return totals
+
+async def run() -> None:
+    """Laço da tarefa de fundo; termina quando a tarefa é cancelada."""
+    while True:
+        try:
+            await refresh()
+        except Exception as e:
+            logger.error_(f"Erro ao consolidar vendas: {str(e)}")
+        await asyncio.sleep(SALES_ROLLUP_INTERVAL_SECONDS)
@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date, datetime
+from decimal import Decimal
+
+class RevenueItem(BaseModel):
+    # Só vêm preenchidos os campos do agrupamento pedido
+    jogo_id: Optional[int] = None
+    titulo: Optional[str] = None
+    dia: Optional[date] = None
+    forma_pagamento: Optional[str] = None
+    unidades: int
+    receita: Decimal
+
+class RevenueReport(BaseModel):
+    group_by: str
+    de: Optional[date] = None
+    ate: Optional[date] = None
+    consolidado_em: Optional[datetime] = None
+    unidades: int
+    receita: Decimal
+    itens: List[RevenueItem]
@@ -0,0 +1,14 @@
+from typing import List, Optional
+from pydantic import BaseModel
+
+class BulkItemResult(BaseModel):
+    indice: int
+    status: str
+    id: Optional[int] = None
+    detalhe: Optional[str] = None
+
+class BulkResult(BaseModel):
+    criados: int
+    conflitos: int
+    erros: int
+    itens: List[BulkItemResult]
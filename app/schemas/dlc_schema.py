@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import date
 from decimal import Decimal
@@ -12,5 +12,4 @@ class DLCCreate(BaseModel):
     jogo_id: int
 class DLCModelId(DLCCreate):
     id: int
-    class Config:
-        orm_mode = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
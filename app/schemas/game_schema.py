@@ -1,6 +1,6 @@
-from pydantic import BaseModel
-from typing import Optional
-from datetime import date
+from pydantic import BaseModel, ConfigDict
+from typing import Dict, Optional
+from datetime import date, datetime
 from decimal import Decimal
 
 class GameCreate(BaseModel):
@@ -12,5 +12,33 @@ class GameCreate(BaseModel):
 
 class GameModel(GameCreate):
     id: int
-    class Config:
-        orm_mode = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class GameRatingModel(BaseModel):
+    jogo_id: int
+    quantidade: int
+    soma: int
+    media: Optional[float] = None
+    histograma: Dict[int, int]
+
+class GameLeaderboardEntry(BaseModel):
+    posicao: int
+    nota: float
+    media: float
+    quantidade: int
+    jogo_id: int
+    titulo: str
+    desenvolvedora: str
+    preco: Decimal
+
+class GameRankModel(BaseModel):
+    jogo_id: int
+    posicao: Optional[int] = None
+    de: int
+    nota: Optional[float] = None
+    atualizado_em: Optional[datetime] = None
+
+class GameAlsoBoughtEntry(BaseModel):
+    jogo_id: int
+    titulo: str
+    compradores: int
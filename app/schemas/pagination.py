@@ -1,14 +1,14 @@
-from typing import Generic, TypeVar, List
-from pydantic import BaseModel
-from pydantic.generics import GenericModel
+from typing import Generic, Optional, TypeVar, List
+from pydantic import BaseModel, ConfigDict
 
 T = TypeVar("T")
 
-class PaginatedResponse(GenericModel, Generic[T]):
+class PaginatedResponse(BaseModel, Generic[T]):
     page: int
     per_page: int
-    total: int
+    total: Optional[int] = None
+    total_aproximado: bool = False
     items: List[T]
+    next_cursor: Optional[str] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import date, datetime
 from decimal import Decimal
@@ -12,5 +12,4 @@ class PurchaseCreate(BaseModel):
 
 class PurchaseModel(PurchaseCreate):
   id: int
-  class Config:
-    orm_mode = True
\ No newline at end of file
+  model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional, Annotated
-from pydantic import BaseModel, conint
+from pydantic import BaseModel, ConfigDict, conint
 
 class ReviewCreate(BaseModel):
     usuario_id: int
@@ -12,5 +12,4 @@ class ReviewModel(ReviewCreate):
     id: int
     data_avaliacao: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,82 @@
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+from fastapi import HTTPException, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter, create_model
+from sqlalchemy import Row
+from app.schemas.pagination import PaginatedResponse
+
+# Caminho rápido de resposta. Com response_model o FastAPI valida o retorno,
+# gera um dicionário JSON-compatível e só então o codifica. Aqui o conteúdo
+# é validado uma única vez por um TypeAdapter montado na primeira chamada e
+# o pydantic-core escreve o JSON direto; o response_model das rotas continua
+# valendo para a documentação.
+#
+# As listagens chegam como Row (colunas, sem montar objetos ORM), que viram
+# dicionário antes da validação; colunas a mais, como o total da janela, são
+# ignoradas pelo schema.
+#
+# ?fields=id,titulo,preco restringe a resposta a esses campos: as listagens
+# selecionam só as colunas pedidas e o schema é recortado para elas.
+
+class JSONResponse(ORJSONResponse):
+    """ORJSONResponse que aceita também o corpo já serializado em bytes."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return super().render(content)
+
+@lru_cache(maxsize=None)
+def adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+def select_fields(schema: type[BaseModel], fields: str | None) -> Tuple[str, ...] | None:
+    """Campos pedidos em ?fields=, na ordem do schema; None quando não há recorte."""
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(requested - set(schema.model_fields))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Campos inválidos: {', '.join(unknown)}",
+        )
+    return tuple(name for name in schema.model_fields if name in requested) or None
+
+@lru_cache(maxsize=None)
+def partial(schema: type[BaseModel], fields: Tuple[str, ...]) -> type[BaseModel]:
+    """``schema`` só com ``fields``, com os mesmos tipos e padrões."""
+    return create_model(
+        f"{schema.__name__}Parcial",
+        __config__=schema.model_config,
+        **{name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in fields},
+    )
+
+def response(
+    schema: Any,
+    content: Any,
+    status_code: int = 200,
+    fields: Tuple[str, ...] | None = None,
+) -> JSONResponse:
+    """Valida ``content`` contra ``schema`` (recortado a ``fields``) e devolve a resposta com o JSON pronto."""
+    if fields is not None:
+        schema = partial(schema, fields)
+    type_adapter = adapter(schema)
+    value = type_adapter.validate_python(content, from_attributes=True)
+    return JSONResponse(type_adapter.dump_json(value), status_code=status_code)
+
+def page_response(
+    schema: type[BaseModel],
+    page: Dict[str, Any],
+    fields: Tuple[str, ...] | None = None,
+) -> JSONResponse:
+    """Resposta de uma página (o dicionário dos paginated_list/search dos services)."""
+    if fields is not None:
+        schema = partial(schema, fields)
+    items = page["items"]
+    if items and isinstance(items[0], Row):
+        # Todas as linhas têm as mesmas colunas; zip é bem mais barato que _asdict()
+        columns = items[0]._fields
+        items = [dict(zip(columns, row)) for row in items]
+    return response(PaginatedResponse[schema], {**page, "items": items})
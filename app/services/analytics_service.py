@@ -0,0 +1,26 @@
+from datetime import date
+from decimal import Decimal
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories import sales_repository
+
+async def revenue(db: AsyncSession, group_by: str, de: date | None, ate: date | None):
+    if de is not None and ate is not None and de > ate:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Data inicial maior que a final")
+    try:
+        rows = await sales_repository.revenue(db, group_by, de, ate)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    # Lido dos agregados: compras feitas depois de consolidado_em ainda não entram
+    _, consolidado_em = await sales_repository.status(db)
+    itens = [dict(row._mapping) for row in rows]
+    return {
+        "group_by":       group_by,
+        "de":             de,
+        "ate":            ate,
+        "consolidado_em": consolidado_em,
+        "unidades":       sum(item["unidades"] for item in itens),
+        "receita":        sum((Decimal(str(item["receita"])) for item in itens), Decimal("0")),
+        "itens":          itens,
+    }
@@ -1,12 +1,14 @@
 from datetime import date
 from decimal import Decimal
-from app import file_logger as logger
-from typing import Any, Dict
+from app import conditional, file_logger as logger
+from typing import Any, Dict, List, Tuple
 from fastapi import HTTPException, status
 from sqlalchemy import Date, Integer, Numeric, String, Text, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.dlc_model import DLCModel
-from app.repositories import dlc_repository
+from app.repositories import bulk, dlc_repository
+from app.repositories.pagination import next_cursor
+from app.singleflight import flights
 from sqlalchemy.exc import IntegrityError
 
 
@@ -29,9 +31,9 @@ async def create(db: AsyncSession, data: Dict[str, Any]):
           detail="Não existe um jogo com este id"
       )
     if "jogo_id" in str(e.orig) and "unique constraint" in str(e.orig).lower():
-      logger.error_(f"Tentativa de criar DLC para jogo inexistente: {data.get('jogo_id')}")
+      logger.error_(f"Tentativa de criar segundo DLC para o jogo: {data.get('jogo_id')}")
       raise HTTPException(
-          status_code=status.HTTP_400_BAD_REQUEST, 
+          status_code=status.HTTP_409_CONFLICT,
           detail="Já existe um DLC para este jogo"
       )
     raise HTTPException(
@@ -39,8 +41,27 @@ async def create(db: AsyncSession, data: Dict[str, Any]):
         detail="Erro de integridade nos dados"
     )
     
+async def create_many(db: AsyncSession, payloads: List[Dict[str, Any]]):
+  if len(payloads) > bulk.BULK_MAX_ITEMS:
+    raise HTTPException(
+      status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+      detail=f"Máximo de {bulk.BULK_MAX_ITEMS} itens por lote"
+    )
+  try:
+    results = await dlc_repository.create_many(db, payloads)
+  except IntegrityError as e:
+    await db.rollback()
+    logger.error_(f"Erro de integridade ao criar em lote: {str(e)}")
+    raise HTTPException(
+      status_code=status.HTTP_400_BAD_REQUEST,
+      detail="Erro de integridade nos dados"
+    )
+  resumo = bulk.summary(results)
+  logger.info_("DLCs criadas em lote", criados=resumo["criados"], conflitos=resumo["conflitos"], erros=resumo["erros"])
+  return resumo
+
 async def get(db: AsyncSession, dlc_id: int):
-  obj = await dlc_repository.get(db, dlc_id)
+  obj = await flights.run(dlc_repository.get, db, dlc_id)
   if not obj:
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
@@ -79,28 +100,70 @@ async def paginated_list(
     page: int,
     limit: int,
     filters: Dict[str, Any],
+    order: str = "id",
+    after: str | None = None,
+    with_total: bool = True,
+    fields: Tuple[str, ...] | None = None,
 ):
   skip  = (page - 1) * limit
-  items = await dlc_repository.list_(db, skip, limit, filters)
-  total = await dlc_repository.count_filtered(db, filters)
+  try:
+    items, total, aproximado = await flights.run(
+        dlc_repository.list_with_total, db, skip, limit, filters, order, after, with_total, fields
+    )
+  except ValueError as e:
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
   return {
-      "items":     items,
-      "page":      page,
-      "per_page":  limit,
-      "total":     total,
+      "items":            items,
+      "page":             page,
+      "per_page":         limit,
+      "total":            total,
+      "total_aproximado": aproximado,
+      "next_cursor":      next_cursor(items, dlc_repository.ORDERINGS, order, limit),
   }
   
-async def update(db: AsyncSession, dlc_id: int, data: Dict[str, Any]):
-  await get(db, dlc_id)
-  
+async def search(
+    db: AsyncSession,
+    field: str,
+    value: str,
+    modo: str,
+    page: int,
+    limit: int,
+    with_total: bool = True,
+    fields: Tuple[str, ...] | None = None,
+):
+  skip = (page - 1) * limit
+  try:
+    items, total, aproximado = await dlc_repository.search(db, field, value, modo, skip, limit, with_total, fields)
+  except ValueError as e:
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+  return {
+    "items":            items,
+    "page":             page,
+    "per_page":         limit,
+    "total":            total,
+    "total_aproximado": aproximado,
+  }
+
+async def update(db: AsyncSession, dlc_id: int, data: Dict[str, Any], versions: List[int] | None = None):
   try:
-    await dlc_repository.update_(db, dlc_id, data)
+    obj = await dlc_repository.update_(db, dlc_id, data, versions)
+    if obj is None:
+      if versions is not None:
+        # A DLC existe (senão get levanta 404): a versão do If-Match ficou para trás
+        await get(db, dlc_id)
+        logger.error_("DLC alterado desde a versão enviada em If-Match")
+        raise conditional.precondition_failed()
+      raise HTTPException(
+          status_code=status.HTTP_404_NOT_FOUND,
+          detail="DLC nao encontrado"
+      )
     logger.info_("DLC atualizado")
-    return {"message": "DLC atualizado com sucesso"}
+    return obj
   except IntegrityError as e:
     await db.rollback()
-    if "titulo" in str(e.orig) or "unique constraint" in str(e.orig).lower():
+    if "titulo" in str(e.orig):
       logger.error_(f"Tentativa de criar DLC com título duplicado: {data.get('titulo')}")
       raise HTTPException(
           status_code=status.HTTP_409_CONFLICT, 
@@ -113,9 +176,9 @@ async def update(db: AsyncSession, dlc_id: int, data: Dict[str, Any]):
           detail="Não existe um jogo com este id"
       )
     if "jogo_id" in str(e.orig) and "unique constraint" in str(e.orig).lower():
-      logger.error_(f"Tentativa de criar DLC para jogo inexistente: {data.get('jogo_id')}")
+      logger.error_(f"Tentativa de criar segundo DLC para o jogo: {data.get('jogo_id')}")
       raise HTTPException(
-          status_code=status.HTTP_400_BAD_REQUEST, 
+          status_code=status.HTTP_409_CONFLICT,
           detail="Já existe um DLC para este jogo"
       )
     raise HTTPException(
@@ -124,8 +187,11 @@ async def update(db: AsyncSession, dlc_id: int, data: Dict[str, Any]):
     )
     
 async def delete(db: AsyncSession, dlc_id: int):
-  await get(db, dlc_id)
-  await dlc_repository.delete_(db, dlc_id)
+  if not await dlc_repository.delete_(db, dlc_id):
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="DLC nao encontrado"
+    )
   logger.info_("DLC deletado")
   return {"message": "DLC deletado com sucesso"}
 
@@ -0,0 +1,71 @@
+import csv
+import io
+import json
+import os
+from typing import Any, AsyncIterator, Callable, Dict
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from app.database import AsyncSessionLocal
+
+load_dotenv()
+
+# Exportação de tabelas inteiras em NDJSON ou CSV. As linhas vêm de um cursor
+# do servidor em blocos de EXPORT_FETCH_SIZE e são escritas na resposta à
+# medida que chegam, então a memória não cresce com o tamanho da tabela.
+
+EXPORT_FETCH_SIZE = int(os.getenv("EXPORT_FETCH_SIZE", "1000"))
+
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+async def _lines(
+    stream_fn: Callable[..., AsyncIterator[Any]],
+    filters: Dict[str, Any],
+    schema: type[BaseModel],
+    formato: str,
+) -> AsyncIterator[str]:
+    fields = list(schema.model_fields)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, lineterminator="\n")
+    if formato == "csv":
+        writer.writeheader()
+
+    # A sessão da requisição já foi fechada quando o corpo começa a ser
+    # enviado; o gerador abre a sua própria.
+    async with AsyncSessionLocal() as db:
+        pending = 0
+        async for obj in stream_fn(db, filters, EXPORT_FETCH_SIZE):
+            row = schema.model_validate(obj, from_attributes=True).model_dump(mode="json")
+            if formato == "csv":
+                writer.writerow(row)
+            else:
+                buffer.write(json.dumps(row, ensure_ascii=False))
+                buffer.write("\n")
+            pending += 1
+            if pending >= EXPORT_FETCH_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def response(
+    stream_fn: Callable[..., AsyncIterator[Any]],
+    filters: Dict[str, Any],
+    schema: type[BaseModel],
+    formato: str,
+    filename: str,
+) -> StreamingResponse:
+    if formato not in FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Formato inválido: {formato}",
+        )
+    return StreamingResponse(
+        _lines(stream_fn, filters, schema, formato),
+        media_type=FORMATS[formato],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{formato}"'},
+    )
@@ -1,12 +1,17 @@
 from datetime import date
 from decimal import Decimal
-from app import file_logger as logger
-from typing import Any, Dict
+from app import conditional, file_logger as logger
+from typing import Any, Dict, List, Tuple
 from fastapi import HTTPException, status
 from sqlalchemy import Date, Integer, Numeric, String, Text, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.game_model import Game
-from app.repositories import game_repository
+from app.models.game_rating_model import NOTAS
+from app.repositories import bulk, copurchase_repository, game_repository, leaderboard_repository, rating_repository
+from app.repositories.pagination import next_cursor
+from app.schemas.game_schema import GameModel
+from app.services import exporting
+from app.singleflight import flights
 from sqlalchemy.exc import IntegrityError
 
 async def create(db: AsyncSession, payload: Dict[str, Any]):
@@ -26,13 +31,86 @@ async def create(db: AsyncSession, payload: Dict[str, Any]):
             detail="Erro de integridade nos dados"
         )
 
+async def create_many(db: AsyncSession, payloads: List[Dict[str, Any]]):
+    if len(payloads) > bulk.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Máximo de {bulk.BULK_MAX_ITEMS} itens por lote"
+        )
+    try:
+        results = await game_repository.create_many(db, payloads)
+    except IntegrityError as e:
+        await db.rollback()
+        logger.error_(f"Erro de integridade ao criar em lote: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Erro de integridade nos dados"
+        )
+    resumo = bulk.summary(results)
+    logger.info_("Games criados em lote", criados=resumo["criados"], conflitos=resumo["conflitos"], erros=resumo["erros"])
+    return resumo
+
 async def get(db: AsyncSession, game_id: int):
-    obj = await game_repository.get(db, game_id)
+    obj = await flights.run(game_repository.get, db, game_id)
     if not obj:
         logger.error_("Game não encontrado")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Game não encontrado")
     return obj
 
+async def rating(db: AsyncSession, game_id: int):
+    await get(db, game_id)
+    stats = await rating_repository.get(db, game_id)
+    # Jogo sem reviews ainda não tem linha em game_rating_stats
+    return {
+        "jogo_id":    game_id,
+        "quantidade": stats.quantidade if stats else 0,
+        "soma":       stats.soma if stats else 0,
+        "media":      stats.media if stats else None,
+        "histograma": {nota: getattr(stats, f"nota_{nota}") if stats else 0 for nota in NOTAS},
+    }
+
+async def leaderboard(
+    db: AsyncSession,
+    page: int,
+    limit: int,
+    filters: Dict[str, Any],
+    with_total: bool = True,
+):
+    skip = (page - 1) * limit
+    rows, total = await leaderboard_repository.page(db, filters, skip, limit, with_total)
+    items = [
+        {
+            "posicao":        entry.posicao,
+            "nota":           entry.nota,
+            "media":          entry.media,
+            "quantidade":     entry.quantidade,
+            "jogo_id":        game.id,
+            "titulo":         game.titulo,
+            "desenvolvedora": game.desenvolvedora,
+            "preco":          game.preco,
+        }
+        for entry, game, *_ in rows
+    ]
+    return {
+        "items":            items,
+        "page":             page,
+        "per_page":         limit,
+        "total":            total,
+        "total_aproximado": False,
+    }
+
+async def rank(db: AsyncSession, game_id: int):
+    await get(db, game_id)
+    entry = await leaderboard_repository.get(db, game_id)
+    # Jogos sem review ficam fora do ranking
+    return {
+        "jogo_id":       game_id,
+        "posicao":       entry.posicao if entry else None,
+        "de":            await leaderboard_repository.size(db),
+        "nota":          entry.nota if entry else None,
+        "atualizado_em": entry.atualizado_em if entry else None,
+    }
+
 async def list_(db: AsyncSession, page: int, limit: int, filters: dict = {}):
     query = select(Game)
 
@@ -64,25 +142,56 @@ async def paginated_list(
     page: int,
     limit: int,
     filters: Dict[str, Any],
+    order: str = "id",
+    after: str | None = None,
+    with_total: bool = True,
+    fields: Tuple[str, ...] | None = None,
 ):
     skip  = (page - 1) * limit
-    items = await game_repository.list_(db, skip, limit, filters)
-    total = await game_repository.count_filtered(db, filters)
+    try:
+        items, total, aproximado = await game_repository.list_with_total(db, skip, limit, filters, order, after, with_total, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     return {
-        "items":     items,
-        "page":      page,
-        "per_page":  limit,
-        "total":     total,
+        "items":            items,
+        "page":             page,
+        "per_page":         limit,
+        "total":            total,
+        "total_aproximado": aproximado,
+        "next_cursor":      next_cursor(items, game_repository.ORDERINGS, order, limit),
     }
 
-async def update(db: AsyncSession, game_id: int, payload: Dict[str, Any]):
-    await get(db, game_id)
-    
+def export(filters: Dict[str, Any], formato: str):
+    return exporting.response(game_repository.stream_, filters, GameModel, formato, "games")
+
+async def search(
+    db: AsyncSession,
+    field: str,
+    value: str,
+    modo: str,
+    page: int,
+    limit: int,
+    with_total: bool = True,
+    fields: Tuple[str, ...] | None = None,
+):
+    skip = (page - 1) * limit
     try:
-        await game_repository.update_(db, game_id, payload)
-        logger.info_("Game atualizado")
-        return {"message": "Game atualizado com sucesso"}
+        items, total, aproximado = await game_repository.search(db, field, value, modo, skip, limit, with_total, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return {
+        "items":            items,
+        "page":             page,
+        "per_page":         limit,
+        "total":            total,
+        "total_aproximado": aproximado,
+    }
+
+async def update(db: AsyncSession, game_id: int, payload: Dict[str, Any], versions: List[int] | None = None):
+    try:
+        obj = await game_repository.update_(db, game_id, payload, versions)
     except IntegrityError as e:
         await db.rollback()
         if "titulo" in str(e.orig) or "unique constraint" in str(e.orig).lower():
@@ -103,12 +212,28 @@ async def update(db: AsyncSession, game_id: int, payload: Dict[str, Any]):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Erro interno do servidor"
         )
+    if obj is None:
+        if versions is not None:
+            # O jogo existe (senão get levanta 404): a versão do If-Match ficou para trás
+            await get(db, game_id)
+            logger.error_("Game alterado desde a versão enviada em If-Match")
+            raise conditional.precondition_failed()
+        logger.error_("Game não encontrado")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Game não encontrado")
+    logger.info_("Game atualizado")
+    return obj
 
 async def delete(db: AsyncSession, game_id: int):
-    await get(db, game_id)
-    await game_repository.delete_(db, game_id)
+    if not await game_repository.delete_(db, game_id):
+        logger.error_("Game não encontrado")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Game não encontrado")
     logger.info_("Game excluido")
     return {"message": "Game excluido com sucesso"}
 
 async def count(db: AsyncSession):
     return await game_repository.count(db)
+
+async def also_bought(db: AsyncSession, game_id: int, limit: int):
+    await get(db, game_id)
+    rows = await copurchase_repository.top(db, game_id, limit)
+    return [dict(row._mapping) for row in rows]
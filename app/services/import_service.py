@@ -0,0 +1,152 @@
+import asyncio
+import csv
+import io
+import itertools
+import json
+import os
+import tempfile
+from typing import Any, AsyncIterator, Callable, Dict, IO, Iterator, Tuple
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import file_logger as logger
+from app.repositories import bulk, dlc_repository, game_repository, purchase_repository, user_repository
+from app.schemas.dlc_schema import DLCCreate
+from app.schemas.game_schema import GameCreate
+from app.schemas.purchase_schema import PurchaseCreate
+from app.schemas.review_schema import ReviewCreate
+from app.schemas.user_schema import UserCreate
+from app.services import review_service
+
+load_dotenv()
+
+# Importação de arquivos CSV ou NDJSON. As linhas são lidas e validadas em
+# blocos de IMPORT_CHUNK_SIZE; cada bloco válido vai para o banco por COPY
+# (PostgreSQL) ou executemany (SQLite) e é confirmado antes do próximo, então
+# uma falha no meio não desfaz o que já entrou.
+
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "5000"))
+# Quantas rejeições são devolvidas em detalhe (o total é sempre contado)
+IMPORT_MAX_REJECTED = int(os.getenv("IMPORT_MAX_REJECTED", "1000"))
+# Acima disso o corpo da requisição vai para disco antes de ser processado
+IMPORT_SPOOL_BYTES = int(os.getenv("IMPORT_SPOOL_BYTES", str(16 * 1024 * 1024)))
+
+FORMATS = {"csv", "ndjson"}
+
+TARGETS: Dict[str, Tuple[type[BaseModel], Callable]] = {
+    "games":    (GameCreate, game_repository.create_many),
+    "dlcs":     (DLCCreate, dlc_repository.create_many),
+    "users":    (UserCreate, user_repository.create_many),
+    "purchase": (PurchaseCreate, purchase_repository.create_many),
+    # reviews passam pelo service, que mantém game_rating_stats junto
+    "reviews":  (ReviewCreate, review_service.insert_many),
+}
+
+def _records(file: IO[str], formato: str) -> Iterator[Tuple[int, Any]]:
+    """(número da linha, registro) para cada registro do arquivo."""
+    if formato == "csv":
+        reader = csv.DictReader(file)
+        for row in reader:
+            # Campo vazio no CSV é ausência de valor
+            yield reader.line_num, {k: (v if v != "" else None) for k, v in row.items()}
+        return
+
+    for number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield number, e
+
+def _reason(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        first = error.errors()[0]
+        field = ".".join(str(part) for part in first["loc"])
+        return f"{field}: {first['msg']}" if field else first["msg"]
+    return str(error)
+
+async def import_file(
+    db: AsyncSession,
+    entidade: str,
+    file: IO[str],
+    formato: str,
+    on_progress: Callable[[Dict[str, Any]], None] | None = None,
+) -> Dict[str, Any]:
+    if entidade not in TARGETS:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Entidade inválida: {entidade}")
+    if formato not in FORMATS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Formato inválido: {formato}")
+
+    schema, create_many = TARGETS[entidade]
+    report: Dict[str, Any] = {
+        "entidade":   entidade,
+        "lidas":      0,
+        "criadas":    0,
+        "conflitos":  0,
+        "rejeitadas": 0,
+        "rejeicoes":  [],
+    }
+
+    def reject(linha: int, motivo: str) -> None:
+        report["rejeitadas"] += 1
+        if len(report["rejeicoes"]) < IMPORT_MAX_REJECTED:
+            report["rejeicoes"].append({"linha": linha, "motivo": motivo})
+
+    records = _records(file, formato)
+    # A leitura de cada bloco pode ir ao disco (arquivo da CLI ou corpo que
+    # passou de IMPORT_SPOOL_BYTES) e roda fora do event loop
+    while chunk := await asyncio.to_thread(list, itertools.islice(records, IMPORT_CHUNK_SIZE)):
+        report["lidas"] += len(chunk)
+        linhas, items = [], []
+        for linha, record in chunk:
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                items.append(schema.model_validate(record).model_dump())
+                linhas.append(linha)
+            except (ValidationError, ValueError) as e:
+                reject(linha, _reason(e))
+
+        if items:
+            try:
+                results = await create_many(db, items, copy=True)
+            except IntegrityError as e:
+                await db.rollback()
+                logger.error_(f"Erro de integridade ao importar {entidade}: {str(e)}")
+                for linha in linhas:
+                    reject(linha, "Erro de integridade nos dados")
+            else:
+                for linha, result in zip(linhas, results):
+                    if result["status"] == bulk.CRIADO:
+                        report["criadas"] += 1
+                    elif result["status"] == bulk.CONFLITO:
+                        report["conflitos"] += 1
+                    else:
+                        reject(linha, result["detalhe"])
+
+        logger.info_(
+            f"Importação de {entidade}: {report['lidas']} linhas lidas",
+            criadas=report["criadas"], conflitos=report["conflitos"], rejeitadas=report["rejeitadas"],
+        )
+        if on_progress is not None:
+            on_progress(report)
+
+    return report
+
+async def import_body(db: AsyncSession, entidade: str, body: AsyncIterator[bytes], formato: str) -> Dict[str, Any]:
+    """Importa o corpo cru de uma requisição sem mantê-lo inteiro em memória."""
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_BYTES) as spool:
+        async for part in body:
+            # Em memória a escrita é imediata; a que passa do limite copia o
+            # buffer para disco e as seguintes já escrevem nele, então saem do
+            # event loop
+            if spool.tell() + len(part) > IMPORT_SPOOL_BYTES:
+                await asyncio.to_thread(spool.write, part)
+            else:
+                spool.write(part)
+        spool.seek(0)
+        with io.TextIOWrapper(spool, encoding="utf-8-sig", newline="") as file:
+            return await import_file(db, entidade, file, formato)
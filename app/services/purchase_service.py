@@ -1,11 +1,20 @@
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 from fastapi import HTTPException, status
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.purchase_model import Purchase
-from app.repositories import purchase_repository
+from app.repositories import bulk, purchase_repository
+from app.repositories.pagination import next_cursor
+from app.schemas.purchase_schema import PurchaseModel
+from app.services import exporting
 from sqlalchemy.exc import IntegrityError
-from app import file_logger as logger
+from app import conditional, file_logger as logger
+
+def _duplicated(e: IntegrityError) -> bool:
+  # "duplicated purchase" vem de _raise_rejected no INSERT; no UPDATE é a
+  # própria uq_purchase_usuario_jogo que recusa o par repetido
+  message = str(e.orig).lower()
+  return any(text in message for text in (
+    "duplicated purchase", "uq_purchase_usuario_jogo", "duplicate key", "unique constraint",
+  ))
 
 async def create(db: AsyncSession, data: Dict[str, Any]):
   try:
@@ -13,7 +22,7 @@ async def create(db: AsyncSession, data: Dict[str, Any]):
     logger.info_("Compra criada")
     return obj
   except IntegrityError as e:
-    if "duplicated purchase" in str(e.orig).lower():
+    if _duplicated(e):
       logger.error_(f"Tentativa de comprar o mesmo jogo: {data.get('jogo_id'), data.get('usuario_id')}")
       raise HTTPException(
           status_code=status.HTTP_409_CONFLICT,
@@ -43,6 +52,25 @@ async def create(db: AsyncSession, data: Dict[str, Any]):
         detail="Erro de integridade nos dados"
     )
 
+async def create_many(db: AsyncSession, payloads: List[Dict[str, Any]]):
+  if len(payloads) > bulk.BULK_MAX_ITEMS:
+    raise HTTPException(
+      status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+      detail=f"Máximo de {bulk.BULK_MAX_ITEMS} itens por lote"
+    )
+  try:
+    results = await purchase_repository.create_many(db, payloads)
+  except IntegrityError as e:
+    await db.rollback()
+    logger.error_(f"Erro de integridade ao criar em lote: {str(e)}")
+    raise HTTPException(
+      status_code=status.HTTP_400_BAD_REQUEST,
+      detail="Erro de integridade nos dados"
+    )
+  resumo = bulk.summary(results)
+  logger.info_("Compras criadas em lote", criados=resumo["criados"], conflitos=resumo["conflitos"], erros=resumo["erros"])
+  return resumo
+
 async def get(db: AsyncSession, purchase_id: int):
   obj = await purchase_repository.get(db, purchase_id)
   if not obj:
@@ -50,57 +78,75 @@ async def get(db: AsyncSession, purchase_id: int):
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Compra nao encontrada")
   return obj
 
-async def list_(
+async def paginated_list(
     db: AsyncSession,
     page: int,
     limit: int,
     filters: Dict[str, Any],
+    order: str = "id",
+    after: str | None = None,
+    with_total: bool = True,
+    fields: Tuple[str, ...] | None = None,
 ):
-    query = select(Purchase)
+    skip  = (page - 1) * limit
+    try:
+        items, total, aproximado = await purchase_repository.list_with_total(db, skip, limit, filters, order, after, with_total, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    for field, value in filters.items():
-        column_attr = getattr(Purchase, field, None)
-        if column_attr is not None:
-            if isinstance(value, str):
-                query = query.where(column_attr.ilike(f"%{value}%"))
-            else:
-                query = query.where(column_attr == value)
+    return {
+        "items":            items,
+        "page":             page,
+        "per_page":         limit,
+        "total":            total,
+        "total_aproximado": aproximado,
+        "next_cursor":      next_cursor(items, purchase_repository.ORDERINGS, order, limit),
+    }
 
-    query = query.limit(limit).offset((page - 1) * limit)
-    result = await db.execute(query)
-    return result.scalars().all()
 
-async def count_filtered(db: AsyncSession, filters: Dict[str, Any]) -> int:
-    return await purchase_repository.count_filtered(db, filters)
+def export(filters: Dict[str, Any], formato: str):
+  return exporting.response(purchase_repository.stream_, filters, PurchaseModel, formato, "purchases")
 
-async def paginated_list(
+async def search(
     db: AsyncSession,
+    field: str,
+    value: str,
+    modo: str,
     page: int,
     limit: int,
-    filters: Dict[str, Any],
+    with_total: bool = True,
+    fields: Tuple[str, ...] | None = None,
 ):
-    skip   = (page - 1) * limit
-    items  = await purchase_repository.list_(db, skip, limit, filters)
-    total  = await purchase_repository.count_filtered(db, filters)
-
-    return {
-        "items":     items, 
-        "page":      page,
-        "per_page":  limit,
-        "total":     total,
-    }
+  skip = (page - 1) * limit
+  try:
+    items, total, aproximado = await purchase_repository.search(db, field, value, modo, skip, limit, with_total, fields)
+  except ValueError as e:
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+  return {
+    "items":            items,
+    "page":             page,
+    "per_page":         limit,
+    "total":            total,
+    "total_aproximado": aproximado,
+  }
 
-async def update(db: AsyncSession, purchase_id: int, data: Dict[str, Any]):
-  await get(db, purchase_id)
-  
+async def update(db: AsyncSession, purchase_id: int, data: Dict[str, Any], versions: List[int] | None = None):
   try:
-    await purchase_repository.update_(db, purchase_id, data)
+    obj = await purchase_repository.update_(db, purchase_id, data, versions)
+    if obj is None:
+      if versions is not None:
+        # A compra existe (senão get levanta 404): a versão do If-Match ficou para trás
+        await get(db, purchase_id)
+        logger.error_("Compra alterada desde a versão enviada em If-Match")
+        raise conditional.precondition_failed()
+      logger.error_("Compra nao encontrada")
+      raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Compra nao encontrada")
     logger.info_("Compra atualizada")
-    return {"message": "Compra atualizada com sucesso"}
+    return obj
   except IntegrityError as e:
     await db.rollback()
-    if "duplicated purchase" in str(e.orig).lower():
+    if _duplicated(e):
       logger.error_(f"Tentativa de comprar o mesmo jogo: {data.get('jogo_id'), data.get('usuario_id')}")
       raise HTTPException(
           status_code=status.HTTP_409_CONFLICT,
@@ -124,8 +170,9 @@ async def update(db: AsyncSession, purchase_id: int, data: Dict[str, Any]):
     )
 
 async def delete(db: AsyncSession, purchase_id: int):
-  await get(db, purchase_id)
-  await purchase_repository.delete_(db, purchase_id)
+  if not await purchase_repository.delete_(db, purchase_id):
+    logger.error_("Compra nao encontrada")
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Compra nao encontrada")
   logger.info_("Compra excluida")
   return {"message": "Compra excluida com sucesso"}
 
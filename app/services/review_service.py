@@ -1,15 +1,22 @@
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 from fastapi import HTTPException, status
-from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.review_model import Review
-from app.repositories import review_repository
+from app.repositories import bulk, game_repository, rating_repository, review_repository
+from app.repositories.pagination import next_cursor
+from app.schemas.review_schema import ReviewModel
+from app.services import exporting
+from app.singleflight import flights
 from sqlalchemy.exc import IntegrityError
-from app import file_logger as logger
+from app import conditional, file_logger as logger
+from app import leaderboard
 
 async def create(db: AsyncSession, payload: Dict[str, Any]):
     try:
-        obj = await review_repository.create(db, payload)
+        obj = await review_repository.create(db, payload, commit=False)
+        await rating_repository.apply(db, [(obj.jogo_id, obj.nota, 1)])
+        await db.commit()
+        await game_repository.forget_lists()
+        leaderboard.mark_dirty()
         logger.info_("Review criada")
         return obj
     except IntegrityError as e:
@@ -40,6 +47,37 @@ async def create(db: AsyncSession, payload: Dict[str, Any]):
             detail="Erro de integridade nos dados"
         )
 
+async def create_many(db: AsyncSession, payloads: List[Dict[str, Any]]):
+    if len(payloads) > bulk.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Máximo de {bulk.BULK_MAX_ITEMS} itens por lote"
+        )
+    try:
+        results = await insert_many(db, payloads)
+    except IntegrityError as e:
+        await db.rollback()
+        logger.error_(f"Erro de integridade ao criar em lote: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Erro de integridade nos dados"
+        )
+    resumo = bulk.summary(results)
+    logger.info_("Reviews criadas em lote", criados=resumo["criados"], conflitos=resumo["conflitos"], erros=resumo["erros"])
+    return resumo
+
+async def insert_many(db: AsyncSession, items: List[Dict[str, Any]], copy: bool = False) -> List[Dict[str, Any]]:
+    """Cria reviews em lote e atualiza os agregados de nota na mesma transação."""
+    results = await review_repository.create_many(db, items, copy, commit=False)
+    await rating_repository.apply(db, [
+        (items[r["indice"]]["jogo_id"], items[r["indice"]]["nota"], 1)
+        for r in results if r["status"] == bulk.CRIADO
+    ])
+    await db.commit()
+    await game_repository.forget_lists()
+    leaderboard.mark_dirty()
+    return results
+
 async def get(db: AsyncSession, review_id: int):
     obj = await review_repository.get(db, review_id)
     if not obj:
@@ -47,35 +85,86 @@ async def get(db: AsyncSession, review_id: int):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review não encontrada")
     return obj
 
-async def list_(db: AsyncSession, page: int, limit: int, filters: dict = {}):
-    query = select(Review)
-    count_query = select(func.count()).select_from(Review)
+async def list_(
+    db: AsyncSession,
+    page: int,
+    limit: int,
+    filters: dict = {},
+    order: str = "id",
+    after: str | None = None,
+    with_total: bool = True,
+    fields: Tuple[str, ...] | None = None,
+):
+    skip = (page - 1) * limit
+    try:
+        items, total, aproximado = await flights.run(
+            review_repository.list_with_total, db, skip, limit, filters, order, after, with_total, fields
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    for field, value in filters.items():
-        column_attr = getattr(Review, field, None)
-        if column_attr is not None:
-            condition = column_attr.ilike(f"%{value}%") if field == "comentario" else column_attr == value
-            query = query.where(condition)
-            count_query = count_query.where(condition)
+    return {
+        "page": page,
+        "per_page": limit,
+        "total": total,
+        "total_aproximado": aproximado,
+        "items": items,
+        "next_cursor": next_cursor(items, review_repository.ORDERINGS, order, limit),
+    }
+
+def export(filters: Dict[str, Any], formato: str):
+    return exporting.response(review_repository.stream_, filters, ReviewModel, formato, "reviews")
 
-    total = (await db.execute(count_query)).scalar_one()
-    query = query.limit(limit).offset((page - 1) * limit)
-    result = await db.execute(query)
-    items = result.scalars().all()
+async def search(
+    db: AsyncSession,
+    field: str,
+    value: str,
+    modo: str,
+    page: int,
+    limit: int,
+    with_total: bool = True,
+    fields: Tuple[str, ...] | None = None,
+):
+    skip = (page - 1) * limit
+    try:
+        items, total, aproximado = await review_repository.search(db, field, value, modo, skip, limit, with_total, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     return {
         "page": page,
         "per_page": limit,
         "total": total,
+        "total_aproximado": aproximado,
         "items": items,
     }
 
-async def update(db: AsyncSession, review_id: int, payload: Dict[str, Any]):
-    await get(db, review_id)
+async def _get_for_update(db: AsyncSession, review_id: int):
+    obj = await review_repository.get_for_update(db, review_id)
+    if not obj:
+        logger.error_("Review não encontrada")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review não encontrada")
+    return obj
+
+async def update(db: AsyncSession, review_id: int, payload: Dict[str, Any], versions: List[int] | None = None):
+    # A linha fica travada até o commit para os deltas saírem da nota anterior certa
+    old = await _get_for_update(db, review_id)
+    if versions is not None and old.version not in versions:
+        await db.rollback()
+        logger.error_("Review alterada desde a versão enviada em If-Match")
+        raise conditional.precondition_failed()
+    antes = (old.jogo_id, old.nota)
+    depois = (payload.get("jogo_id", old.jogo_id), payload.get("nota", old.nota))
     try:
-        await review_repository.update_(db, review_id, payload)
+        obj = await review_repository.update_(db, review_id, payload, commit=False)
+        if antes != depois:
+            await rating_repository.apply(db, [(*antes, -1), (*depois, 1)])
+        await db.commit()
+        if antes != depois:
+            await game_repository.forget_lists()
+            leaderboard.mark_dirty()
         logger.info_("Review atualizada")
-        return {"message": "Review atualizada com sucesso"}
+        return obj
     except IntegrityError as e:
         await db.rollback()
         if "jogo_id" in str(e.orig) and "not present in table" in str(e.orig):
@@ -97,8 +186,16 @@ async def update(db: AsyncSession, review_id: int, payload: Dict[str, Any]):
         )
 
 async def delete(db: AsyncSession, review_id: int):
-    await get(db, review_id)
-    await review_repository.delete_(db, review_id)
+    # O DELETE devolve a nota que sai dos agregados; não precisa ler antes
+    old = await review_repository.delete_(db, review_id, commit=False)
+    if old is None:
+        await db.rollback()
+        logger.error_("Review não encontrada")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review não encontrada")
+    await rating_repository.apply(db, [(old.jogo_id, old.nota, -1)])
+    await db.commit()
+    await game_repository.forget_lists()
+    leaderboard.mark_dirty()
     logger.info_("Review excluída")
     return {"message": "Review excluída com sucesso"}
 
@@ -1,12 +1,15 @@
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 from fastapi import HTTPException, status
 from sqlalchemy import DateTime, Integer, String, Text, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user_model import User
-from app.repositories import user_repository
+from app.repositories import bulk, user_repository
+from app.repositories.pagination import next_cursor
+from app.schemas.user_schema import UserModel
+from app.services import exporting
 from sqlalchemy.exc import IntegrityError
-from app import file_logger as logger
+from app import conditional, file_logger as logger
 
 async def create(db: AsyncSession, payload: Dict[str, Any]):
     try:
@@ -40,6 +43,25 @@ async def create(db: AsyncSession, payload: Dict[str, Any]):
             detail="Erro interno do servidor"
         )
 
+async def create_many(db: AsyncSession, payloads: List[Dict[str, Any]]):
+    if len(payloads) > bulk.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Máximo de {bulk.BULK_MAX_ITEMS} itens por lote"
+        )
+    try:
+        results = await user_repository.create_many(db, payloads)
+    except IntegrityError as e:
+        await db.rollback()
+        logger.error_(f"Erro de integridade ao criar em lote: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Erro de integridade nos dados"
+        )
+    resumo = bulk.summary(results)
+    logger.info_("Usuários criados em lote", criados=resumo["criados"], conflitos=resumo["conflitos"], erros=resumo["erros"])
+    return resumo
+
 async def get(db: AsyncSession, user_id: int):
     obj = await user_repository.get(db, user_id)
     if not obj:
@@ -75,25 +97,67 @@ async def paginated_list(
     page: int,
     limit: int,
     filters: Dict[str, Any],
+    order: str = "id",
+    after: str | None = None,
+    with_total: bool = True,
+    fields: Tuple[str, ...] | None = None,
 ):
-    skip   = (page - 1) * limit
-    items  = await user_repository.list_(db, skip, limit, filters)
-    total  = await user_repository.count_filtered(db, filters)
+    skip  = (page - 1) * limit
+    try:
+        items, total, aproximado = await user_repository.list_with_total(db, skip, limit, filters, order, after, with_total, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     return {
-        "items":     items,
-        "page":      page,
-        "per_page":  limit,
-        "total":     total,
+        "items":            items,
+        "page":             page,
+        "per_page":         limit,
+        "total":            total,
+        "total_aproximado": aproximado,
+        "next_cursor":      next_cursor(items, user_repository.ORDERINGS, order, limit),
     }
 
 
-async def update(db: AsyncSession, user_id: int, payload: Dict[str, Any]):
-    await get(db, user_id)
+def export(filters: Dict[str, Any], formato: str):
+    return exporting.response(user_repository.stream_, filters, UserModel, formato, "users")
+
+async def search(
+    db: AsyncSession,
+    field: str,
+    value: str,
+    modo: str,
+    page: int,
+    limit: int,
+    with_total: bool = True,
+    fields: Tuple[str, ...] | None = None,
+):
+    skip = (page - 1) * limit
+    try:
+        items, total, aproximado = await user_repository.search(db, field, value, modo, skip, limit, with_total, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return {
+        "items":            items,
+        "page":             page,
+        "per_page":         limit,
+        "total":            total,
+        "total_aproximado": aproximado,
+    }
+
+async def update(db: AsyncSession, user_id: int, payload: Dict[str, Any], versions: List[int] | None = None):
     try:
-        await user_repository.update_(db, user_id, payload)
+        obj = await user_repository.update_(db, user_id, payload, versions)
+        if obj is None:
+            if versions is not None:
+                # O usuário existe (senão get levanta 404): a versão do If-Match ficou para trás
+                await get(db, user_id)
+                logger.error_("User alterado desde a versão enviada em If-Match")
+                raise conditional.precondition_failed()
+            logger.error_("User não encontrado")
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User não encontrado")
         logger.info_("User atualizado")
-        return {"message": "User atualizado com sucesso"}
+        return obj
     except IntegrityError as e:
         await db.rollback()
         error_msg = str(e.orig).lower()
@@ -109,8 +173,9 @@ async def update(db: AsyncSession, user_id: int, payload: Dict[str, Any]):
         )
 
 async def delete(db: AsyncSession, user_id: int):
-    await get(db, user_id)
-    await user_repository.delete_(db, user_id)
+    if not await user_repository.delete_(db, user_id):
+        logger.error_("User não encontrado")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User não encontrado")
     logger.info_("User excluido")
     return {"message": "User excluido com sucesso"}
 
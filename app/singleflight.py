@@ -0,0 +1,62 @@
+import asyncio
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Hashable
+from app.cache import freeze
+
+# Coalescência de leituras idênticas (single-flight): enquanto uma chamada a
+# fn(db, *args) está em andamento, chamadas concorrentes com a mesma função e
+# os mesmos argumentos aguardam o mesmo resultado em vez de abrir outra
+# consulta no banco. Só vale para leituras; o resultado é compartilhado.
+
+class _LeaderCancelled(Exception):
+    pass
+
+class SingleFlight:
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.calls: Counter = Counter()
+        self.collapsed: Counter = Counter()
+
+    async def run(self, fn: Callable[..., Awaitable[Any]], db, *args, **kwargs) -> Any:
+        name = f"{fn.__module__}.{fn.__qualname__}"
+        key = (name, freeze((args, kwargs)))
+        self.calls[name] += 1
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.collapsed[name] += 1
+            try:
+                return await asyncio.shield(inflight)
+            except _LeaderCancelled:
+                # Quem fazia a consulta foi cancelado; esta chamada segue sozinha
+                return await fn(db, *args, **kwargs)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fn(db, *args, **kwargs)
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    def stats(self) -> dict:
+        return {
+            "calls": sum(self.calls.values()),
+            "collapsed": sum(self.collapsed.values()),
+            "functions": {
+                name: {"calls": self.calls[name], "collapsed": self.collapsed[name]}
+                for name in sorted(self.calls)
+            },
+        }
+
+flights = SingleFlight()
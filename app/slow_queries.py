@@ -0,0 +1,82 @@
+import asyncio
+import hashlib
+import logging
+import os
+import random
+from dotenv import load_dotenv
+from app.database import engine
+from app.file_logger import queue_logger
+
+load_dotenv()
+
+# Log de queries lentas em logs/slow_queries.log (mesma rotação do api.log,
+# ver LOG_ROTATION). Cada statement acima de SLOW_QUERY_MS vai com a duração
+# e a rota que o disparou; os parâmetros só com SLOW_QUERY_LOG_PARAMS. No
+# PostgreSQL uma fração dos SELECTs lentos ganha também um EXPLAIN (ANALYZE,
+# BUFFERS), rodado depois, numa conexão própria e um de cada vez: o ANALYZE
+# executa a query de novo.
+
+def _flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() not in {"0", "false", "no"}
+
+# Em milissegundos; 0 desliga o log
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "500"))
+# Fração das queries lentas que é registrada
+SLOW_QUERY_SAMPLE = float(os.getenv("SLOW_QUERY_SAMPLE", "1.0"))
+# Desligado por padrão: os parâmetros podem ter dados pessoais (e-mail, senha_hash)
+SLOW_QUERY_LOG_PARAMS = _flag("SLOW_QUERY_LOG_PARAMS", "false")
+# Fração das queries lentas registradas que ganha EXPLAIN (0 desliga)
+SLOW_QUERY_EXPLAIN_SAMPLE = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE", "0"))
+MAX_PARAMS_CHARS = 1000
+
+THRESHOLD = SLOW_QUERY_MS / 1000 if SLOW_QUERY_MS > 0 else float("inf")
+EXPLAIN_PREFIX = "EXPLAIN (ANALYZE, BUFFERS) "
+
+logger = queue_logger("slow_query_logger", "slow_queries.log")
+
+_explain_task: asyncio.Task | None = None
+
+def _params(parameters) -> str:
+    text = repr(parameters)
+    return text if len(text) <= MAX_PARAMS_CHARS else text[:MAX_PARAMS_CHARS] + "..."
+
+def _explainable(statement: str, dialect: str, executemany: bool) -> bool:
+    if dialect != "postgresql" or executemany:
+        return False
+    head = statement.lstrip()[:6].upper()
+    # Só leitura: o ANALYZE executa de verdade, e FOR UPDATE travaria linhas
+    return head == "SELECT" and " FOR UPDATE" not in statement and " FOR SHARE" not in statement
+
+def observe(statement: str, parameters, elapsed: float, origem: str, dialect: str, executemany: bool) -> None:
+    """Registra um statement que passou do limite; chamado pelos eventos do engine."""
+    if statement.startswith(EXPLAIN_PREFIX) or random.random() >= SLOW_QUERY_SAMPLE:
+        return
+
+    # Identifica o mesmo SQL entre registros e liga a query ao seu EXPLAIN
+    tag = hashlib.sha1(statement.encode()).hexdigest()[:12]
+    ms = round(elapsed * 1000, 2)
+    fields = {"ms": ms, "origem": origem, "consulta": tag, "sql": statement}
+    message = f"{ms} ms em {origem} [{tag}]: {' '.join(statement.split())}"
+    if SLOW_QUERY_LOG_PARAMS:
+        fields["parametros"] = _params(parameters)
+        message += f" -- parametros: {fields['parametros']}"
+    logger.warning(message, extra={"extra_fields": fields})
+
+    global _explain_task
+    if (
+        SLOW_QUERY_EXPLAIN_SAMPLE > 0
+        and (_explain_task is None or _explain_task.done())
+        and _explainable(statement, dialect, executemany)
+        and random.random() < SLOW_QUERY_EXPLAIN_SAMPLE
+    ):
+        _explain_task = asyncio.get_running_loop().create_task(_explain(statement, parameters, tag))
+
+async def _explain(statement: str, parameters, tag: str) -> None:
+    try:
+        async with engine.connect() as conn:
+            result = await conn.exec_driver_sql(EXPLAIN_PREFIX + statement, parameters)
+            plan = "\n".join(row[0] for row in result)
+            await conn.rollback()
+        logger.info(f"EXPLAIN [{tag}]\n{plan}", extra={"extra_fields": {"consulta": tag, "plano": plan}})
+    except Exception as e:
+        logger.error(f"EXPLAIN [{tag}] falhou: {str(e)}")
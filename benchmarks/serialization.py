@@ -0,0 +1,126 @@
+"""Micro-benchmark da serialização de uma página de jogos.
+
+Compara o caminho antigo (objetos ORM validados pelo response_model do
+FastAPI e codificados pelo JSONResponse do Starlette) com o de
+app.serialization (Row das colunas, um TypeAdapter pronto e o JSON escrito
+pelo pydantic-core), primeiro só a serialização e depois junto com a
+consulta da página num SQLite temporário. Confere antes que os dois corpos
+são iguais. Precisa das dependências de requirements-dev.txt.
+
+    python benchmarks/serialization.py
+    python benchmarks/serialization.py --itens 100 --repeticoes 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROUNDS = 3
+
+def _args(argv: List[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="benchmarks/serialization.py")
+    parser.add_argument("--itens", type=int, default=100, help="itens por página (máximo da API: 100)")
+    parser.add_argument("--repeticoes", type=int, default=500, help="páginas serializadas por rodada")
+    return parser.parse_args(argv)
+
+async def _measure(fn: Callable[[], Awaitable[Any]], repeticoes: int) -> float:
+    """Menor média, em microssegundos, entre ROUNDS rodadas."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        for _ in range(repeticoes):
+            await fn()
+        best = min(best, (time.perf_counter() - started) / repeticoes)
+    return best * 1e6
+
+async def _bench(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    from fastapi.routing import serialize_response
+    from sqlalchemy import insert
+    from starlette.responses import JSONResponse as StarletteJSONResponse
+    from app import serialization
+    from app.database import AsyncSessionLocal, Base, engine
+    from app.main import app
+    from app.models.game_model import Game
+    from app.repositories import game_repository
+    from app.repositories.pagination import fetch_page, projection
+    from app.schemas.game_schema import GameModel
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Game), [
+            {
+                "titulo":          f"Jogo {i}",
+                "descricao":       "Descrição de um jogo sintético " * 4,
+                "data_lancamento": date(2020, 1, 1) + timedelta(days=i),
+                "preco":           Decimal("59.90"),
+                "desenvolvedora":  f"Estúdio {i % 50}",
+            }
+            for i in range(args.itens)
+        ])
+
+    field = next(
+        route.response_field for route in app.routes
+        if getattr(route, "path", None) == "/games/" and "GET" in route.methods
+    )
+
+    async def page(columns=None) -> Dict[str, Any]:
+        async with AsyncSessionLocal() as db:
+            items, total, aproximado = await fetch_page(
+                db, Game, game_repository._apply_filters, {}, game_repository.ORDERINGS,
+                0, args.itens, columns=columns,
+            )
+        return {"items": items, "page": 1, "per_page": args.itens, "total": total,
+                "total_aproximado": aproximado, "next_cursor": None}
+
+    async def antigo(content: Dict[str, Any]) -> bytes:
+        return StarletteJSONResponse(await serialize_response(field=field, response_content=content)).body
+
+    async def rapido(content: Dict[str, Any]) -> bytes:
+        return serialization.page_response(GameModel, content).body
+
+    orm_page, row_page = await page(), await page(projection(Game))
+    if json.loads(await antigo(orm_page)) != json.loads(await rapido(row_page)):
+        raise SystemExit("os dois caminhos produziram JSON diferente")
+
+    results = {
+        "serializacao": {
+            "antigo": await _measure(lambda: antigo(orm_page), args.repeticoes),
+            "rapido": await _measure(lambda: rapido(row_page), args.repeticoes),
+        },
+        "consulta+serializacao": {
+            "antigo": await _measure(lambda: _chain(page(), antigo), args.repeticoes),
+            "rapido": await _measure(lambda: _chain(page(projection(Game)), rapido), args.repeticoes),
+        },
+    }
+    await engine.dispose()
+    return results
+
+async def _chain(content: Awaitable[Dict[str, Any]], render: Callable[[Dict[str, Any]], Awaitable[bytes]]) -> bytes:
+    return await render(await content)
+
+def main(argv: List[str] | None = None) -> None:
+    args = _args(argv)
+    tmp = tempfile.mkdtemp(prefix="serialization-")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+    os.environ.setdefault("CACHE_ENABLED", "false")
+    os.environ.setdefault("INSTRUMENTATION_ENABLED", "false")
+    os.environ.setdefault("LOG_DIR", os.path.join(tmp, "logs"))
+    sys.path.insert(0, ROOT)
+
+    results = asyncio.run(_bench(args))
+    print(f"página de {args.itens} jogos, µs por página (melhor de {ROUNDS} rodadas de {args.repeticoes})")
+    for name, tempos in results.items():
+        print(
+            f"{name:22} antigo {tempos['antigo']:9.1f}   rápido {tempos['rapido']:9.1f}   "
+            f"{tempos['antigo'] / tempos['rapido']:5.1f}x"
+        )
+
+if __name__ == "__main__":
+    main()
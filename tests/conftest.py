@@ -0,0 +1,141 @@
+"""Ambiente e dados dos testes.
+
+O banco é um SQLite temporário, ou o de TEST_DATABASE_URL: um PostgreSQL
+descartável, já migrado (alembic upgrade head) e vazio. As variáveis de
+ambiente são definidas aqui, antes de qualquer módulo da aplicação ser
+importado: o engine e o cache leem o ambiente na importação.
+"""
+import asyncio
+import importlib
+import os
+import pkgutil
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, List
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TMP = tempfile.mkdtemp(prefix="tests-")
+
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL") or f"sqlite+aiosqlite:///{os.path.join(TMP, 'tests.db')}"
+os.environ["CACHE_ENABLED"] = "false"
+os.environ["LEADERBOARD_ENABLED"] = "false"
+os.environ["SALES_ROLLUP_ENABLED"] = "false"
+os.environ["LOG_DIR"] = os.path.join(TMP, "logs")
+sys.path.insert(0, ROOT)
+
+SEED_CHUNK = 1000
+PALAVRAS = ["Aventura", "Corrida", "Estratégia", "Puzzle", "Tiro", "RPG", "Esporte", "Terror"]
+FORMAS = ["pix", "cartao", "boleto"]
+PAISES = ["BR", "PT", "AR", "US", "MX"]
+
+def dataset(
+    rng: random.Random,
+    jogos: int = 500,
+    usuarios: int = 1000,
+    compras: int = 5000,
+    reviews: int = 2000,
+    dlcs: int = 200,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Linhas sintéticas de cada tabela, determinadas pela semente de ``rng``."""
+    inicio = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+    def pairs(quantidade: int) -> List[tuple]:
+        # (usuario_id, jogo_id) distintos, como exige uq_usuario_jogo
+        return [divmod(n, jogos) for n in rng.sample(range(usuarios * jogos), quantidade)]
+
+    games = [
+        {
+            "titulo":          f"Jogo {i} {rng.choice(PALAVRAS)}",
+            "descricao":       None,
+            "data_lancamento": (inicio + timedelta(days=rng.randrange(1500))).date(),
+            "preco":           Decimal(f"{rng.uniform(10, 300):.2f}"),
+            "desenvolvedora":  f"Estúdio {rng.randrange(50)}",
+        }
+        for i in range(1, jogos + 1)
+    ]
+    return {
+        "games": games,
+        "users": [
+            {
+                "nome":          f"Usuário {i}",
+                "email":         f"usuario{i}@teste.local",
+                "senha_hash":    "x" * 60,
+                "data_cadastro": inicio + timedelta(minutes=rng.randrange(2_000_000)),
+                "pais":          rng.choice(PAISES),
+            }
+            for i in range(1, usuarios + 1)
+        ],
+        "dlc": [
+            {
+                "titulo":          f"DLC {jogo_id}",
+                "descricao":       None,
+                "data_lancamento": games[jogo_id - 1]["data_lancamento"],
+                "preco":           Decimal(f"{rng.uniform(5, 50):.2f}"),
+                "desenvolvedora":  games[jogo_id - 1]["desenvolvedora"],
+                "jogo_id":         jogo_id,
+            }
+            for jogo_id in rng.sample(range(1, jogos + 1), dlcs)
+        ],
+        "purchase": [
+            {
+                "usuario_id":      usuario + 1,
+                "jogo_id":         jogo + 1,
+                "preco_pago":      games[jogo]["preco"],
+                "forma_pagamento": rng.choice(FORMAS),
+                "data_compra":     inicio + timedelta(minutes=rng.randrange(2_000_000)),
+            }
+            for usuario, jogo in pairs(compras)
+        ],
+        "reviews": [
+            {
+                "usuario_id":     usuario + 1,
+                "jogo_id":        jogo + 1,
+                "nota":           rng.randint(1, 10),
+                "comentario":     None,
+                "data_avaliacao": inicio + timedelta(minutes=rng.randrange(2_000_000)),
+            }
+            for usuario, jogo in pairs(reviews)
+        ],
+    }
+
+async def _seed(data: Dict[str, List[Dict[str, Any]]]) -> None:
+    from sqlalchemy import func, insert, select
+    from app.database import AsyncSessionLocal, Base, engine
+    from app.repositories import rating_repository
+    import app.models
+
+    # Registra no metadata todas as tabelas, inclusive as derivadas
+    for module in pkgutil.iter_modules(app.models.__path__):
+        importlib.import_module(f"app.models.{module.name}")
+
+    tables = Base.metadata.tables
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        if (await conn.execute(select(func.count()).select_from(tables["games"]))).scalar_one():
+            raise RuntimeError("O banco de testes já tem jogos; use um banco vazio")
+        # Na ordem das chaves estrangeiras
+        for name in ("games", "users", "dlc", "purchase", "reviews"):
+            rows = data[name]
+            for start in range(0, len(rows), SEED_CHUNK):
+                await conn.execute(insert(tables[name]), rows[start:start + SEED_CHUNK])
+
+    async with AsyncSessionLocal() as db:
+        await rating_repository.rebuild(db)
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("ANALYZE")
+    await engine.dispose()
+
+@pytest.fixture(scope="session")
+def seeded() -> Dict[str, List[Dict[str, Any]]]:
+    """Banco de testes semeado com ``dataset`` (semente fixa), uma vez por sessão."""
+    data = dataset(random.Random(42))
+    try:
+        asyncio.run(_seed(data))
+    except RuntimeError as e:
+        pytest.fail(str(e))
+    return data